@@ -1,53 +1,177 @@
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Dict, Optional
+import hashlib
+import json
 import os
+import tempfile
+from config import Config
+from report.csv_store import load_schema, read_rows
+from utils.tracing import NOOP_TRACER, Tracer, create_tracer, current_span, traced
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+except ImportError:  # Without pyarrow, frames are parsed from the CSV files on every load
+    pa = feather = None
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+CACHE_METADATA_KEY = b'frame_cache'  # Feather schema metadata holding what a cached frame was parsed from
+
+# Summary columns the dashboard needs and how to parse them; the free-text
+# Summary column is never loaded
+SUMMARY_COLUMNS = {
+    'Timestamp': 'date', 'Keyword': 'category', 'Platform': 'category', 'Number_of_Mentions': 'float64',
+    'Positive_Count': 'Int64', 'Positive_Ratio': 'float64',
+    'Negative_Count': 'Int64', 'Negative_Ratio': 'float64',
+    'Neutral_Count': 'Int64', 'Neutral_Ratio': 'float64',
+    # Written before counts and ratios had their own columns, e.g. "3 (30.0%)"
+    'Positive': 'str', 'Negative': 'str', 'Neutral': 'str'
+}
 
 class DataVisualizer:
-    def __init__(self, data_dir: str, output_dir: str):
+    def __init__(self, data_dir: str, output_dir: str, cache_dir: Optional[str] = None,
+                 tracer: Tracer = NOOP_TRACER):
         """
         Initialize the visualizer with directory paths.
         
         Args:
             data_dir: Directory containing the CSV files
             output_dir: Directory to save the visualization HTML files
+            cache_dir: Directory for parsed-frame caches (default: Config.FRAME_CACHE_DIR)
+            tracer: Records 'load_frame' and 'visualize' spans
         """
         self.data_dir = data_dir
         self.output_dir = output_dir
+        self.cache_dir = cache_dir or Config.FRAME_CACHE_DIR
+        self.tracer = tracer
         os.makedirs(output_dir, exist_ok=True)
+        os.makedirs(self.cache_dir, exist_ok=True)
+    
+    def _parse_rows(self, filepath: str, schema: Dict, columns: Dict[str, str], start: int) -> pd.DataFrame:
+        """Parse the rows of a CSV file from byte `start`, reading only the wanted columns."""
+        usecols = [col for col in columns if col in schema['columns']]
+        df = read_rows(
+            filepath, schema, start=start,
+            usecols=usecols,
+            dtype={col: 'str' if columns[col] == 'date' else columns[col] for col in usecols}
+        )
+        for col in usecols:
+            if columns[col] == 'date':
+                # Vectorized parse of the fixed format written by ReportGenerator; 'N/A' becomes NaT
+                df[col] = pd.to_datetime(df[col], format=DATE_FORMAT, errors='coerce')
+        return df
+    
+    def _cache_filepath(self, filepath: str) -> str:
+        """Cache file for a CSV file; the path hash keeps same-named files of other directories apart."""
+        digest = hashlib.sha1(os.path.abspath(filepath).encode('utf-8')).hexdigest()[:12]
+        return os.path.join(self.cache_dir, f"{os.path.basename(filepath)}-{digest}.feather")
+    
+    def _read_cache(self, cache_file: str) -> Optional[Dict]:
+        """The cached frame and what it was parsed from, or None without a usable cache."""
+        if feather is None or not os.path.exists(cache_file):
+            return None
+        try:
+            table = feather.read_table(cache_file)
+            cached = json.loads(table.schema.metadata[CACHE_METADATA_KEY])
+            cached['frame'] = table.to_pandas()
+            return cached
+        except Exception as e:
+            print(f"Ignoring unreadable frame cache {cache_file}: {str(e)}")
+            return None
+    
+    def _write_cache(self, cache_file: str, df: pd.DataFrame, state: Dict) -> None:
+        """Write a frame cache to a temporary file and rename it, so a crash never leaves a truncated cache."""
+        if feather is None:
+            return
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({
+            **(table.schema.metadata or {}), CACHE_METADATA_KEY: json.dumps(state).encode('utf-8')
+        })
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        os.close(fd)
+        try:
+            feather.write_feather(table, tmp_path)
+            os.replace(tmp_path, cache_file)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    @traced('load_frame', lambda filepath, **_: {'file': os.path.basename(filepath)})
+    def _load_frame(self, filepath: str, columns: Dict[str, str]) -> pd.DataFrame:
+        """
+        Load a CSV file through a Feather frame cache (needs pyarrow).
         
-    def _load_platform_data(self) -> Dict[str, pd.DataFrame]:
-        """Load all platform CSV files into DataFrames."""
-        platform_data = {}
-        for file in os.listdir(self.data_dir):
-            if file.endswith('.csv') and file != 'platform_summaries.csv':
-                platform_name = file.replace('.csv', '')
-                df = pd.read_csv(os.path.join(self.data_dir, file))
-                if 'Date' in df.columns:
-                    df['Date'] = pd.to_datetime(df['Date'])
-                platform_data[platform_name] = df
-        return platform_data
+        The cache is reused as-is while the file's mtime and size are unchanged.
+        CSV files are append-only, so when a file has only grown under the same
+        schema version just the appended rows are parsed and added to the cached
+        frame. Anything else (new schema version, shrunk file) triggers a full parse.
+        """
+        stat = os.stat(filepath)
+        schema = load_schema(filepath)
+        cache_file = self._cache_filepath(filepath)
+        cached = self._read_cache(cache_file)
+        
+        if (cached and cached['columns'] == columns and cached['version'] == schema['version']
+                and cached['schema_columns'] == schema['columns']):
+            if cached['mtime_ns'] == stat.st_mtime_ns and cached['file_size'] == stat.st_size:
+                current_span().set(cache='hit', rows=len(cached['frame']))
+                return cached['frame']
+            if cached['size'] <= schema['size']:
+                current_span().set(cache='incremental')
+                df = cached['frame']
+                if schema['size'] > cached['size']:
+                    tail = self._parse_rows(filepath, schema, columns, cached['size'])
+                    df = pd.concat([df, tail], ignore_index=True)
+                    # Concatenating categoricals with different categories falls back to object
+                    for col, dtype in columns.items():
+                        if dtype == 'category' and col in df.columns:
+                            df[col] = df[col].astype('category')
+            else:
+                current_span().set(cache='full')
+                df = self._parse_rows(filepath, schema, columns, 0)
+        else:
+            current_span().set(cache='full')
+            df = self._parse_rows(filepath, schema, columns, 0)
+        current_span().set(rows=len(df))
+        
+        self._write_cache(cache_file, df, {
+            'columns': columns,
+            'schema_columns': schema['columns'],
+            'version': schema['version'],
+            'size': schema['size'],
+            'mtime_ns': stat.st_mtime_ns,
+            'file_size': stat.st_size
+        })
+        return df
     
     def _load_summary_data(self) -> pd.DataFrame:
         """Load summary CSV file into DataFrame."""
         summary_file = os.path.join(self.data_dir, 'platform_summaries.csv')
-        df = pd.read_csv(summary_file)
-        df['Timestamp'] = pd.to_datetime(df['Timestamp'])
+        df = self._load_frame(summary_file, SUMMARY_COLUMNS).copy()
         
-        # Extract numeric values from sentiment columns
         for col in ['Positive', 'Negative', 'Neutral']:
-            df[f'{col}_Count'] = df[col].str.extract('(\d+)').astype(float)
-            df[f'{col}_Percentage'] = df[col].str.extract('\((.*?)%\)').astype(float)
+            if f'{col}_Count' not in df.columns:
+                df[f'{col}_Count'] = pd.array([pd.NA] * len(df), dtype='Int64')
+                df[f'{col}_Ratio'] = float('nan')
+            
+            # Files not yet migrated by ReportGenerator keep the legacy strings
+            if col in df.columns:
+                legacy = df[col].str.extract(r'(\d+)\s*\(\s*([\d.]+)%\)')
+                missing = df[f'{col}_Count'].isna()
+                df.loc[missing, f'{col}_Count'] = legacy.loc[missing, 0].astype(float).astype('Int64')
+                df.loc[missing, f'{col}_Ratio'] = legacy.loc[missing, 1].astype(float) / 100
+                df = df.drop(columns=col)
         
         return df
     
+    @traced('visualize')
     def generate_visualizations(self) -> str:
         """Generate all visualizations and return the path to the HTML file."""
-        platform_data = self._load_platform_data()
+        # Every chart is drawn from the summary file; per-mention platform files are not needed
         summary_data = self._load_summary_data()
+        current_span().set(rows=len(summary_data))
         
         # Create a single HTML with multiple visualizations
         fig = make_subplots(
@@ -68,7 +192,7 @@ class DataVisualizer:
         )
         
         # 1. Sentiment Distribution Across Platforms
-        sentiment_data = summary_data.groupby('Platform')[['Positive_Count', 'Negative_Count', 'Neutral_Count']].mean()
+        sentiment_data = summary_data.groupby('Platform', observed=True)[['Positive_Count', 'Negative_Count', 'Neutral_Count']].mean()
         fig.add_trace(
             go.Bar(
                 name='Positive',
@@ -98,7 +222,7 @@ class DataVisualizer:
         )
         
         # 2. Keyword Popularity by Platform
-        keyword_counts = summary_data.groupby(['Platform', 'Keyword'])['Number_of_Mentions'].sum().reset_index()
+        keyword_counts = summary_data.groupby(['Platform', 'Keyword'], observed=True)['Number_of_Mentions'].sum().reset_index()
         for platform in keyword_counts['Platform'].unique():
             platform_data = keyword_counts[keyword_counts['Platform'] == platform]
             fig.add_trace(
@@ -125,7 +249,7 @@ class DataVisualizer:
         
         # 4. Top Keywords by Mentions (Treemap)
         keyword_platform_mentions = summary_data.groupby(
-            ['Keyword', 'Platform']
+            ['Keyword', 'Platform'], observed=True
         )['Number_of_Mentions'].sum().reset_index()
         
         fig.add_trace(
@@ -139,23 +263,23 @@ class DataVisualizer:
         )
         
         # 5. Sentiment Trends Over Time
-        for sentiment in ['Positive_Percentage', 'Negative_Percentage', 'Neutral_Percentage']:
+        for sentiment in ['Positive', 'Negative', 'Neutral']:
             fig.add_trace(
                 go.Scatter(
-                    name=sentiment.replace('_Percentage', ''),
+                    name=sentiment,
                     x=summary_data['Timestamp'],
-                    y=summary_data[sentiment],
+                    y=summary_data[f'{sentiment}_Ratio'] * 100,
                     mode='lines',
                     line=dict(
                         width=2,
-                        dash='solid' if sentiment == 'Positive_Percentage' else 'dash'
+                        dash='solid' if sentiment == 'Positive' else 'dash'
                     )
                 ),
                 row=3, col=1
             )
         
         # 6. Platform Share in Total Mentions
-        platform_shares = summary_data.groupby('Platform')['Number_of_Mentions'].sum()
+        platform_shares = summary_data.groupby('Platform', observed=True)['Number_of_Mentions'].sum()
         fig.add_trace(
             go.Pie(
                 labels=platform_shares.index,
@@ -183,9 +307,15 @@ class DataVisualizer:
 
 # Example usage
 if __name__ == "__main__":
+    from config import Config
+    config = Config()
+    tracer = create_tracer(config.TRACING_ENABLED, config.TRACE_PATH, config.METRICS_PATH,
+                           max_bytes=config.TRACE_MAX_BYTES, backup_count=config.TRACE_BACKUP_COUNT)
     visualizer = DataVisualizer(
         data_dir="output",  # Directory containing CSV files
-        output_dir="output/plot"  # Directory to save visualizations
+        output_dir="output/plot",  # Directory to save visualizations
+        tracer=tracer
     )
     dashboard_file = visualizer.generate_visualizations()
+    tracer.close()
     print(f"Dashboard generated: {dashboard_file}")
\ No newline at end of file
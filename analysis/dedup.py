@@ -0,0 +1,173 @@
+import asyncio
+import hashlib
+import re
+from typing import List, Dict, Optional, Tuple, Callable, Awaitable, Union
+from urllib.parse import urlsplit, parse_qsl, urlencode
+from models import Mention, MentionBatch
+
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    'fbclid', 'gclid', 'dclid', 'msclkid', 'mc_cid', 'mc_eid', 'igshid',
+    'ref', 'ref_src', 'ref_url', 'source', 'si', 'feature', 'spm',
+}
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL so copies of the same page compare equal: drops the scheme,
+    'www.', 'm.', fragments, trailing slashes and tracking parameters, and sorts
+    the remaining query parameters.
+    """
+    if not url:
+        return ""
+    
+    parts = urlsplit(url.strip())
+    host = parts.netloc.lower()
+    for prefix in ('www.', 'm.'):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    if host.endswith(':80') or host.endswith(':443'):
+        host = host.rsplit(':', 1)[0]
+    
+    # youtu.be/<id> and youtube.com/watch?v=<id> are the same video
+    if host == 'youtu.be':
+        return f"youtube.com/watch?v={parts.path.strip('/')}"
+    
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith('utm_')
+    )
+    path = parts.path.rstrip('/') or '/'
+    key = host + path
+    if query:
+        key += '?' + urlencode(query)
+    return key
+
+
+def simhash(text: str, bits: int = 64) -> int:
+    """64-bit SimHash over word 3-shingles; near-identical texts differ in few bits."""
+    words = _WORD.findall(text.lower())
+    shingles = [' '.join(words[i:i + 3]) for i in range(max(len(words) - 2, 1))]
+    
+    weights = [0] * bits
+    for shingle in shingles:
+        h = int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'big')
+        for bit in range(bits):
+            weights[bit] += 1 if h >> bit & 1 else -1
+    
+    return sum(1 << bit for bit in range(bits) if weights[bit] > 0)
+
+
+class MentionDeduplicator:
+    """
+    Groups mentions that refer to the same content across platforms.
+    
+    Two mentions are duplicates when their canonical URLs match, or when the
+    SimHash of their title + description differs in at most `max_distance` bits.
+    Near-duplicate lookup splits each 64-bit hash into bands, so any hash within
+    the distance shares at least one band with a stored one.
+    
+    Each group shares one sentiment result: the first mention to claim a group
+    computes it, and later duplicates await the same future.
+    """
+    
+    def __init__(self, max_distance: int = 3, min_words: int = 8):
+        self.max_distance = max_distance
+        self.min_words = min_words  # Shorter texts are too generic for near-duplicate matching
+        self._bands = max_distance + 1
+        self._band_bits = 64 // self._bands
+        self._next_group = 0
+        self._url_groups: Dict[str, int] = {}
+        self._band_index: Dict[Tuple[int, int], List[Tuple[int, int]]] = {}
+        self._sentiments: Dict[int, asyncio.Future] = {}
+    
+    def _bands_of(self, h: int) -> List[Tuple[int, int]]:
+        mask = (1 << self._band_bits) - 1
+        return [(band, h >> (band * self._band_bits) & mask) for band in range(self._bands)]
+    
+    def _find_near_duplicate(self, h: int) -> Optional[int]:
+        for band in self._bands_of(h):
+            for other, group in self._band_index.get(band, []):
+                if bin(h ^ other).count('1') <= self.max_distance:
+                    return group
+        return None
+    
+    def group_of(self, mention: Mention) -> int:
+        """Return the duplicate group id for a mention, registering it if new."""
+        url = canonical_url(mention.url)
+        group = self._url_groups.get(url) if url else None
+        
+        text = f"{mention.title or ''} {mention.description or ''}"
+        h = simhash(text) if len(_WORD.findall(text)) >= self.min_words else None
+        
+        if group is None and h is not None:
+            group = self._find_near_duplicate(h)
+        
+        if group is None:
+            group = self._next_group
+            self._next_group += 1
+        
+        if url:
+            self._url_groups.setdefault(url, group)
+        if h is not None:
+            for band in self._bands_of(h):
+                self._band_index.setdefault(band, []).append((h, group))
+        
+        return group
+    
+    def __len__(self) -> int:
+        """Number of duplicate groups seen so far."""
+        return self._next_group
+    
+    async def share_sentiment(self, mentions: Union[List[Mention], MentionBatch],
+                              classify: Callable[[List[Mention]], Awaitable]) -> None:
+        """
+        Set sentiment on every mention, classifying only one copy per duplicate group.
+        
+        Mentions whose group has not been claimed yet are passed to classify (which
+        must set mention.sentiment); the rest reuse the result of the first copy,
+        even when that copy came from another platform. If the owning call fails,
+        waiting duplicates are released and classified on their own.
+        """
+        if isinstance(mentions, MentionBatch):
+            rows = list(mentions)
+            await self.share_sentiment(rows, classify)
+            mentions.sentiment = [row.sentiment for row in rows]
+            return
+        
+        owned: List[Tuple[Mention, int, asyncio.Future]] = []
+        waiting: List[Tuple[Mention, asyncio.Future]] = []
+        
+        for mention in mentions:
+            group = self.group_of(mention)
+            future = self._sentiments.get(group)
+            if future is None:
+                future = asyncio.get_running_loop().create_future()
+                self._sentiments[group] = future
+                owned.append((mention, group, future))
+            else:
+                waiting.append((mention, future))
+        
+        try:
+            if owned:
+                await classify([mention for mention, _, _ in owned])
+        finally:
+            for mention, group, future in owned:
+                if future.done():
+                    continue
+                if mention.sentiment is None:
+                    # Let a later copy claim the group again
+                    del self._sentiments[group]
+                future.set_result(mention.sentiment)
+        
+        unresolved = []
+        for mention, future in waiting:
+            mention.sentiment = await future
+            if mention.sentiment is None:
+                unresolved.append(mention)
+        
+        if unresolved:
+            await classify(unresolved)
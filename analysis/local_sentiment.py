@@ -0,0 +1,235 @@
+import re
+from typing import List, Dict, Optional, Tuple
+import numpy as np
+
+
+# Word valences on VADER's -4..+4 scale, tuned to product and tech mentions.
+# A full VADER lexicon file can be loaded instead via LocalSentimentClassifier(lexicon_path=...).
+DEFAULT_LEXICON: Dict[str, float] = {
+    # Positive
+    'good': 1.9, 'great': 3.1, 'excellent': 3.2, 'amazing': 2.8, 'awesome': 3.1, 'love': 3.2,
+    'loved': 2.9, 'loves': 2.7, 'like': 1.5, 'liked': 1.8, 'nice': 1.8, 'best': 3.2, 'better': 1.9,
+    'happy': 2.7, 'glad': 2.0, 'fantastic': 2.6, 'wonderful': 2.7, 'brilliant': 2.8, 'perfect': 2.7,
+    'impressive': 2.3, 'impressed': 2.1, 'recommend': 1.5, 'recommended': 1.8, 'useful': 1.9,
+    'helpful': 1.9, 'easy': 1.9, 'fast': 1.4, 'faster': 1.5, 'reliable': 1.9, 'powerful': 1.8,
+    'success': 2.7, 'successful': 2.8, 'win': 2.8, 'wins': 2.7, 'winning': 2.4, 'improve': 1.9,
+    'improved': 2.1, 'improvement': 2.0, 'improves': 1.9, 'benefit': 2.0, 'benefits': 1.6,
+    'effective': 2.1, 'efficient': 1.8, 'solid': 1.5, 'clean': 1.7, 'elegant': 2.1, 'fun': 2.3,
+    'enjoy': 2.2, 'enjoyed': 2.3, 'thanks': 1.9, 'thank': 1.5, 'cool': 1.3, 'beautiful': 2.9,
+    'favorite': 2.0, 'favourite': 2.0, 'exciting': 2.2, 'excited': 1.4, 'superb': 3.1,
+    'boost': 1.7, 'boosted': 1.5, 'growth': 1.6, 'gain': 2.0, 'gains': 1.8, 'smooth': 1.6,
+    'stable': 1.2, 'secure': 1.4, 'worth': 0.9, 'valuable': 2.1, 'innovative': 1.9, 'wow': 2.8,
+    'fixed': 1.1, 'solved': 1.6, 'works': 1.1, 'profitable': 1.9, 'outstanding': 3.0,
+    # Negative
+    'bad': -2.5, 'terrible': -2.1, 'awful': -2.0, 'horrible': -2.5, 'worst': -3.1, 'worse': -2.1,
+    'hate': -2.7, 'hated': -3.2, 'hates': -1.9, 'dislike': -1.6, 'poor': -2.1, 'problem': -1.7,
+    'problems': -1.7, 'issue': -0.8, 'issues': -0.8, 'bug': -1.3, 'bugs': -1.3, 'buggy': -1.8,
+    'broken': -2.1, 'broke': -1.8, 'fail': -2.5, 'failed': -2.3, 'fails': -2.2, 'failure': -2.3,
+    'failing': -2.3, 'crash': -1.7, 'crashes': -1.7, 'crashed': -1.7, 'slow': -1.0, 'slower': -1.1,
+    'useless': -1.8, 'annoying': -1.7, 'annoyed': -1.6, 'frustrating': -1.9, 'frustrated': -1.8,
+    'disappointing': -2.2, 'disappointed': -1.9, 'wrong': -2.1, 'error': -1.7, 'errors': -1.4,
+    'scam': -2.8, 'fraud': -2.8, 'spam': -1.5, 'risk': -1.1, 'risky': -1.4, 'danger': -2.4,
+    'dangerous': -2.1, 'vulnerable': -0.9, 'vulnerability': -1.4, 'breach': -1.8, 'leak': -1.4,
+    'lose': -1.3, 'loss': -1.3, 'losses': -1.7, 'lost': -1.3, 'decline': -1.1, 'declined': -0.9,
+    'sad': -2.1, 'angry': -2.3, 'ugly': -2.3, 'confusing': -1.3, 'confused': -1.3, 'complicated': -0.9,
+    'expensive': -0.9, 'overpriced': -1.6, 'waste': -1.8, 'wasted': -2.2, 'sucks': -1.5,
+    'garbage': -2.1, 'trash': -1.6, 'mess': -1.5, 'pain': -2.3, 'painful': -1.9, 'unusable': -2.1,
+    'outage': -1.6, 'down': -0.9, 'lawsuit': -1.6, 'layoffs': -1.8, 'warning': -1.4, 'avoid': -1.2,
+    'criticism': -1.9, 'criticized': -1.5, 'complaint': -1.5, 'complaints': -1.7, 'concern': -0.8,
+    'concerns': -0.9, 'worried': -1.2, 'stupid': -2.4, 'ridiculous': -1.5, 'disaster': -3.1,
+}
+
+NEGATIONS = {
+    'not', 'no', 'never', 'none', 'nobody', 'nothing', 'neither', 'nor', 'nowhere', 'without',
+    'cannot', "can't", 'cant', "don't", 'dont', "doesn't", 'doesnt', "didn't", 'didnt', "isn't",
+    'isnt', "wasn't", 'wasnt', "aren't", 'arent', "won't", 'wont', "wouldn't", 'wouldnt',
+    "shouldn't", 'shouldnt', "couldn't", 'couldnt', "haven't", 'havent', "hasn't", 'hasnt',
+}
+
+# Intensity added to (or, when negative, taken from) the word that follows
+BOOSTERS = {
+    'very': 0.293, 'really': 0.293, 'extremely': 0.293, 'incredibly': 0.293, 'absolutely': 0.293,
+    'so': 0.293, 'totally': 0.293, 'completely': 0.293, 'highly': 0.293, 'super': 0.293,
+    'most': 0.293, 'more': 0.293, 'too': 0.293, 'quite': 0.293,
+    'slightly': -0.293, 'somewhat': -0.293, 'barely': -0.293, 'hardly': -0.293, 'kinda': -0.293,
+    'little': -0.293, 'marginally': -0.293, 'partly': -0.293, 'less': -0.293,
+}
+
+# VADER constants
+NEGATION_SCALAR = -0.74
+CAPS_INCREMENT = 0.733
+EXCLAMATION_INCREMENT = 0.292
+NORMALIZATION_ALPHA = 15.0
+NEUTRAL_BAND = 0.05
+# |compound| at which a text whose sentiment words all agree is fully confident;
+# one strong word ("This is great") reaches it
+POLAR_FULL_CONFIDENCE = 0.6
+# A text without lexicon words may still be clearly polar ("Company bankrupt"),
+# so NEUTRAL never reaches the default threshold and is left to the LLM...
+NEUTRAL_MAX_CONFIDENCE = 0.5
+# ...unless it is an identifier or an informational title, e.g. "facebook/react",
+# "Release notes v2.3.1" or "Show HN: my new CLI"
+INFORMATIONAL_CONFIDENCE = 0.9
+INFORMATIONAL_MAX_WORDS = 12
+
+_TOKEN = re.compile(r"[A-Za-z]+(?:'[A-Za-z]+)?|!")
+# One token with a digit or separator: repo and package names, versions, handles, domains
+_IDENTIFIER = re.compile(r"^(?=.*[\d/._\-@#:])[\w/.\-@#:+]+$")
+_INFORMATIONAL = re.compile(
+    r"\bv?\d+(?:\.\d+)+\b|^(?:show|ask|launch|tell) hn\b|\brelease notes\b|\bchangelog\b",
+    re.IGNORECASE
+)
+
+
+def load_vader_lexicon(path: str) -> Dict[str, float]:
+    """Read a VADER-format lexicon file (token<TAB>mean valence<TAB>...)."""
+    lexicon = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            parts = line.rstrip('\n').split('\t')
+            if len(parts) >= 2:
+                try:
+                    lexicon[parts[0].lower()] = float(parts[1])
+                except ValueError:
+                    continue
+    return lexicon
+
+
+class LocalSentimentClassifier:
+    """
+    Offline, lexicon- and rule-based sentiment classifier in the style of VADER.
+    
+    Texts are tokenized once, then every token of every text is scored together
+    in NumPy arrays: lexicon valence, boosters, ALL-CAPS emphasis, negation in
+    the three preceding words, the contrastive 'but' and exclamation marks.
+    The per-text sum is normalized to a compound score in [-1, 1].
+    
+    Each label comes with a confidence in [0, 1]. Polar labels are as confident
+    as their compound score is strong, up to POLAR_FULL_CONFIDENCE, and their
+    positive and negative words agree. NEUTRAL is at most NEUTRAL_MAX_CONFIDENCE:
+    finding no sentiment words says as much about the lexicon as about the text.
+    The exception is short identifiers and informational titles without
+    sentiment words (repo names, version numbers, "Show HN:" posts), which are
+    NEUTRAL with INFORMATIONAL_CONFIDENCE. Callers escalate anything below
+    `threshold`, so with the default threshold other NEUTRAL texts go to the LLM.
+    """
+    
+    def __init__(self, threshold: float = 0.8, lexicon: Optional[Dict[str, float]] = None,
+                 lexicon_path: Optional[str] = None, neutral_word_limit: int = 50):
+        self.threshold = threshold
+        self.neutral_word_limit = neutral_word_limit  # Word count at which an empty NEUTRAL has no confidence left
+        
+        if lexicon is None:
+            lexicon = load_vader_lexicon(lexicon_path) if lexicon_path else DEFAULT_LEXICON
+        
+        # Index 0 is every word the classifier knows nothing about
+        vocabulary = sorted(set(lexicon) | NEGATIONS | set(BOOSTERS) | {'but', '!'})
+        self._index = {word: i for i, word in enumerate(vocabulary, start=1)}
+        size = len(vocabulary) + 1
+        self._valence = np.zeros(size)
+        self._booster = np.zeros(size)
+        self._is_negation = np.zeros(size, dtype=bool)
+        for word, i in self._index.items():
+            self._valence[i] = lexicon.get(word, 0.0)
+            self._booster[i] = BOOSTERS.get(word, 0.0)
+            self._is_negation[i] = word in NEGATIONS
+        self._but = self._index['but']
+        self._exclamation = self._index['!']
+    
+    def _tokenize(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Flatten all texts into token ids, owning text ids, ALL-CAPS flags and per-text mixed-case flags."""
+        ids, docs, caps = [], [], []
+        mixed_case = np.zeros(len(texts), dtype=bool)
+        
+        for doc, text in enumerate(texts):
+            tokens = _TOKEN.findall(text or "")
+            ids.extend(self._index.get(token.lower(), 0) for token in tokens)
+            docs.extend([doc] * len(tokens))
+            caps.extend(len(token) > 1 and token.isupper() for token in tokens)
+            # Capitals only signal emphasis when the rest of the text is not shouting too
+            mixed_case[doc] = any(c.islower() for c in text or "")
+        
+        return (np.asarray(ids, dtype=np.int64), np.asarray(docs, dtype=np.int64),
+                np.asarray(caps, dtype=bool), mixed_case)
+    
+    def score(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """
+        Score texts in bulk. Returns arrays of length len(texts): 'compound',
+        'positive' and 'negative' (summed word intensities), 'hits' (sentiment
+        words) and 'words'.
+        """
+        n = len(texts)
+        ids, docs, caps, mixed_case = self._tokenize(texts)
+        positions = np.arange(len(ids))
+        doc_start = np.searchsorted(docs, np.arange(n))[docs] if len(ids) else positions
+        
+        valence = self._valence[ids]
+        is_word = ids != self._exclamation
+        
+        # Booster directly before the word pushes it further from zero
+        prev_booster = np.zeros(len(ids))
+        has_prev = positions > doc_start
+        prev_booster[has_prev] = self._booster[ids[positions[has_prev] - 1]]
+        valence = valence + np.sign(valence) * prev_booster
+        
+        # ALL-CAPS sentiment words in mixed-case text are emphasised
+        valence = valence + np.sign(valence) * CAPS_INCREMENT * (caps & mixed_case[docs])
+        
+        # Negation anywhere in the three preceding words of the same text
+        negation_count = np.concatenate(([0], np.cumsum(self._is_negation[ids])))
+        window_start = np.maximum(positions - 3, doc_start)
+        negated = negation_count[positions] - negation_count[window_start] > 0
+        valence = np.where(negated, valence * NEGATION_SCALAR, valence)
+        
+        # 'but' shifts weight from what comes before it to what comes after
+        but_count = np.cumsum(ids == self._but)
+        buts_before = but_count - np.concatenate(([0], but_count))[doc_start]
+        has_but = np.bincount(docs, weights=ids == self._but, minlength=n)[docs] > 0
+        valence = valence * np.where(has_but, np.where(buts_before > 0, 1.5, 0.5), 1.0)
+        
+        total = np.bincount(docs, weights=valence, minlength=n)
+        positive = np.bincount(docs, weights=np.clip(valence, 0, None), minlength=n)
+        negative = -np.bincount(docs, weights=np.clip(valence, None, 0), minlength=n)
+        hits = np.bincount(docs, weights=valence != 0, minlength=n)
+        words = np.bincount(docs, weights=is_word, minlength=n)
+        exclamations = np.bincount(docs, weights=~is_word, minlength=n)
+        
+        # Up to four exclamation marks amplify whichever way the text already leans
+        total = total + np.sign(total) * np.minimum(exclamations, 4) * EXCLAMATION_INCREMENT
+        compound = total / np.sqrt(total * total + NORMALIZATION_ALPHA)
+        
+        return {'compound': compound, 'positive': positive, 'negative': negative,
+                'hits': hits, 'words': words}
+    
+    def classify(self, texts: List[str]) -> Tuple[List[str], np.ndarray]:
+        """Label texts POSITIVE, NEGATIVE or NEUTRAL and return the labels with their confidences."""
+        scores = self.score(texts)
+        compound = scores['compound']
+        
+        labels = np.where(compound >= NEUTRAL_BAND, 'POSITIVE',
+                          np.where(compound <= -NEUTRAL_BAND, 'NEGATIVE', 'NEUTRAL'))
+        
+        # Polar: strength of the compound score, discounted when the text is mixed
+        mass = scores['positive'] + scores['negative']
+        agreement = np.abs(scores['positive'] - scores['negative']) / np.maximum(mass, 1e-9)
+        polar_confidence = np.minimum(np.abs(compound) / POLAR_FULL_CONFIDENCE, 1.0) * agreement
+        
+        # Neutral: capped, since no sentiment words may just mean words the lexicon lacks
+        length_factor = np.clip(1.0 - scores['words'] / self.neutral_word_limit, 0.0, 1.0)
+        neutral_confidence = NEUTRAL_MAX_CONFIDENCE * length_factor * np.where(scores['hits'] == 0, 1.0, 0.5)
+        informational = np.array([
+            bool(_IDENTIFIER.match(text.strip()) or _INFORMATIONAL.search(text)) if text else False
+            for text in texts
+        ], dtype=bool)
+        neutral_confidence = np.where(
+            informational & (scores['hits'] == 0) & (scores['words'] <= INFORMATIONAL_MAX_WORDS),
+            INFORMATIONAL_CONFIDENCE, neutral_confidence
+        )
+        
+        confidence = np.where(labels == 'NEUTRAL', neutral_confidence, polar_confidence)
+        return labels.tolist(), confidence
+    
+    def confident(self, texts: List[str]) -> List[Optional[str]]:
+        """Labels for texts classified at or above the threshold; None where the LLM should decide."""
+        labels, confidence = self.classify(texts)
+        return [label if conf >= self.threshold else None for label, conf in zip(labels, confidence)]
\ No newline at end of file
@@ -1,33 +1,290 @@
-from typing import List
+import asyncio
+import re
+from typing import List, Dict, Optional, Union
 from langchain_openai import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
-from models import Mention, PlatformReport
+from langchain_core.language_models import BaseChatModel
+from models import Mention, MentionBatch, PlatformReport
+from utils.llm_cache import LLMCache
+from analysis.tokens import count_tokens, truncate_to_tokens
+from analysis.local_sentiment import LocalSentimentClassifier
+from utils.tracing import Tracer, NOOP_TRACER, current_span, traced
+
+
+SENTIMENT_LABELS = ('POSITIVE', 'NEGATIVE', 'NEUTRAL')
+
+SENTIMENT_PROMPT = "Analyze the sentiment of the following text. Respond with exactly one word: POSITIVE, NEGATIVE, or NEUTRAL."
+BATCH_SENTIMENT_PROMPT = (
+    "Analyze the sentiment of each numbered text below. "
+    "Respond with one line per text in the form '<number>: <label>', "
+    "where <label> is exactly one of POSITIVE, NEGATIVE, or NEUTRAL. "
+    "Answer for every number and add nothing else."
+)
+SUMMARY_PROMPT = "Generate a concise summary of the following mentions of a keyword. Focus on the main themes and sentiments."
+REDUCE_SUMMARY_PROMPT = (
+    "The following are partial summaries of mentions of a keyword. "
+    "Combine them into one concise summary. Focus on the main themes and sentiments."
+)
+
+# Matches one line of a numbered batch response, e.g. "3: NEGATIVE" or "[3] negative"
+_BATCH_LINE = re.compile(
+    r'^\s*\[?(\d+)\]?\s*[:.)\-]?\s*(' + '|'.join(SENTIMENT_LABELS) + r')\b',
+    re.IGNORECASE | re.MULTILINE
+)
 
 
 class ContentAnalyzer:
-    def __init__(self, openai_api_key: str):
-        self.llm = ChatOpenAI(
-            model_name="gpt-4o",
+    def __init__(self, openai_api_key: str, batch_token_budget: int = 3000, max_batch_size: int = 50,
+                 cache: Optional[LLMCache] = None, max_concurrency: int = 8,
+                 summary_token_budget: int = 8000,
+                 local_classifier: Optional[LocalSentimentClassifier] = None,
+                 llm: Optional[BaseChatModel] = None, tracer: Tracer = NOOP_TRACER):
+        self.model_name = "gpt-4o"
+        self.temperature = 0
+        # Any chat model can stand in for OpenAI, e.g. the benchmarks' fake backend
+        self.llm = llm if llm is not None else ChatOpenAI(
+            model_name=self.model_name,
             openai_api_key=openai_api_key,
-            temperature=0
+            temperature=self.temperature
         )
+        self.cache = cache
+        # Shared cap on in-flight LLM requests across every platform and keyword
+        self._llm_limit = asyncio.Semaphore(max_concurrency)
+        self.batch_token_budget = batch_token_budget
+        self.max_batch_size = max_batch_size
+        self.summary_token_budget = summary_token_budget
+        # Confident local labels skip the LLM entirely
+        self.local_classifier = local_classifier
+        self.local_resolved = 0
+        self.tracer = tracer
+    
+    async def _generate(self, messages, call: str):
+        """Send one chat request to the LLM under the concurrency cap, tracing its time and token usage."""
+        async with self._llm_limit:
+            with self.tracer.span('llm', call=call) as span:
+                response = await self.llm.agenerate([messages])
+                usage = (response.llm_output or {}).get('token_usage') or {}
+                span.set(prompt_tokens=usage.get('prompt_tokens'), completion_tokens=usage.get('completion_tokens'))
         
+        self.tracer.count('llm_requests_total', call=call)
+        for kind in ('prompt', 'completion'):
+            if usage.get(f'{kind}_tokens'):
+                self.tracer.count('llm_tokens_total', value=usage[f'{kind}_tokens'], type=kind)
+        return response
+    
+    def _cache_key(self, text: str, prompt: str) -> Optional[str]:
+        """Cache key for a call with this analyzer's model settings, or None without a cache."""
+        if self.cache is None or not self.cache.enabled:
+            return None
+        return LLMCache.make_key(text, self.model_name, self.temperature, prompt)
+    
     async def analyze_sentiment(self, text: str) -> str:
+        if self.local_classifier is not None:
+            label = self.local_classifier.confident([text])[0]
+            if label is not None:
+                self.local_resolved += 1
+                return label
+        
+        key = self._cache_key(text, SENTIMENT_PROMPT)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        sentiment = await self._classify_single(text)
+        
+        if key is not None and sentiment in SENTIMENT_LABELS:
+            self.cache.set(key, sentiment)
+        return sentiment
+    
+    async def _classify_single(self, text: str) -> str:
+        """Classify one text with its own LLM request, bypassing the cache."""
         prompt = ChatPromptTemplate.from_messages([
-            ("system", "Analyze the sentiment of the following text. Respond with exactly one word: POSITIVE, NEGATIVE, or NEUTRAL."),
+            ("system", SENTIMENT_PROMPT),
             ("user", "{text}")
         ])
         
-        response = await self.llm.agenerate([prompt.format_messages(text=text)])
+        response = await self._generate(prompt.format_messages(text=text), 'sentiment')
         return response.generations[0][0].text.strip()
     
-    async def generate_summary(self, mentions: List[Mention]) -> str:
-        all_content = "\n".join([f"Title: {m.title}\nDescription: {m.description}" for m in mentions])
+    def _chunk_by_tokens(self, texts: List[str], budget: int, max_items: Optional[int] = None,
+                         overhead: int = 1) -> List[List[int]]:
+        """Group text indices into consecutive chunks that fit the token budget and item cap."""
+        chunks = []
+        current, current_tokens = [], 0
+        
+        for i, text in enumerate(texts):
+            tokens = count_tokens(text, self.model_name) + overhead
+            if current and (current_tokens + tokens > budget
+                            or (max_items and len(current) >= max_items)):
+                chunks.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        
+        if current:
+            chunks.append(current)
+        return chunks
+    
+    def _build_batches(self, texts: List[str]) -> List[List[int]]:
+        """Group text indices into batches that fit the token budget and size cap."""
+        # Numbering and the one-line answer add a few tokens per item
+        return self._chunk_by_tokens(texts, self.batch_token_budget, self.max_batch_size, overhead=8)
+    
+    def _parse_batch_response(self, text: str, size: int) -> Optional[Dict[int, str]]:
+        """
+        Parse a numbered batch response into {item number: label}.
+        Returns None when the response is malformed (unknown or conflicting numbers).
+        """
+        labels = {}
+        for number, label in _BATCH_LINE.findall(text):
+            number, label = int(number), label.upper()
+            if number < 1 or number > size:
+                return None
+            if labels.get(number, label) != label:
+                return None
+            labels[number] = label
+        return labels
+    
+    async def _classify_batch(self, texts: List[str]) -> Optional[Dict[int, str]]:
+        """Classify several texts with a single LLM request."""
+        numbered = "\n".join(
+            f"{n}. {' '.join(text.split()) or '(empty)'}" for n, text in enumerate(texts, start=1)
+        )
         
         prompt = ChatPromptTemplate.from_messages([
-            ("system", "Generate a concise summary of the following mentions of a keyword. Focus on the main themes and sentiments."),
+            ("system", BATCH_SENTIMENT_PROMPT),
             ("user", "{text}")
         ])
         
-        response = await self.llm.agenerate([prompt.format_messages(text=all_content)])
-        return response.generations[0][0].text.strip()
\ No newline at end of file
+        response = await self._generate(prompt.format_messages(text=numbered), 'sentiment_batch')
+        return self._parse_batch_response(response.generations[0][0].text, len(texts))
+    
+    @traced('sentiment', lambda mentions, **_: {'mentions': len(mentions)})
+    async def analyze_sentiment_batch(self, mentions: Union[List[Mention], MentionBatch]) -> List[str]:
+        """
+        Classify the sentiment of many mentions using as few LLM requests as possible.
+        Descriptions the local classifier labels confidently never reach the LLM. The
+        rest are packed into numbered batches sized to the token budget; any item a
+        batch response does not answer cleanly is retried with its own request.
+        Results share cache entries with analyze_sentiment, so only unseen texts are sent.
+        Sets the sentiment of each mention (the sentiment column of a MentionBatch)
+        and returns the labels in order.
+        """
+        if isinstance(mentions, MentionBatch):
+            texts = [description or "" for description in mentions.description]
+        else:
+            texts = [mention.description or "" for mention in mentions]
+        results: List[Optional[str]] = [None] * len(texts)
+        
+        if self.local_classifier is not None and texts:
+            results = self.local_classifier.confident(texts)
+            self.local_resolved += sum(label is not None for label in results)
+        
+        keys = [self._cache_key(text, SENTIMENT_PROMPT) if results[i] is None else None
+                for i, text in enumerate(texts)]
+        
+        for i, key in enumerate(keys):
+            if key is not None:
+                results[i] = self.cache.get(key)
+        
+        pending = [i for i, label in enumerate(results) if label is None]
+        batches = [[pending[j] for j in batch] for batch in self._build_batches([texts[i] for i in pending])]
+        current_span().set(llm_items=len(pending), batches=len(batches))
+        responses = await asyncio.gather(
+            *[self._classify_batch([texts[i] for i in batch]) for batch in batches],
+            return_exceptions=True
+        )
+        
+        for batch, labels in zip(batches, responses):
+            if isinstance(labels, Exception):
+                print(f"Batch sentiment request failed, falling back to single requests: {str(labels)}")
+                continue
+            if labels is None:
+                print("Malformed batch sentiment response, falling back to single requests")
+                continue
+            for number, index in enumerate(batch, start=1):
+                results[index] = labels.get(number)
+                if results[index] is not None and keys[index] is not None:
+                    self.cache.set(keys[index], results[index])
+        
+        # Fall back to one request per item for anything the batches did not answer
+        missing = [i for i, label in enumerate(results) if label is None]
+        current_span().set(fallback_items=len(missing))
+        if missing:
+            fallback = await asyncio.gather(*[self._classify_single(texts[i]) for i in missing])
+            for index, label in zip(missing, fallback):
+                results[index] = label
+                if keys[index] is not None and label in SENTIMENT_LABELS:
+                    self.cache.set(keys[index], label)
+        
+        if isinstance(mentions, MentionBatch):
+            mentions.sentiment = list(results)
+        else:
+            for mention, label in zip(mentions, results):
+                mention.sentiment = label
+        return results
+    
+    async def _summarize(self, text: str, system_prompt: str) -> str:
+        """Run one summary request, using the cache when available."""
+        key = self._cache_key(text, system_prompt)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        prompt = ChatPromptTemplate.from_messages([
+            ("system", system_prompt),
+            ("user", "{text}")
+        ])
+        
+        call = 'summary' if system_prompt == SUMMARY_PROMPT else 'reduce_summary'
+        response = await self._generate(prompt.format_messages(text=text), call)
+        summary = response.generations[0][0].text.strip()
+        
+        if key is not None:
+            self.cache.set(key, summary)
+        return summary
+    
+    def _fit_chunks(self, texts: List[str]) -> List[str]:
+        """Join texts into chunks that each fit the per-summary token ceiling."""
+        # A single text over the ceiling is cut down so it fits on its own
+        texts = [truncate_to_tokens(text, self.summary_token_budget, self.model_name) for text in texts]
+        chunks = self._chunk_by_tokens(texts, self.summary_token_budget)
+        return ["\n".join(texts[i] for i in chunk) for chunk in chunks]
+    
+    @traced('summary', lambda mentions, **_: {'mentions': len(mentions)})
+    async def generate_summary(self, mentions: Union[List[Mention], MentionBatch]) -> str:
+        """
+        Summarize mentions within the per-summary token ceiling.
+        Content that fits is summarized in one request. Larger content is split
+        into chunks that are summarized concurrently (map), then the partial
+        summaries are combined level by level until one remains (reduce).
+        """
+        if isinstance(mentions, MentionBatch):
+            pairs = zip(mentions.title, mentions.description)
+        else:
+            pairs = ((m.title, m.description) for m in mentions)
+        items = [f"Title: {title}\nDescription: {description}" for title, description in pairs]
+        all_content = "\n".join(items)
+        
+        if count_tokens(all_content, self.model_name) <= self.summary_token_budget:
+            return await self._summarize(all_content, SUMMARY_PROMPT)
+        
+        # Map: summarize each chunk of mentions concurrently
+        partials = await asyncio.gather(*[
+            self._summarize(chunk, SUMMARY_PROMPT) for chunk in self._fit_chunks(items)
+        ])
+        current_span().set(chunks=len(partials))
+        
+        # Reduce: combine partial summaries until they fit in a single request
+        while True:
+            chunks = self._fit_chunks(list(partials))
+            if len(chunks) >= len(partials) > 1:
+                # Summaries are not getting shorter; keep what fits and finish
+                chunks = [truncate_to_tokens("\n".join(partials), self.summary_token_budget, self.model_name)]
+            if len(chunks) == 1:
+                return await self._summarize(chunks[0], REDUCE_SUMMARY_PROMPT)
+            partials = await asyncio.gather(*[
+                self._summarize(chunk, REDUCE_SUMMARY_PROMPT) for chunk in chunks
+            ])
\ No newline at end of file
@@ -0,0 +1,42 @@
+from functools import lru_cache
+
+try:
+    import tiktoken
+except ImportError:  # Fall back to a character-based estimate
+    tiktoken = None
+
+
+@lru_cache(maxsize=None)
+def _get_encoding(model: str):
+    """Load (once) the tokenizer for a model, or None if unavailable."""
+    if tiktoken is None:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(model)
+        except KeyError:
+            return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # Encodings are downloaded on first use, which fails offline
+        print(f"Could not load the tokenizer for {model}, estimating tokens from characters: {str(e)}")
+        return None
+
+
+def count_tokens(text: str, model: str = "gpt-4o") -> int:
+    """Count the tokens text uses for a model."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        # Roughly 4 characters per token for English text
+        return len(text) // 4 + 1
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text: str, max_tokens: int, model: str = "gpt-4o") -> str:
+    """Cut text down to at most max_tokens tokens."""
+    encoding = _get_encoding(model)
+    if encoding is None:
+        return text[:max_tokens * 4]
+    tokens = encoding.encode(text, disallowed_special=())
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])
\ No newline at end of file
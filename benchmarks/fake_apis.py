@@ -0,0 +1,208 @@
+import asyncio
+import random
+import time
+import zlib
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from aiohttp import web
+
+# Path prefix of each emulated API, keyed by the Platform name that uses it
+ROUTES = {
+    "GoogleSearch": "/google/customsearch/v1",
+    "YouTube": "/youtube",
+    "StackExchange": "/stackexchange",
+    "HackerNews": "/hn",
+    "GitHub": "/github",
+    "CurrentNews": "/currentnews/search",
+}
+
+_WORDS = (
+    "pricing checkout landing page conversion funnel test variant control traffic signup "
+    "onboarding dashboard metric retention churn cohort experiment result analytics tracking "
+    "mobile desktop layout button headline copy design users customers team launch release "
+    "feature update report week month growth revenue campaign email search ads budget"
+).split()
+
+_TONES = (
+    "this works great and we love the results",
+    "honestly a terrible experience, everything broke",
+    "not sure yet, still collecting data",
+    "the numbers look okay but the setup was confusing",
+    "amazing improvement, highly recommend it",
+    "disappointing, we lost a lot of time on it",
+)
+
+
+class FakePlatformAPI:
+    """
+    Local aiohttp server that answers like the platform search APIs.
+    
+    Every endpoint serves `pages` pages of made-up results for any query, after
+    `latency` seconds (plus up to `jitter` more), and fails a share `error_rate`
+    of requests with 503 so retries are exercised. Result texts are generated
+    from a seed and are distinct, so deduplication does not hide the load.
+    
+    Usage:
+        api = FakePlatformAPI(latency=0.05, pages=3)
+        url = await api.start()
+        platform.base_url = url + ROUTES[platform.name]
+        ...
+        await api.stop()
+    """
+    
+    def __init__(self, latency: float = 0.05, jitter: float = 0.0, pages: int = 3,
+                 error_rate: float = 0.0, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.pages = pages
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self.requests = 0
+        self.errors = 0
+        self.url: Optional[str] = None
+        self._runner: Optional[web.AppRunner] = None
+    
+    def _app(self) -> web.Application:
+        app = web.Application(middlewares=[self._inject])
+        app.router.add_get(ROUTES["GoogleSearch"], self._google)
+        app.router.add_get(ROUTES["YouTube"] + "/search", self._youtube)
+        app.router.add_get(ROUTES["StackExchange"] + "/search", self._stackexchange)
+        app.router.add_get(ROUTES["HackerNews"] + "/{endpoint}", self._hackernews)
+        app.router.add_get(ROUTES["GitHub"] + "/search/{kind}", self._github)
+        app.router.add_get(ROUTES["CurrentNews"], self._currentnews)
+        return app
+    
+    async def start(self) -> str:
+        """Serve on a free local port and return the base URL."""
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self.url
+    
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+    
+    @web.middleware
+    async def _inject(self, request: web.Request, handler) -> web.StreamResponse:
+        """Add latency to every request and fail some of them."""
+        self.requests += 1
+        await asyncio.sleep(self.latency + self._random.random() * self.jitter)
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            return web.json_response({'error': {'message': "Injected failure"}}, status=503)
+        return await handler(request)
+    
+    def _items(self, source: str, keyword: str, page: int, count: int) -> List[Dict]:
+        """Distinct, reproducible results for one page; empty past the last page."""
+        if page >= self.pages:
+            return []
+        
+        items = []
+        now = int(time.time())
+        for index in range(count):
+            seed = zlib.crc32(f"{source}|{keyword}|{page}|{index}".encode('utf-8'))
+            rng = random.Random(seed)
+            words = " ".join(rng.choice(_WORDS) for _ in range(12))
+            items.append({
+                'id': f"{seed:08x}",
+                'title': f"{keyword} {' '.join(rng.choice(_WORDS) for _ in range(4))}",
+                'text': f"{keyword}: {words}, {rng.choice(_TONES)}.",
+                'url': f"https://example.com/{source}/{seed:08x}",
+                # Newest first across pages, a minute apart
+                'created': now - (page * count + index) * 60,
+            })
+        return items
+    
+    async def _google(self, request: web.Request) -> web.Response:
+        query = request.query
+        page = (int(query.get('start', 1)) - 1) // 10
+        items = self._items("google", query.get('q', ''), page, int(query.get('num', 10)))
+        return web.json_response({'items': [
+            {'title': item['title'], 'link': item['url'], 'snippet': item['text']} for item in items
+        ]})
+    
+    async def _youtube(self, request: web.Request) -> web.Response:
+        query = request.query
+        items = self._items("youtube", query.get('q', ''), 0, int(query.get('maxResults', 10)))
+        return web.json_response({'items': [
+            {
+                'id': {'videoId': item['id']},
+                'snippet': {
+                    'title': item['title'],
+                    'description': item['text'],
+                    'publishedAt': datetime.fromtimestamp(item['created'], timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                }
+            }
+            for item in items
+        ]})
+    
+    async def _stackexchange(self, request: web.Request) -> web.Response:
+        query = request.query
+        page = int(query.get('page', 1)) - 1
+        items = self._items("stackexchange", query.get('intitle', ''), page, int(query.get('pagesize', 30)))
+        return web.json_response({
+            'items': [
+                {'title': item['title'], 'link': item['url'], 'excerpt': item['text'], 'creation_date': item['created']}
+                for item in items
+            ],
+            'has_more': page + 1 < self.pages,
+            'quota_remaining': 10000
+        })
+    
+    async def _hackernews(self, request: web.Request) -> web.Response:
+        query = request.query
+        items = self._items("hn", query.get('query', ''), int(query.get('page', 0)), int(query.get('hitsPerPage', 20)))
+        return web.json_response({
+            'hits': [
+                {
+                    'objectID': item['id'],
+                    'title': item['title'],
+                    'url': item['url'],
+                    'story_text': item['text'],
+                    'created_at_i': item['created']
+                }
+                for item in items
+            ],
+            'nbPages': self.pages
+        })
+    
+    async def _github(self, request: web.Request) -> web.Response:
+        query = request.query
+        kind = request.match_info['kind']
+        per_page = int(query.get('per_page', 30))
+        items = self._items(f"github-{kind}", query.get('q', ''), int(query.get('page', 1)) - 1, per_page)
+        name = 'name' if kind == 'repositories' else 'title'
+        return web.json_response({
+            'total_count': self.pages * per_page,
+            'items': [
+                {
+                    name: item['title'],
+                    'html_url': item['url'],
+                    'description': item['text'],
+                    'created_at': datetime.fromtimestamp(item['created'], timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+                }
+                for item in items
+            ]
+        })
+    
+    async def _currentnews(self, request: web.Request) -> web.Response:
+        query = request.query
+        page = int(query.get('page_number', 1)) - 1
+        items = self._items("currentnews", query.get('keywords', ''), page, int(query.get('page_size', 30)))
+        return web.json_response({
+            'status': 'ok',
+            'news': [
+                {
+                    'title': item['title'],
+                    'url': item['url'],
+                    'description': item['text'],
+                    'published': datetime.fromtimestamp(item['created'], timezone.utc).strftime('%Y-%m-%d %H:%M:%S +0000')
+                }
+                for item in items
+            ]
+        })
\ No newline at end of file
@@ -0,0 +1,83 @@
+import asyncio
+import re
+import time
+import zlib
+from typing import Any, Dict, List, Optional
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from analysis.sentiment import SENTIMENT_LABELS, SENTIMENT_PROMPT, BATCH_SENTIMENT_PROMPT
+from analysis.tokens import count_tokens
+
+_NUMBERED_ITEM = re.compile(r'^(\d+)\. (.*)$', re.MULTILINE)
+
+
+def _label(text: str) -> str:
+    """Stable made-up sentiment for a text."""
+    return SENTIMENT_LABELS[zlib.crc32(text.encode('utf-8')) % len(SENTIMENT_LABELS)]
+
+
+class FakeChatOpenAI(BaseChatModel):
+    """
+    Offline stand-in for ChatOpenAI with a configurable response latency.
+    
+    Answers the analyzer's sentiment prompts in the format it parses, returns a
+    short canned text for anything else, and reports token usage in llm_output
+    the way ChatOpenAI does. Counts calls and tokens for the benchmark report.
+    """
+    
+    model_name: str = "gpt-4o"
+    latency: float = 0.2  # Seconds per request
+    calls: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    
+    @property
+    def _llm_type(self) -> str:
+        return "fake-openai"
+    
+    def _reply(self, messages: List[BaseMessage]) -> str:
+        system, text = messages[0].content, messages[-1].content
+        if system == BATCH_SENTIMENT_PROMPT:
+            return "\n".join(f"{number}: {_label(item)}" for number, item in _NUMBERED_ITEM.findall(text))
+        if system == SENTIMENT_PROMPT:
+            return _label(text)
+        return f"Summary of {text.count('Title:') or 1} mentions: mostly practical discussion with mixed opinions."
+    
+    def _result(self, messages: List[BaseMessage]) -> ChatResult:
+        reply = self._reply(messages)
+        prompt_tokens = sum(count_tokens(message.content, self.model_name) for message in messages)
+        completion_tokens = count_tokens(reply, self.model_name)
+        self.calls += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+        
+        return ChatResult(
+            generations=[ChatGeneration(message=AIMessage(content=reply))],
+            llm_output={
+                'token_usage': {
+                    'prompt_tokens': prompt_tokens,
+                    'completion_tokens': completion_tokens,
+                    'total_tokens': prompt_tokens + completion_tokens
+                },
+                'model_name': self.model_name
+            }
+        )
+    
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        time.sleep(self.latency)
+        return self._result(messages)
+    
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager: Any = None, **kwargs: Any) -> ChatResult:
+        await asyncio.sleep(self.latency)
+        return self._result(messages)
+    
+    def _combine_llm_outputs(self, llm_outputs: List[Optional[Dict]]) -> Dict:
+        """Sum token usage over a batch, like ChatOpenAI."""
+        usage: Dict[str, int] = {}
+        for output in llm_outputs:
+            for key, value in (output or {}).get('token_usage', {}).items():
+                usage[key] = usage.get(key, 0) + value
+        return {'token_usage': usage, 'model_name': self.model_name}
\ No newline at end of file
@@ -0,0 +1,143 @@
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Optional
+from benchmarks.scenario import MODES, run_scenario
+
+# keywords: keywords analyzed in one run, pages: result pages served per platform and keyword
+SCALES = {
+    'small': {'keywords': 1, 'pages': 1},
+    'medium': {'keywords': 4, 'pages': 3},
+    'large': {'keywords': 12, 'pages': 5},
+}
+
+COLUMNS = (
+    ('scale', 'scale', '{}'),
+    ('mode', 'mode', '{}'),
+    ('mentions', 'mentions', '{}'),
+    ('elapsed_s', 'time s', '{:.2f}'),
+    ('mentions_per_s', 'mentions/s', '{:.1f}'),
+    ('pair_latency_p50_s', 'p50 s', '{:.2f}'),
+    ('pair_latency_p95_s', 'p95 s', '{:.2f}'),
+    ('llm_calls', 'LLM calls', '{}'),
+    ('peak_rss_mb', 'peak RSS MB', '{:.1f}'),
+    ('failed_pairs', 'failed', '{}'),
+    ('partial_pairs', 'partial', '{}'),
+    ('unanalyzed_mentions', 'unanalyzed', '{}'),
+)
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the code being measured, if run from a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_table(results: List[Dict]) -> None:
+    rows = [[fmt.format(result[key]) for key, _, fmt in COLUMNS] + ['' if result['valid'] else 'INVALID']
+            for result in results]
+    headers = [header for _, header, _ in COLUMNS] + ['']
+    widths = [max(len(cell) for cell in column) for column in zip(headers, *rows)]
+    for row in [headers] + rows:
+        print("  ".join(cell.rjust(width) for cell, width in zip(row, widths)).rstrip())
+
+
+def print_comparison(results: List[Dict], baseline_path: str) -> None:
+    """Print throughput and p95 changes against an earlier results file."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['scale'], r['mode']): r for r in json.load(f)['results']}
+    
+    print(f"\nCompared with {baseline_path}:")
+    for result in results:
+        before = baseline.get((result['scale'], result['mode']))
+        if before is None:
+            continue
+        if not (result['valid'] and before.get('valid', True)):
+            print(f"  {result['scale']}/{result['mode']}: not compared, a run had failed or partial pairs")
+            continue
+        changes = []
+        for key, label in (('mentions_per_s', 'mentions/s'), ('pair_latency_p95_s', 'p95'),
+                           ('llm_calls', 'LLM calls'), ('peak_rss_mb', 'peak RSS')):
+            if before[key]:
+                changes.append(f"{label} {(result[key] - before[key]) / before[key]:+.1%}")
+        print(f"  {result['scale']}/{result['mode']}: {', '.join(changes)}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark the analysis pipeline against local stand-in APIs and a fake LLM.")
+    parser.add_argument('--scales', default='small,medium', help=f"Comma-separated scales: {', '.join(SCALES)}")
+    parser.add_argument('--modes', default=','.join(MODES),
+                        help="Comma-separated modes: keyword (analyze_keyword per keyword), "
+                             "keywords (analyze_keywords), stream (StreamingPipeline)")
+    parser.add_argument('--api-latency', type=float, default=0.05, help="Seconds per API response")
+    parser.add_argument('--api-jitter', type=float, default=0.02, help="Extra random seconds per API response")
+    parser.add_argument('--llm-latency', type=float, default=0.2, help="Seconds per LLM response")
+    parser.add_argument('--error-rate', type=float, default=0.0, help="Share of API requests failed with 503")
+    parser.add_argument('--rate-limits', action='store_true', help="Keep the configured per-platform rate limits")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', help="Results file (default: output/benchmarks/<time>.json)")
+    parser.add_argument('--compare', help="Earlier results file to compare against")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    scenarios = [
+        {
+            'scale': scale,
+            'mode': mode,
+            **SCALES[scale],
+            'api_latency': args.api_latency,
+            'api_jitter': args.api_jitter,
+            'llm_latency': args.llm_latency,
+            'error_rate': args.error_rate,
+            'rate_limits': args.rate_limits,
+            'seed': args.seed,
+        }
+        for scale in args.scales.split(',')
+        for mode in args.modes.split(',')
+    ]
+    
+    results = []
+    for scenario in scenarios:
+        print(f"Running {scenario['scale']}/{scenario['mode']}...")
+        # A fresh process per scenario, so peak RSS and imports are not shared
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as executor:
+            results.append(executor.submit(run_scenario, scenario).result())
+    
+    print()
+    print_table(results)
+    
+    output = args.output or os.path.join(
+        "output", "benchmarks", f"{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump({
+            'created': datetime.now().isoformat(timespec='seconds'),
+            'commit': git_commit(),
+            'python': platform.python_version(),
+            'settings': {key: value for key, value in vars(args).items() if key not in ('output', 'compare')},
+            'results': results,
+        }, f, indent=2)
+    print(f"\nSaved results to {output}")
+    
+    if args.compare:
+        print_comparison(results, args.compare)
+    
+    invalid = [f"{result['scale']}/{result['mode']}" for result in results if not result['valid']]
+    if invalid:
+        print(f"\nInvalid runs with failed, partial or unanalyzed pairs: {', '.join(invalid)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
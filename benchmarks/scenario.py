@@ -0,0 +1,206 @@
+import asyncio
+import os
+import resource
+import sys
+import tempfile
+import time
+from typing import List, Dict, Any, Optional
+from config import Config
+from platforms.base import Platform
+from platforms.google_search import GoogleSearch
+from platforms.youtube import YouTube
+from platforms.stackexchange import StackExchange
+from platforms.github import GitHub
+from platforms.hackernews import HackerNews
+from platforms.current_news import CurrentNews
+from scheduler import Scheduler
+from pipeline import StreamingPipeline
+from report.csv_store import read_csv
+from report.generator import ReportGenerator
+from benchmarks.fake_apis import FakePlatformAPI, ROUTES
+from benchmarks.fake_llm import FakeChatOpenAI
+
+# Mentions per page of each emulated platform
+PAGE_SIZE = 50
+
+MODES = ('keyword', 'keywords', 'stream')
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Nearest-rank percentile, q in 0-100."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(int(-(-q * len(ordered) // 100)), 1)
+    return ordered[rank - 1]
+
+
+def build_platforms(config: Config, http, api_url: str, pages: int) -> List[Platform]:
+    """The HTTP platforms, sized to fetch `pages` pages each and pointed at the local API."""
+    platforms = [
+        GoogleSearch(config, max_results=10 * pages, http=http),
+        YouTube(config, http=http),
+        StackExchange(config, max_results=PAGE_SIZE * pages, http=http),
+        GitHub(config, max_results=PAGE_SIZE * pages, http=http),
+        HackerNews(config, max_results=PAGE_SIZE * pages, http=http),
+        CurrentNews(config, max_results=PAGE_SIZE * pages, http=http),
+    ]
+    for platform in platforms:
+        # Page sizes follow max_results, so cap them to get `pages` pages
+        if hasattr(platform, 'PAGE_SIZE'):
+            platform.PAGE_SIZE = PAGE_SIZE
+        platform.base_url = api_url + ROUTES[platform.name]
+    return platforms
+
+
+def count_unanalyzed(output_dir: str) -> int:
+    """Mentions written without a sentiment label, e.g. because the analysis failed."""
+    unanalyzed = 0
+    for file in os.listdir(output_dir):
+        if file.endswith('.csv') and file != 'platform_summaries.csv':
+            unanalyzed += int(read_csv(os.path.join(output_dir, file), usecols=['Sentiment'])['Sentiment'].isna().sum())
+    return unanalyzed
+
+
+def benchmark_config(state_dir: str, rate_limits: bool) -> Config:
+    """Default settings, with every file kept out of the real output directory."""
+    config = Config()
+    # The local APIs accept any key, but requests need one to be built
+    for key in ('GOOGLE_API_KEY', 'SEARCH_ENGINE_ID', 'YOUTUBE_API_KEY', 'STACKEXCHANGE_KEY',
+                'GITHUB_TOKEN', 'CURRENT_NEWS_API_KEY'):
+        setattr(config, key, "benchmark")
+    config.OUTPUT_DIR = os.path.join(state_dir, "csv")
+    config.INCREMENTAL_FETCH = False  # Every run fetches the same pages
+    config.LLM_CACHE_ENABLED = False  # Every run pays for the same LLM calls
+    config.LLM_CACHE_PATH = os.path.join(state_dir, "llm_cache.sqlite3")
+    config.CURSOR_STORE_PATH = os.path.join(state_dir, "cursors.json")
+    config.RATE_LIMIT_STATE_PATH = os.path.join(state_dir, "rate_limits.json") if rate_limits else None
+    config.HTTP_RETRY_BASE_DELAY = 0.05
+    return config
+
+
+async def _run(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    api = FakePlatformAPI(
+        latency=scenario['api_latency'],
+        jitter=scenario['api_jitter'],
+        pages=scenario['pages'],
+        error_rate=scenario['error_rate'],
+        seed=scenario['seed']
+    )
+    api_url = await api.start()
+    llm = FakeChatOpenAI(latency=scenario['llm_latency'])
+    keywords = [f"keyword {n}" for n in range(scenario['keywords'])]
+    baseline_rss = peak_rss_mb()
+    
+    with tempfile.TemporaryDirectory() as state_dir:
+        config = benchmark_config(state_dir, scenario['rate_limits'])
+        scheduler = Scheduler(config, platforms=[], llm=llm)
+        scheduler.platforms = build_platforms(config, scheduler.http, api_url, scenario['pages'])
+        if not scenario['rate_limits']:
+            # Measure the pipeline, not the token buckets of the real APIs
+            scheduler.http.limiter = None
+        report_generator = ReportGenerator(config.OUTPUT_DIR, tracer=scheduler.tracer)
+        
+        # Time each (keyword, platform) pair from the scheduler's side
+        pair_latencies: List[float] = []
+        mentions = 0
+        failed_pairs = partial_pairs = 0
+        run_platform, stream_platform = scheduler.run_platform, scheduler.stream_platform
+        
+        def record_outcome(error: Optional[str], pair_mentions: int) -> None:
+            # A pair that errored counts as failed without results, partial with some
+            nonlocal failed_pairs, partial_pairs
+            if error is None:
+                return
+            if pair_mentions:
+                partial_pairs += 1
+            else:
+                failed_pairs += 1
+        
+        async def timed_run(platform, keyword):
+            start = time.perf_counter()
+            report = await run_platform(platform, keyword)
+            pair_latencies.append(time.perf_counter() - start)
+            record_outcome(report.error, len(report.mentions))
+            return report
+        
+        async def timed_stream(platform, keyword, consume):
+            pair_mentions = 0
+            
+            async def counted(page):
+                nonlocal mentions, pair_mentions
+                mentions += len(page)
+                pair_mentions += len(page)
+                await consume(page)
+            
+            start = time.perf_counter()
+            note = await stream_platform(platform, keyword, counted)
+            pair_latencies.append(time.perf_counter() - start)
+            record_outcome(note, pair_mentions)
+            return note
+        
+        scheduler.run_platform, scheduler.stream_platform = timed_run, timed_stream
+        
+        start = time.perf_counter()
+        try:
+            if scenario['mode'] == 'stream':
+                pipeline = StreamingPipeline(
+                    scheduler, report_generator,
+                    queue_size=config.PIPELINE_QUEUE_SIZE,
+                    sentiment_workers=config.PIPELINE_SENTIMENT_WORKERS
+                )
+                await pipeline.run(keywords)
+            else:
+                if scenario['mode'] == 'keyword':
+                    # One keyword at a time, as the per-keyword entry point does
+                    reports_by_keyword = {}
+                    for keyword in keywords:
+                        reports_by_keyword[keyword] = await scheduler.analyze_keyword(keyword)
+                else:
+                    reports_by_keyword = await scheduler.analyze_keywords(keywords)
+                mentions = sum(len(report.mentions) for reports in reports_by_keyword.values() for report in reports)
+                report_generator.generate_reports(reports_by_keyword)
+            elapsed = time.perf_counter() - start
+        finally:
+            await scheduler.close()
+            await api.stop()
+        peak_rss = peak_rss_mb()
+        unanalyzed = count_unanalyzed(config.OUTPUT_DIR)
+    
+    return {
+        'scale': scenario['scale'],
+        'mode': scenario['mode'],
+        'keywords': scenario['keywords'],
+        'pages': scenario['pages'],
+        'pairs': len(pair_latencies),
+        'failed_pairs': failed_pairs,
+        'partial_pairs': partial_pairs,
+        'unanalyzed_mentions': unanalyzed,
+        # Throughput of a run whose pairs errored says nothing about the pipeline
+        'valid': failed_pairs == 0 and partial_pairs == 0 and unanalyzed == 0,
+        'mentions': mentions,
+        'elapsed_s': round(elapsed, 3),
+        'mentions_per_s': round(mentions / elapsed, 1) if elapsed else 0.0,
+        'pair_latency_p50_s': round(percentile(pair_latencies, 50), 3),
+        'pair_latency_p95_s': round(percentile(pair_latencies, 95), 3),
+        'llm_calls': llm.calls,
+        'llm_prompt_tokens': llm.prompt_tokens,
+        'llm_completion_tokens': llm.completion_tokens,
+        'local_sentiment_resolved': scheduler.analyzer.local_resolved,
+        'http_requests': api.requests,
+        'http_errors_injected': api.errors,
+        'baseline_rss_mb': round(baseline_rss, 1),
+        'peak_rss_mb': round(peak_rss, 1),
+    }
+
+
+def run_scenario(scenario: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one scenario to completion; meant to be called in a fresh process so peak RSS is its own."""
+    return asyncio.run(_run(scenario))
\ No newline at end of file
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Dict
 import os
 
 
@@ -11,18 +11,75 @@ load_dotenv()
 class Config:
     GOOGLE_API_KEY: str = os.environ.get('GOOGLE_API_KEY')
     SEARCH_ENGINE_ID: str = os.environ.get('SEARCH_ENGINE_ID')
+    GOOGLE_PAGE_CONCURRENCY: int = 10  # Result pages fetched at the same time
+    PAGE_CONCURRENCY: int = 4  # Result pages fetched at the same time on other paginated platforms
     YOUTUBE_API_KEY: str = os.environ.get('YOUTUBE_API_KEY')
     STACKEXCHANGE_KEY: str = os.environ.get('STACKEXCHANGE_KEY')
     OPENAI_API_KEY: str = os.environ.get('OPENAI_API_KEY')
     GITHUB_TOKEN: str = os.environ.get('GITHUB_TOKEN')
-    REDDIT_CLIENT_ID: str = "your_reddit_client_id"
-    REDDIT_CLIENT_SECRET: str = "your_reddit_client_secret"
+    REDDIT_CLIENT_ID: str = os.environ.get('REDDIT_CLIENT_ID')
+    REDDIT_CLIENT_SECRET: str = os.environ.get('REDDIT_CLIENT_SECRET')
     REDDIT_USER_AGENT: str = "keyword_analyzer_bot/1.0"
-    MASTODON_ACCESS_TOKEN: str = "your_mastodon_access_token"
-    MASTODON_INSTANCE: str = "mastodon.social"  # or your preferred instance
+    REDDIT_SUBREDDITS: List[str] = None  # Subreddits searched concurrently
+    REDDIT_SEARCH_CONCURRENCY: int = 4  # Reddit requests in flight at once
+    REDDIT_SEARCH_COMMENTS: bool = False  # Also scan the comments of the submissions found
+    REDDIT_COMMENT_SUBMISSIONS: int = 10  # Most-commented submissions whose comments are scanned per fetch
+    MASTODON_ACCESS_TOKEN: str = os.environ.get('MASTODON_ACCESS_TOKEN')  # Enables status search on MASTODON_INSTANCE
+    MASTODON_INSTANCE: str = "mastodon.social"  # Home instance of the access token
+    MASTODON_INSTANCES: List[str] = None  # Instances whose hashtag timelines are searched concurrently
     HN_API_KEY: str = "your_hn_api_key"
     OUTPUT_DIR: str = "output/csv"
 
+    HTTP_MAX_CONNECTIONS: int = 100  # Total pooled connections shared by all platforms
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 10
+    HTTP_DNS_CACHE_TTL: int = 300  # Seconds to cache DNS lookups
+    HTTP_KEEPALIVE_TIMEOUT: float = 30.0  # Seconds to keep idle connections open
+    HTTP_TIMEOUT: float = 30.0  # Total timeout for a single request
+    HTTP_RETRIES: int = 3  # Attempts per request on timeouts, connection errors, 429 and 5xx
+    HTTP_RETRY_BASE_DELAY: float = 0.5  # Seconds; doubled each attempt, with jitter
+    HTTP_RETRY_MAX_DELAY: float = 30.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 3  # Consecutive failed fetches before a platform is skipped
+    CIRCUIT_RESET_TIMEOUT: float = 300.0  # Seconds before a skipped platform is tried again
+
+    CONCURRENT_PLATFORMS: bool = True  # Run each platform as its own task
+    PLATFORM_TIMEOUT: float = 120.0  # Deadline in seconds for fetch + analysis of one platform
+    MAX_CONCURRENT_PLATFORMS: int = 10  # Cap on (keyword, platform) tasks running at the same time
+    PLATFORM_CONCURRENCY: int = 2  # Cap on keywords fetched from any one platform at the same time
+    MAX_CONCURRENT_LLM_REQUESTS: int = 8  # Cap on in-flight LLM requests across all platforms
+
+    STREAMING_PIPELINE: bool = False  # Analyze and write pages while platforms are still being fetched
+    PIPELINE_QUEUE_SIZE: int = 8  # Pages buffered between pipeline stages before the earlier stage waits
+    PIPELINE_SENTIMENT_WORKERS: int = 4  # Pages classified concurrently in the pipeline
+
+    INCREMENTAL_FETCH: bool = True  # Only fetch mentions newer than the last run for each keyword/platform
+    CURSOR_STORE_PATH: str = "output/state/cursors.json"
+
+    DEDUPLICATE_MENTIONS: bool = True  # Analyze cross-platform duplicates once and share the result
+    DEDUP_MAX_DISTANCE: int = 3  # SimHash bit distance at which two mentions count as near-duplicates
+
+    RATE_LIMITS: Dict[str, Dict[str, float]] = None  # Per-platform token bucket and daily quota
+    RATE_LIMIT_STATE_PATH: str = "output/state/rate_limits.json"
+
+    SENTIMENT_BATCH_TOKENS: int = 3000  # Approximate prompt token budget per batched sentiment request
+    SENTIMENT_BATCH_SIZE: int = 50  # Maximum mentions per batched sentiment request
+    SUMMARY_TOKEN_BUDGET: int = 8000  # Token ceiling for the content of a single summary request
+
+    LOCAL_SENTIMENT_ENABLED: bool = True  # Classify easy mentions offline before asking the LLM
+    LOCAL_SENTIMENT_THRESHOLD: float = 0.8  # Local confidence (0-1) below which the LLM decides
+    LOCAL_SENTIMENT_LEXICON_PATH: str = None  # Optional VADER-format lexicon file replacing the built-in one
+
+    LLM_CACHE_ENABLED: bool = True  # Set to False to bypass the LLM result cache
+    LLM_CACHE_PATH: str = "output/cache/llm_cache.sqlite3"
+    LLM_CACHE_TTL: float = 30 * 24 * 3600  # Seconds before a cached result expires
+    LLM_CACHE_MAX_ENTRIES: int = 100000  # Least recently used entries beyond this are evicted
+    FRAME_CACHE_DIR: str = "output/cache/frames"  # Parsed dashboard frames, reused while the CSV files are unchanged
+
+    POLL_INTERVALS: Dict[str, float] = None  # Daemon mode: seconds between polls per platform
+    DEFAULT_POLL_INTERVAL: float = 3600.0  # Daemon mode: interval for platforms not in POLL_INTERVALS
+    DAEMON_TICK: float = 5.0  # Daemon mode: longest sleep between scheduling checks
+    DAEMON_SHUTDOWN_TIMEOUT: float = 30.0  # Daemon mode: grace period for running polls on shutdown
+    DAEMON_STATE_PATH: str = "output/state/daemon.json"
+
     WIKIPEDIA_ACCESS_TOKEN: str = os.environ.get('WIKIPEDIA_ACCESS_TOKEN')  # Optional
     WIKIPEDIA_CLIENT_SECRET: str = os.environ.get('WIKIPEDIA_CLIENT_SECRET')  # Optional
     WIKIPEDIA_LANGUAGE: str = "en"  # Default language
@@ -32,8 +89,66 @@ class Config:
 
     TELEGRAM_BOT_TOKEN: str = "your_telegram_bot_token"
     TELEGRAM_SEARCH_CHANNELS: List[str] = None  # List of channel/group usernames to search
+    TELEGRAM_API_ID: str = os.environ.get('TELEGRAM_API_ID')  # From https://my.telegram.org/apps
+    TELEGRAM_API_HASH: str = os.environ.get('TELEGRAM_API_HASH')
+    TELEGRAM_SESSION_PATH: str = "output/state/telegram"  # Telethon session file (.session added); keeps login and resolved channels
+    TELEGRAM_SEARCH_CONCURRENCY: int = 4  # Channel searches in flight at once
+    TELEGRAM_MAX_FLOOD_WAIT: int = 60  # Seconds; longer FloodWait requests skip the channel instead of waiting
+
+    TRACING_ENABLED: bool = False  # Record stage timings and counters (also enabled by --trace)
+    TRACE_PATH: str = "output/traces/trace.jsonl"  # One JSON line per finished span
+    TRACE_MAX_BYTES: int = 50 * 1024 * 1024  # Trace file size before it is rotated to trace.jsonl.1; 0 never rotates
+    TRACE_BACKUP_COUNT: int = 5  # Rotated trace files kept
+    METRICS_PATH: str = "output/traces/metrics.prom"  # Prometheus text format, for node_exporter's textfile collector
 
     def __post_init__(self):
+        # rate: requests per second, burst: bucket size, daily_quota: requests per UTC day
+        if self.RATE_LIMITS is None:
+            self.RATE_LIMITS = {
+                "GoogleSearch": {"rate": 1.0, "burst": 10, "daily_quota": 100},  # Free CSE tier
+                "YouTube": {"rate": 1.0, "burst": 5, "daily_quota": 100},  # 10k units, 100 per search
+                "StackExchange": {"rate": 10.0, "burst": 10, "daily_quota": 10000},
+                "GitHub": {"rate": 0.5, "burst": 30},  # Search API: 30 requests/minute
+                "HackerNews": {"rate": 2.5, "burst": 10},  # Algolia: 10k requests/hour
+                "CurrentNews": {"rate": 1.0, "burst": 5, "daily_quota": 600},
+                "Wikipedia": {"rate": 10.0, "burst": 10},
+                "Reddit": {"rate": 1.5, "burst": 10},  # OAuth: 100 requests/minute
+            }
+
+        if self.POLL_INTERVALS is None:
+            self.POLL_INTERVALS = {
+                "HackerNews": 300,
+                "Reddit": 600,
+                "MastodonPlatform": 600,
+                "Telegram": 600,
+                "StackExchange": 900,
+                "GitHub": 1800,
+                "CurrentNews": 1800,
+                "YouTube": 3600,  # Searches are expensive against the daily quota
+                "GoogleSearch": 6 * 3600,  # 100 queries/day on the free tier
+                "Wikipedia": 24 * 3600,
+            }
+
+        if self.REDDIT_SUBREDDITS is None:
+            self.REDDIT_SUBREDDITS = [
+                "all",  # Search on r/all stops at 100 results; the rest add depth
+                "technology",
+                "programming",
+                "startups",
+                "marketing",
+            ]
+
+        if self.MASTODON_INSTANCES is None:
+            self.MASTODON_INSTANCES = [
+                self.MASTODON_INSTANCE,
+                "fosstodon.org",
+                "hachyderm.io",
+                "techhub.social",
+            ]
+        # Each instance has its own limit: 300 requests per 5 minutes
+        for instance in self.MASTODON_INSTANCES:
+            self.RATE_LIMITS.setdefault(f"MastodonPlatform@{instance}", {"rate": 1.0, "burst": 5})
+
         # Default public channels/groups to search if none specified
         if self.TELEGRAM_SEARCH_CHANNELS is None:
             self.TELEGRAM_SEARCH_CHANNELS = [
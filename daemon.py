@@ -0,0 +1,148 @@
+import asyncio
+import json
+import os
+import signal
+import tempfile
+import time
+from typing import List, Dict, Set, Tuple
+from config import Config
+from platforms.base import Platform
+from scheduler import Scheduler
+from analysis.dedup import MentionDeduplicator
+from report.generator import ReportGenerator
+
+
+class MonitorDaemon:
+    """
+    Long-running monitor that polls each (keyword, platform) pair on its own interval.
+    
+    One Scheduler is kept for the life of the process, so HTTP connections, the
+    LLM cache, rate limiter buckets and circuit breakers stay warm between polls.
+    Intervals come from POLL_INTERVALS (per platform name) with
+    DEFAULT_POLL_INTERVAL as fallback. Each finished poll is appended to the
+    reports straight away, and the next due time of every pair is saved to
+    DAEMON_STATE_PATH so a restart picks up where the last process stopped.
+    
+    SIGTERM or SIGINT stops scheduling new polls, lets running ones finish for up
+    to DAEMON_SHUTDOWN_TIMEOUT seconds, then persists all state and exits.
+    """
+    
+    MAX_DEDUP_GROUPS = 50000  # Start a fresh deduplicator beyond this many groups
+    
+    def __init__(self, config: Config, keywords: List[str]):
+        self.config = config
+        self.keywords = list(dict.fromkeys(keywords))
+        self.scheduler = Scheduler(config)
+        self.report_generator = ReportGenerator(config.OUTPUT_DIR, tracer=self.scheduler.tracer)
+        self.state_path = config.DAEMON_STATE_PATH
+        
+        self._next_poll: Dict[str, float] = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, encoding='utf-8') as f:
+                self._next_poll = json.load(f).get('next_poll', {})
+        
+        self._in_flight: Set[str] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+    
+    @staticmethod
+    def _key(keyword: str, platform: Platform) -> str:
+        return f"{platform.name}\t{keyword}"
+    
+    def _pairs(self) -> List[Tuple[str, Platform]]:
+        return [(keyword, platform) for keyword in self.keywords for platform in self.scheduler.platforms]
+    
+    def _interval(self, platform: Platform) -> float:
+        return self.config.POLL_INTERVALS.get(platform.name, self.config.DEFAULT_POLL_INTERVAL)
+    
+    def _save_state(self) -> None:
+        """Atomically persist the next due time of every pair."""
+        directory = os.path.dirname(self.state_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'next_poll': self._next_poll}, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def stop(self) -> None:
+        """Ask the daemon to shut down gracefully."""
+        if not self._stopping.is_set():
+            print("\nShutting down monitor...")
+        self._stopping.set()
+    
+    async def _poll(self, keyword: str, platform: Platform) -> None:
+        """Poll one pair, write its results and schedule its next poll."""
+        key = self._key(keyword, platform)
+        try:
+            report = await self.scheduler.run_platform(platform, keyword)
+            self.report_generator.generate_reports({keyword: [report]})
+            # Only this pair's results are written; other polls may still be running
+            self.scheduler.save_cursors([(keyword, platform.name)])
+            print(f"{platform.name} '{keyword}': {len(report.mentions)} new mentions")
+        except Exception as e:
+            print(f"Poll of {platform.name} for '{keyword}' failed: {str(e)}")
+        finally:
+            self._next_poll[key] = time.time() + self._interval(platform)
+            self._in_flight.discard(key)
+            self.scheduler.limiter.save()
+            self._save_state()
+            self.scheduler.tracer.flush()
+    
+    def _start_due_polls(self) -> float:
+        """Start every pair that is due and return seconds until the next one is."""
+        now = time.time()
+        next_due = now + self.config.DEFAULT_POLL_INTERVAL
+        
+        for keyword, platform in self._pairs():
+            key = self._key(keyword, platform)
+            if key in self._in_flight:
+                continue
+            due = self._next_poll.get(key, 0.0)
+            if due <= now:
+                self._in_flight.add(key)
+                task = asyncio.create_task(self._poll(keyword, platform))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+            else:
+                next_due = min(next_due, due)
+        
+        return max(next_due - now, 0.0)
+    
+    def _install_signal_handlers(self) -> None:
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, self.stop)
+            except (NotImplementedError, RuntimeError):
+                pass  # Not supported on this platform; Ctrl+C still interrupts
+    
+    async def run(self) -> None:
+        """Poll until stopped."""
+        self._install_signal_handlers()
+        print(f"Monitoring {len(self.keywords)} keywords on {len(self.scheduler.platforms)} platforms")
+        
+        try:
+            while not self._stopping.is_set():
+                # Keep duplicate tracking bounded in a long-lived process
+                if self.scheduler.dedup and len(self.scheduler.dedup) > self.MAX_DEDUP_GROUPS:
+                    self.scheduler.dedup = MentionDeduplicator(self.config.DEDUP_MAX_DISTANCE)
+                
+                wait = self._start_due_polls()
+                try:
+                    # Re-check at least every few seconds so finished polls get rescheduled
+                    await asyncio.wait_for(self._stopping.wait(), timeout=min(wait, self.config.DAEMON_TICK))
+                except asyncio.TimeoutError:
+                    pass
+            
+            if self._tasks:
+                _, pending = await asyncio.wait(set(self._tasks), timeout=self.config.DAEMON_SHUTDOWN_TIMEOUT)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            await self.scheduler.close()
+            self._save_state()
\ No newline at end of file
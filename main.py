@@ -1,76 +1,94 @@
+import argparse
 import asyncio
 import traceback
-from typing import List
+from typing import List, Dict
 from config import Config
 from models import PlatformReport
 from utils.term_loading import TermLoading
-from platforms.google_search import GoogleSearch
-from platforms.youtube import YouTube
-from platforms.stackexchange import StackExchange
-from platforms.github import GitHub
-from platforms.hackernews import HackerNews
-from platforms.current_news import CurrentNews
-# from platforms.reddit import Reddit
-# from platforms.mastodon import Mastodon
-# from platforms.wikipedia import Wikipedia
-# from platforms.telegram import Telegram
-from analysis.sentiment import ContentAnalyzer
+from scheduler import Scheduler
+from daemon import MonitorDaemon
+from pipeline import StreamingPipeline
 from report.generator import ReportGenerator
 
 
 async def analyze_keyword(keyword: str, config: Config) -> str:
-    # Initialize platforms
-    platforms = [
-        GoogleSearch(config, max_results=10),
-        YouTube(config),
-        StackExchange(config),
-        # GitHub(config),
-        # HackerNews(config),
-        # CurrentNews(config),
-        # Reddit(config),
-        # Mastodon(config),
-        # Wikipedia(config),
-        # Telegram(config),
-    ]
-    
-    # Initialize analyzers
-    analyzer = ContentAnalyzer(config.OPENAI_API_KEY)
-    report_generator = ReportGenerator(config.OUTPUT_DIR)
-    
-    platform_reports: List[PlatformReport] = []
-    
-    # Fetch and analyze mentions from each platform
-    for platform in platforms:
-        mentions = await platform.fetch_mentions(keyword)
-        
-        # Analyze sentiment for each mention
-        for mention in mentions:
-            mention.sentiment = await analyzer.analyze_sentiment(mention.description)
-        
-        # Generate platform summary
-        summary = await analyzer.generate_summary(mentions)
+    return await analyze_keywords([keyword], config)
+
+
+async def analyze_keywords(keywords: List[str], config: Config) -> Dict:
+    """
+    Analyze many keywords on one event loop with shared platform and LLM limits,
+    then write all results in a single report pass. With STREAMING_PIPELINE,
+    results are written page by page instead.
+    """
+    scheduler = Scheduler(config)
+    report_generator = ReportGenerator(config.OUTPUT_DIR, tracer=scheduler.tracer)
+    try:
+        if config.STREAMING_PIPELINE:
+            # Results are written page by page as they are analyzed
+            pipeline = StreamingPipeline(
+                scheduler, report_generator,
+                queue_size=config.PIPELINE_QUEUE_SIZE,
+                sentiment_workers=config.PIPELINE_SENTIMENT_WORKERS
+            )
+            updated_files = await pipeline.run(keywords)
+        else:
+            reports_by_keyword: Dict[str, List[PlatformReport]] = await scheduler.analyze_keywords(keywords)
+            
+            # Generate report files
+            updated_files = report_generator.generate_reports(reports_by_keyword)
         
-        platform_reports.append(PlatformReport(
-            platform=platform.__class__.__name__,
-            mentions=mentions,
-            summary=summary
-        ))
+        # Only advance the cursors once the mentions are safely written
+        scheduler.save_cursors()
+    finally:
+        await scheduler.close()
     
-    # Generate report files
-    report_generator = ReportGenerator(config.OUTPUT_DIR)
-    updated_files = report_generator.generate_report(keyword, platform_reports)
     return updated_files
 
 
+def load_keywords(path: str) -> List[str]:
+    """Read one keyword per line, skipping blank lines and # comments."""
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Monitor keyword mentions across platforms.")
+    parser.add_argument('keywords', nargs='*', help="Keywords to analyze")
+    parser.add_argument('-f', '--keywords-file', help="File with one keyword per line")
+    parser.add_argument('-s', '--stream', action='store_true',
+                        help="Analyze and write results page by page while platforms are still fetching")
+    parser.add_argument('-d', '--daemon', action='store_true',
+                        help="Keep running and poll each platform on its own interval")
+    parser.add_argument('-t', '--trace', action='store_true',
+                        help="Record stage timings to TRACE_PATH and metrics to METRICS_PATH")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
     config = Config()
-    keyword = "CRO"
+    args = parse_args()
+    
+    keywords = list(args.keywords)
+    if args.keywords_file:
+        keywords.extend(load_keywords(args.keywords_file))
+    if not keywords:
+        keywords = ["CRO"]
+
+    if args.stream:
+        config.STREAMING_PIPELINE = True
+    if args.trace:
+        config.TRACING_ENABLED = True
+    
+    if args.daemon:
+        asyncio.run(MonitorDaemon(config, keywords).run())
+        raise SystemExit(0)
 
     animation: TermLoading = TermLoading()
     animation.show('fetching...', finish_message='\nFinished!✅\n', failed_message='\nFailed!❌\n')
 
     try:
-        updated_files = asyncio.run(analyze_keyword(keyword, config))
+        updated_files = asyncio.run(analyze_keywords(keywords, config))
         print("\nUpdated platform files:")
         for platform, filepath in updated_files['platform_files'].items():
             print(f"- {platform}: {filepath}")
@@ -79,4 +97,4 @@ if __name__ == "__main__":
 
     except Exception:
         traceback.print_exc()
-        animation.failed = True
+        animation.failed = True
\ No newline at end of file
@@ -1,8 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict, Any, Iterable, Iterator, Union
 
-@dataclass
+@dataclass(slots=True)
 class Mention:
     platform: str
     title: str
@@ -10,9 +10,98 @@ class Mention:
     description: str
     date: Optional[datetime]
     sentiment: Optional[str] = None
+    additional_fields: Dict[str, Any] = field(default_factory=dict)  # Platform-specific extras, e.g. views
+
+class MentionBatch:
+    """
+    Columnar storage for many mentions: one list per field instead of one object
+    per mention. Extra fields live in `additional_fields` as one list per key,
+    padded with None for mentions that lack it.
+    
+    Analyzers read and write the columns directly, and to_frame() builds a
+    DataFrame without going through per-mention dicts.
+    """
+    
+    __slots__ = ('platform', 'title', 'url', 'description', 'date', 'sentiment', 'additional_fields')
+    
+    FIELDS = ('platform', 'title', 'url', 'description', 'date', 'sentiment')
+    
+    def __init__(self):
+        self.platform: List[str] = []
+        self.title: List[str] = []
+        self.url: List[str] = []
+        self.description: List[str] = []
+        self.date: List[Optional[datetime]] = []
+        self.sentiment: List[Optional[str]] = []
+        self.additional_fields: Dict[str, List[Any]] = {}
+    
+    @classmethod
+    def from_mentions(cls, mentions: Iterable[Mention]) -> 'MentionBatch':
+        batch = cls()
+        batch.extend(mentions)
+        return batch
+    
+    def __len__(self) -> int:
+        return len(self.url)
+    
+    def __getitem__(self, index: int) -> Mention:
+        return Mention(
+            platform=self.platform[index],
+            title=self.title[index],
+            url=self.url[index],
+            description=self.description[index],
+            date=self.date[index],
+            sentiment=self.sentiment[index],
+            additional_fields={
+                key: values[index] for key, values in self.additional_fields.items() if values[index] is not None
+            }
+        )
+    
+    def __iter__(self) -> Iterator[Mention]:
+        """Yield each row as a Mention copy; changes to it do not write back."""
+        for index in range(len(self)):
+            yield self[index]
+    
+    def append(self, mention: Mention) -> None:
+        size = len(self)
+        for name in self.FIELDS:
+            getattr(self, name).append(getattr(mention, name))
+        for key in mention.additional_fields:
+            if key not in self.additional_fields:
+                self.additional_fields[key] = [None] * size
+        for key, values in self.additional_fields.items():
+            values.append(mention.additional_fields.get(key))
+    
+    def extend(self, mentions: Union[Iterable[Mention], 'MentionBatch']) -> None:
+        if not isinstance(mentions, MentionBatch):
+            for mention in mentions:
+                self.append(mention)
+            return
+        
+        # Column-wise concatenation, padding extras either side lacks
+        size, added = len(self), len(mentions)
+        for name in self.FIELDS:
+            getattr(self, name).extend(getattr(mentions, name))
+        for key, values in mentions.additional_fields.items():
+            self.additional_fields.setdefault(key, [None] * size).extend(values)
+        for key, values in self.additional_fields.items():
+            if key not in mentions.additional_fields:
+                values.extend([None] * added)
+    
+    def columns(self) -> Dict[str, List[Any]]:
+        """All columns by name, extras after the standard fields."""
+        columns = {name: getattr(self, name) for name in self.FIELDS}
+        columns.update(self.additional_fields)
+        return columns
+    
+    def to_frame(self):
+        """Build a pandas DataFrame with one column per field."""
+        import pandas as pd
+        return pd.DataFrame(self.columns())
 
 @dataclass
 class PlatformReport:
     platform: str
-    mentions: List[Mention]
-    summary: Optional[str] = None
\ No newline at end of file
+    mentions: Union[List[Mention], MentionBatch]
+    summary: Optional[str] = None
+    error: Optional[str] = None  # Why the results are partial or missing, if they are
\ No newline at end of file
@@ -0,0 +1,148 @@
+import asyncio
+from typing import List, Dict, Optional, Tuple
+from models import Mention, MentionBatch, PlatformReport
+from platforms.base import Platform
+from scheduler import Scheduler
+from report.generator import ReportGenerator
+
+PairKey = Tuple[str, str]  # (keyword, platform name)
+
+
+class _StreamEnd:
+    """Marks the end of one pair's stream: how many pages it produced and why it stopped early, if it did."""
+    
+    def __init__(self, pages: int, note: Optional[str]):
+        self.pages = pages
+        self.note = note
+
+
+class StreamingPipeline:
+    """
+    Streams mentions through fetch -> dedup/sentiment -> write stages.
+    
+    Every (keyword, platform) pair streams pages from Platform.stream_mentions
+    into a bounded queue. A pool of workers deduplicates and classifies each
+    page and hands it to a second bounded queue, and a single writer appends
+    it to the platform's CSV file right away. Full queues block the stage
+    before them, so a fast platform cannot run ahead of the LLM and memory
+    stays bounded by the queue sizes. Once all pages of a pair are written,
+    its summary is generated in the background and its summary row appended.
+    
+    LLM calls for early pages overlap with network I/O for later ones, and
+    the first rows reach disk before the slowest platform has finished.
+    
+    Usage:
+        pipeline = StreamingPipeline(scheduler, ReportGenerator(config.OUTPUT_DIR))
+        updated_files = await pipeline.run(["CRO", "A/B testing"])
+        scheduler.save_cursors()
+    """
+    
+    def __init__(self, scheduler: Scheduler, report_generator: ReportGenerator,
+                 queue_size: int = 8, sentiment_workers: int = 4):
+        self.scheduler = scheduler
+        self.analyzer = scheduler.analyzer
+        self.report_generator = report_generator
+        self.queue_size = queue_size
+        self.sentiment_workers = sentiment_workers
+    
+    async def _fetch(self, keyword: str, platform: Platform,
+                     analyze_queue: asyncio.Queue, write_queue: asyncio.Queue) -> None:
+        """Fetch stage: stream one pair's pages into the analysis queue."""
+        key = (keyword, platform.name)
+        pages = 0
+        
+        async def emit(page: List[Mention]) -> None:
+            nonlocal pages
+            await analyze_queue.put((key, page))
+            # Counted once enqueued, so the writer never waits for a page whose put was cancelled
+            pages += 1
+        
+        note = await self.scheduler.stream_platform(platform, keyword, emit)
+        # Goes straight to the writer, which waits until it has seen all pages
+        await write_queue.put((key, _StreamEnd(pages, note)))
+    
+    async def _analyze(self, analyze_queue: asyncio.Queue, write_queue: asyncio.Queue) -> None:
+        """Dedup and sentiment stage: classify each page, once per duplicate group."""
+        dedup = self.scheduler.dedup
+        while True:
+            key, page = await analyze_queue.get()
+            try:
+                if dedup:
+                    await dedup.share_sentiment(page, self.analyzer.analyze_sentiment_batch)
+                else:
+                    await self.analyzer.analyze_sentiment_batch(page)
+            except Exception as e:
+                # Still write the page; its mentions are left without sentiment
+                print(f"Sentiment analysis failed for {key[1]} '{key[0]}': {str(e)}")
+            await write_queue.put((key, MentionBatch.from_mentions(page)))
+    
+    async def _summarize(self, key: PairKey, mentions: MentionBatch, note: Optional[str]) -> str:
+        """Generate and append the summary row of a finished pair. Returns the summary file path."""
+        keyword, platform = key
+        report = PlatformReport(platform=platform, mentions=mentions, summary=note)
+        if note is None:
+            try:
+                report.summary = await self.analyzer.generate_summary(mentions)
+            except Exception as e:
+                print(f"Summary failed for {platform} '{keyword}': {str(e)}")
+                report.summary = f"Partial results: {type(e).__name__}: {str(e)}"
+        return self.report_generator.append_summary(keyword, report)
+    
+    async def _write(self, pairs: List[PairKey], write_queue: asyncio.Queue, updated_files: Dict) -> None:
+        """Write stage: append pages as they arrive and summarize each pair once it is complete."""
+        collected: Dict[PairKey, MentionBatch] = {key: MentionBatch() for key in pairs}
+        received: Dict[PairKey, int] = {key: 0 for key in pairs}
+        ends: Dict[PairKey, _StreamEnd] = {}
+        summaries = []
+        
+        while len(summaries) < len(pairs):
+            key, item = await write_queue.get()
+            keyword, platform = key
+            
+            if isinstance(item, _StreamEnd):
+                ends[key] = item
+            else:
+                updated_files['platform_files'][platform] = self.report_generator.append_mentions(
+                    keyword, platform, item
+                )
+                collected[key].extend(item)
+                received[key] += 1
+            
+            if key in ends and received[key] == ends[key].pages:
+                summaries.append(asyncio.create_task(
+                    self._summarize(key, collected.pop(key), ends[key].note)
+                ))
+        
+        for summary_file in await asyncio.gather(*summaries):
+            updated_files['summary_file'] = summary_file
+    
+    async def run(self, keywords: List[str]) -> Dict:
+        """
+        Stream every (keyword, platform) pair through the pipeline.
+        Returns the updated files in the same form as ReportGenerator.generate_reports.
+        """
+        keywords = list(dict.fromkeys(keywords))  # Drop repeats, keep order
+        platforms = self.scheduler.platforms
+        pairs = [(keyword, platform) for keyword in keywords for platform in platforms]
+        
+        analyze_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        write_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        updated_files = {'platform_files': {}, 'summary_file': None}
+        
+        workers = [
+            asyncio.create_task(self._analyze(analyze_queue, write_queue))
+            for _ in range(self.sentiment_workers)
+        ]
+        fetchers = [
+            asyncio.create_task(self._fetch(keyword, platform, analyze_queue, write_queue))
+            for keyword, platform in pairs
+        ]
+        try:
+            await self._write([(keyword, platform.name) for keyword, platform in pairs], write_queue, updated_files)
+            await asyncio.gather(*fetchers)
+        finally:
+            for task in workers + fetchers:
+                task.cancel()
+            await asyncio.gather(*workers, *fetchers, return_exceptions=True)
+        
+        return updated_files
\ No newline at end of file
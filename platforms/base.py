@@ -1,8 +1,139 @@
+import asyncio
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple, AsyncIterator, Awaitable, Callable
 from models import Mention
+from utils.http import HttpClient
+
+class IncompleteFetch(Exception):
+    """
+    Raised by a platform after the pages it could fetch when a later page or
+    one of several sources failed. Those pages are valid, but results between
+    them and the cursor were not fetched, so the cursor must not move past them.
+    fetch_mentions sets `mentions` to everything fetched before it was raised.
+    """
+
+    def __init__(self, platform: str, reason: str):
+        super().__init__(f"{platform}: {reason}")
+        self.mentions: List[Mention] = []
+
 
 class Platform(ABC):
+    # Shared HTTP client owned by the run. Platforms constructed without one
+    # fall back to a short-lived client per fetch.
+    http: Optional[HttpClient] = None
+
+    @property
+    def name(self) -> str:
+        """Platform name used for reports, rate limits and cursors."""
+        return self.__class__.__name__
+
+    @asynccontextmanager
+    async def _http_client(self) -> AsyncIterator[HttpClient]:
+        """Yield the shared HTTP client, or a temporary one if none was given."""
+        if self.http is not None:
+            yield self.http
+        else:
+            async with HttpClient() as http:
+                yield http
+
     @abstractmethod
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
-        pass
\ No newline at end of file
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        """
+        Fetch mentions of keyword. When since is given, platforms whose API
+        supports it only request mentions newer than that date.
+        """
+        pass
+
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
+        """
+        Yield mentions page by page as they arrive, for the streaming pipeline.
+        Platforms with paginated APIs override this; by default the whole
+        fetch_mentions result is yielded as a single page.
+        """
+        yield await self.fetch_mentions(keyword, since=since)
+
+    async def _collect(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        """fetch_mentions for paginated platforms: every page of stream_mentions in order."""
+        mentions = []
+        try:
+            async for page_mentions in self.stream_mentions(keyword, since=since):
+                mentions.extend(page_mentions)
+        except IncompleteFetch as e:
+            e.mentions = mentions
+            raise
+        return mentions
+
+    async def close(self) -> None:
+        """Release resources held across fetches. Most platforms use the shared HTTP client and hold none."""
+        pass
+
+    async def _paginate(self, fetch_page: Callable[[int], Awaitable[Tuple[List[Mention], Optional[int]]]],
+                        max_results: int, page_size: int, concurrency: int,
+                        since: Optional[datetime] = None, incremental: bool = False) -> AsyncIterator[List[Mention]]:
+        """
+        Yield result pages in order until max_results mentions, fetching several at once.
+
+        fetch_page(page) returns the page's mentions and the number of pages the
+        API has available, or None if it does not say. The first page is fetched
+        on its own, since it is often the only one and usually tells how many
+        exist; after that up to `concurrency` pages are in flight. Paging stops at
+        the last available page or an empty page. Pass `since` only when results
+        come newest first: paging then also stops at the first mention at or
+        before it.
+
+        A failing first page raises its error. A failing later page raises
+        IncompleteFetch after the pages before it were yielded. Hitting
+        max_results while an incremental fetch (`since` given, or `incremental`
+        for APIs that filter by the cursor in another order) may still have
+        results only prints the gap: the cursor still moves to the newest
+        result, so a busy keyword makes progress on every poll.
+        """
+        incremental = incremental or since is not None
+        max_pages = -(-max_results // page_size)  # Ceiling division
+        remaining = max_results
+        available_pages: Optional[int] = None
+        pending: Dict[int, asyncio.Task] = {}
+        page = next_page = 0
+        try:
+            while True:
+                window = 1 if page == 0 else concurrency
+                while next_page < max_pages and len(pending) < window:
+                    pending[next_page] = asyncio.create_task(fetch_page(next_page))
+                    next_page += 1
+
+                try:
+                    mentions, available = await pending.pop(page)
+                except Exception as e:
+                    if page == 0:
+                        raise
+                    raise IncompleteFetch(self.name, f"page {page + 1} failed: {str(e)}") from e
+
+                if available is not None:
+                    available_pages = available
+                    max_pages = min(max_pages, available)
+                    # Drop speculative requests for pages that do not exist
+                    for extra in [p for p in pending if p >= max_pages]:
+                        pending.pop(extra).cancel()
+                    next_page = min(next_page, max_pages)
+
+                reached_cursor = since is not None and any(m.date is not None and m.date <= since for m in mentions)
+                kept = mentions[:remaining]
+                remaining -= len(kept)
+                if kept:
+                    yield kept
+                if not mentions or reached_cursor:
+                    return
+                if remaining <= 0 or page + 1 >= max_pages:
+                    exhausted = len(kept) == len(mentions) and available_pages is not None and page + 1 >= available_pages
+                    if incremental and not exhausted:
+                        print(f"{self.name}: stopped at {max_results} results before reaching the cursor, "
+                              f"skipping older results")
+                    return
+                page += 1
+        finally:
+            for task in pending.values():
+                if task.done() and not task.cancelled():
+                    task.exception()  # Retrieved so asyncio does not log it as unhandled
+                task.cancel()
\ No newline at end of file
@@ -1,58 +1,85 @@
 from datetime import datetime
-import aiohttp
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple, AsyncIterator
 from .base import Platform
 from models import Mention
 from config import Config
+from utils.http import HttpClient
+from utils.resilience import APIError
 
 
 class CurrentNews(Platform):
-    def __init__(self, config: Config):
+    PAGE_SIZE = 100
+    
+    def __init__(self, config: Config, max_results: int = 100, http: Optional[HttpClient] = None):
         self.config = config
+        self.http = http
         self.base_url = "https://api.currentsapi.services/v1/search"
+        self.max_results = max_results
         
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
-        """Fetch news articles from CurrentNews API"""
+    async def _fetch_page(self, http: HttpClient, keyword: str, page: int,
+                          since: Optional[datetime]) -> Tuple[List[Mention], Optional[int]]:
+        """Fetch one page of news articles and, once the results run out, the number of pages."""
+        page_size = min(self.max_results, self.PAGE_SIZE)
         params = {
             'keywords': keyword,
             'language': self.config.CURRENT_NEWS_LANGUAGE,
-            'apiKey': self.config.CURRENT_NEWS_API_KEY
+            'apiKey': self.config.CURRENT_NEWS_API_KEY,
+            'page_number': page + 1,  # 1-based
+            'page_size': page_size
         }
+        if since:
+            # Published dates are UTC with the offset stripped
+            params['start_date'] = since.strftime("%Y-%m-%dT%H:%M:%S+00:00")
         
-        async with aiohttp.ClientSession() as session:
-            async with session.get(self.base_url, params=params) as response:
-                data = await response.json()
-                
-                if data['status'] != 'ok':
-                    print(f"CurrentNews API error: {data.get('message', 'Unknown error')}")
-                    return []
+        data = await http.get_json(self.base_url, params=params, rate_key=self.name)
+        
+        if data.get('status') != 'ok':
+            raise APIError(self.name, data.get('message', 'Unknown error'))
+        
+        articles = data.get('news', [])
+        mentions = []
+        for article in articles:
+            try:
+                # Parse the published date
+                published_date = datetime.strptime(
+                    article['published'].split(' +')[0],  # Remove timezone part
+                    "%Y-%m-%d %H:%M:%S"
+                )
                 
-                mentions = []
-                for article in data.get('news', []):
-                    try:
-                        # Parse the published date
-                        published_date = datetime.strptime(
-                            article['published'].split(' +')[0],  # Remove timezone part
-                            "%Y-%m-%d %H:%M:%S"
-                        )
-                        
-                        mention = Mention(
-                            platform="CurrentNews",
-                            title=article['title'],
-                            url=article['url'],
-                            description=article['description'],
-                            date=published_date,
-                            # additional_fields={
-                            #     'author': article.get('author', 'Unknown'),
-                            #     'categories': ', '.join(article.get('category', [])),
-                            #     'language': article.get('language', 'en'),
-                            #     'image_url': article.get('image', None)
-                            # }
-                        )
-                        mentions.append(mention)
-                        
-                    except (KeyError, ValueError) as e:
-                        print(f"Error processing article: {str(e)}")
-                        continue
+                mention = Mention(
+                    platform="CurrentNews",
+                    title=article['title'],
+                    url=article['url'],
+                    description=article['description'],
+                    date=published_date,
+                    # additional_fields={
+                    #     'author': article.get('author', 'Unknown'),
+                    #     'categories': ', '.join(article.get('category', [])),
+                    #     'language': article.get('language', 'en'),
+                    #     'image_url': article.get('image', None)
+                    # }
+                )
+                mentions.append(mention)
                 
-                return mentions
\ No newline at end of file
+            except (KeyError, ValueError) as e:
+                print(f"Error processing article: {str(e)}")
+                continue
+        
+        # No page count in the response; a short page is the last one
+        return mentions, page + 1 if len(articles) < page_size else None
+    
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
+        """Fetch news articles from CurrentNews API"""
+        async with self._http_client() as http:
+            async for mentions in self._paginate(
+                lambda page: self._fetch_page(http, keyword, page, since),
+                max_results=self.max_results,
+                page_size=min(self.max_results, self.PAGE_SIZE),
+                concurrency=self.config.PAGE_CONCURRENCY,
+                incremental=since is not None  # Filtered by start_date, not sorted by it
+            ):
+                yield mentions
+    
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        """Fetch news articles from CurrentNews API"""
+        return await self._collect(keyword, since=since)
\ No newline at end of file
@@ -1,43 +1,74 @@
+import asyncio
 from datetime import datetime
-import aiohttp
 from .base import Platform
 from models import Mention
 from config import Config
-from typing import List
+from typing import List, Dict, Optional, Tuple, AsyncIterator
+from utils.http import HttpClient
 
 
 class GitHub(Platform):
-    def __init__(self, config: Config):
+    PAGE_SIZE = 100  # API maximum
+    SEARCH_LIMIT = 1000  # The search API returns at most this many results per query
+    
+    def __init__(self, config: Config, max_results: int = 100, http: Optional[HttpClient] = None):
         self.config = config
+        self.http = http
         self.base_url = "https://api.github.com"
+        self.max_results = max_results
         
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
         headers = {
             "Authorization": f"token {self.config.GITHUB_TOKEN}",
             "Accept": "application/vnd.github.v3+json"
         }
         
-        async with aiohttp.ClientSession(headers=headers) as session:
-            # Search repositories and issues
-            queries = [
-                f"{self.base_url}/search/repositories?q={keyword}&sort=updated&order=desc",
-                f"{self.base_url}/search/issues?q={keyword}&sort=updated&order=desc"
-            ]
+        search = keyword
+        if since:
+            # GitHub dates are UTC; only items created after the cursor
+            search += f" created:>{since.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+        
+        # Search repositories and issues, each page of results split between them
+        queries = [
+            f"{self.base_url}/search/repositories",
+            f"{self.base_url}/search/issues"
+        ]
+        per_page = min(-(-self.max_results // len(queries)), self.PAGE_SIZE)
+        pages_available: Dict[str, int] = {}
+        
+        async with self._http_client() as http:
+            async def fetch_query(query: str, page: int) -> List[Mention]:
+                params = {'q': search, 'sort': 'updated', 'order': 'desc', 'per_page': per_page, 'page': page + 1}
+                data = await http.get_json(query, params=params, headers=headers, rate_key=self.name)
+                total = min(data.get('total_count', 0), self.SEARCH_LIMIT)
+                pages_available[query] = -(-total // per_page)
+                
+                return [
+                    Mention(
+                        platform="GitHub",
+                        title=item.get('title', item.get('name', '')),
+                        url=item.get('html_url', ''),
+                        description=item.get('description', ''),
+                        date=datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%SZ")
+                    )
+                    for item in data.get('items', [])
+                ]
             
-            mentions = []
-            for query in queries:
-                async with session.get(query) as response:
-                    data = await response.json()
-                    items = data.get('items', [])[:5]  # Get top 5 from each type
-                    
-                    for item in items:
-                        mention = Mention(
-                            platform="GitHub",
-                            title=item.get('title', item.get('name', '')),
-                            url=item.get('html_url', ''),
-                            description=item.get('description', ''),
-                            date=datetime.strptime(item['created_at'], "%Y-%m-%dT%H:%M:%SZ")
-                        )
-                        mentions.append(mention)
+            async def fetch_page(page: int) -> Tuple[List[Mention], Optional[int]]:
+                # Skip a query once its own results have run out
+                active = [query for query in queries if page < pages_available.get(query, page + 1)]
+                results = await asyncio.gather(*[fetch_query(query, page) for query in active])
+                mentions = [mention for result in results for mention in result]
+                return mentions, max(pages_available.values(), default=0)
             
-            return mentions
\ No newline at end of file
+            async for mentions in self._paginate(
+                fetch_page,
+                max_results=self.max_results,
+                page_size=per_page * len(queries),
+                concurrency=self.config.PAGE_CONCURRENCY,
+                incremental=since is not None  # Filtered by the cursor, but sorted by update time
+            ):
+                yield mentions
+    
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        return await self._collect(keyword, since=since)
\ No newline at end of file
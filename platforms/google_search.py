@@ -1,55 +1,86 @@
-from googleapiclient.discovery import build
+import asyncio
 from datetime import datetime
-from .base import Platform
+from .base import IncompleteFetch, Platform
 from models import Mention
 from config import Config
-from typing import List
-from time import sleep
+from typing import List, Optional, AsyncIterator
+from utils.http import HttpClient
+from utils.resilience import APIError
 
 
 class GoogleSearch(Platform):
-    def __init__(self, config: Config, max_results: int = 10):
+    def __init__(self, config: Config, max_results: int = 10, http: Optional[HttpClient] = None):
         self.config = config
+        self.http = http
+        self.base_url = "https://www.googleapis.com/customsearch/v1"
         # Ensure max_results is a multiple of 10 (Google's page size)
         self.max_results = min(((max_results + 9) // 10) * 10, 100)
         
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
-        service = build("customsearch", "v1", developerKey=self.config.GOOGLE_API_KEY)
+    async def _fetch_page(self, http: HttpClient, keyword: str, page: int,
+                          semaphore: asyncio.Semaphore) -> List[Mention]:
+        """Fetch a single page of results; pacing and quota come from the shared rate limiter."""
+        async with semaphore:
+            # Calculate start index (1-based)
+            start_index = (page * 10) + 1
+            
+            res = await http.get_json(self.base_url, params={
+                'key': self.config.GOOGLE_API_KEY,
+                'q': keyword,
+                'cx': self.config.SEARCH_ENGINE_ID,
+                'num': 10,
+                'start': start_index
+            }, rate_key=self.name)
+        
+        # Errors propagate so the circuit breaker sees them
+        if 'error' in res:
+            raise APIError(self.name, f"page {page + 1}: {res['error'].get('message', 'Unknown error')}")
+        
         mentions = []
+        for item in res.get('items', []):
+            mention = Mention(
+                platform="Google Search",
+                title=item['title'],
+                url=item['link'],
+                description=item.get('snippet', ''),
+                date=None  # Google Search API doesn't provide dates
+            )
+            mentions.append(mention)
+        return mentions
         
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
+        """
+        Fetch all pages concurrently and yield each one in ranking order as soon as it is ready.
+        A failed page is skipped and reported with IncompleteFetch after the others, so
+        pages that arrived are not lost; if every page failed, the first error is raised.
+        """
         # Calculate number of pages needed
         pages = self.max_results // 10
+        semaphore = asyncio.Semaphore(self.config.GOOGLE_PAGE_CONCURRENCY)
         
-        for page in range(pages):
+        async with self._http_client() as http:
+            tasks = [
+                asyncio.create_task(self._fetch_page(http, keyword, page, semaphore))
+                for page in range(pages)
+            ]
+            errors = []
             try:
-                # Calculate start index (1-based)
-                start_index = (page * 10) + 1
-                
-                res = service.cse().list(
-                    q=keyword,
-                    cx=self.config.SEARCH_ENGINE_ID,
-                    num=10,
-                    start=start_index
-                ).execute()
-                
-                items = res.get('items', [])
-                
-                for item in items:
-                    mention = Mention(
-                        platform="Google Search",
-                        title=item['title'],
-                        url=item['link'],
-                        description=item.get('snippet', ''),
-                        date=None  # Google Search API doesn't provide dates
-                    )
-                    mentions.append(mention)
-                
-                # Add delay to respect rate limits
-                if page < pages - 1:  # Don't sleep after the last page
-                    sleep(1)
-                    
-            except Exception as e:
-                print(f"Error fetching page {page + 1}: {str(e)}")
-                break
+                for page, task in enumerate(tasks):
+                    try:
+                        mentions = await task
+                    except Exception as e:
+                        errors.append((page, e))
+                        continue
+                    yield mentions
+            finally:
+                # The consumer may stop early; don't leave requests running
+                for task in tasks:
+                    task.cancel()
+            
+            if errors and len(errors) == len(tasks):
+                raise errors[0][1]
+            if errors:
+                raise IncompleteFetch(self.name, "; ".join(f"page {page + 1} failed: {str(e)}" for page, e in errors))
         
-        return mentions
\ No newline at end of file
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        # Keep Google's ranking order across pages
+        return await self._collect(keyword, since=since)
\ No newline at end of file
@@ -1,34 +1,60 @@
-import aiohttp
 from datetime import datetime
 from .base import Platform
 from models import Mention
 from config import Config
-from typing import List
+from typing import List, Optional, Tuple, AsyncIterator
+from utils.http import HttpClient
 
 
 class HackerNews(Platform):
-    def __init__(self, config: Config):
+    PAGE_SIZE = 100
+    
+    def __init__(self, config: Config, max_results: int = 100, http: Optional[HttpClient] = None):
         self.config = config
+        self.http = http
         self.base_url = "http://hn.algolia.com/api/v1"
+        self.max_results = max_results
         
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
-        async with aiohttp.ClientSession() as session:
-            # Search stories and comments
-            async with session.get(
-                f"{self.base_url}/search?query={keyword}&tags=(story,comment)"
-            ) as response:
-                data = await response.json()
-                hits = data.get('hits', [])[:10]
-                
-                mentions = []
-                for hit in hits:
-                    mention = Mention(
-                        platform="Hacker News",
-                        title=hit.get('title', ''),
-                        url=hit.get('url', f"https://news.ycombinator.com/item?id={hit['objectID']}"),
-                        description=hit.get('comment_text', hit.get('story_text', '')),
-                        date=datetime.fromtimestamp(hit['created_at_i'])
-                    )
-                    mentions.append(mention)
-                
-                return mentions
\ No newline at end of file
+    async def _fetch_page(self, http: HttpClient, keyword: str, page: int,
+                          since: Optional[datetime]) -> Tuple[List[Mention], Optional[int]]:
+        """Fetch one page of stories and comments and the number of pages available."""
+        params = {
+            'query': keyword,
+            'tags': '(story,comment)',
+            'hitsPerPage': min(self.max_results, self.PAGE_SIZE),
+            'page': page
+        }
+        endpoint = "search"
+        if since:
+            # Newest first, only items created after the cursor
+            endpoint = "search_by_date"
+            params['numericFilters'] = f"created_at_i>{int(since.timestamp())}"
+        
+        data = await http.get_json(f"{self.base_url}/{endpoint}", params=params, rate_key=self.name)
+        
+        mentions = []
+        for hit in data.get('hits', []):
+            mention = Mention(
+                platform="Hacker News",
+                title=hit.get('title', ''),
+                url=hit.get('url', f"https://news.ycombinator.com/item?id={hit['objectID']}"),
+                description=hit.get('comment_text', hit.get('story_text', '')),
+                date=datetime.fromtimestamp(hit['created_at_i'])
+            )
+            mentions.append(mention)
+        
+        return mentions, data.get('nbPages')
+    
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
+        async with self._http_client() as http:
+            async for mentions in self._paginate(
+                lambda page: self._fetch_page(http, keyword, page, since),
+                max_results=self.max_results,
+                page_size=min(self.max_results, self.PAGE_SIZE),
+                concurrency=self.config.PAGE_CONCURRENCY,
+                since=since
+            ):
+                yield mentions
+    
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        return await self._collect(keyword, since=since)
\ No newline at end of file
@@ -1,32 +1,149 @@
-from mastodon import Mastodon
+import asyncio
+import re
 from datetime import datetime
-from .base import Platform
+from .base import IncompleteFetch, Platform
 from models import Mention
 from config import Config
-from typing import List
+from typing import List, Dict, Optional, AsyncIterator
+from utils.http import HttpClient
 
 
 class MastodonPlatform(Platform):
-    def __init__(self, config: Config):
-        self.mastodon = Mastodon(
-            access_token=config.MASTODON_ACCESS_TOKEN,
-            api_base_url=f"https://{config.MASTODON_INSTANCE}"
+    """
+    Searches several Mastodon instances at once over the shared HTTP client.
+    
+    Every instance in MASTODON_INSTANCES contributes its hashtag timeline for
+    the keyword. The home instance (MASTODON_INSTANCE) also runs a full-text
+    status search when MASTODON_ACCESS_TOKEN is set, since instances only
+    search statuses for signed-in users. Each source pages newest first with
+    max_id, bounded below by the cursor, and pages are yielded as soon as any
+    source returns them. The same status seen on several instances is kept once.
+    """
+    PAGE_SIZE = 40  # API maximum for search and timelines
+    
+    def __init__(self, config: Config, max_results: int = 100, http: Optional[HttpClient] = None):
+        self.config = config
+        self.http = http
+        self.max_results = max_results
+        self.instances = config.MASTODON_INSTANCES
+        self.home_instance = config.MASTODON_INSTANCE
+        self.access_token = config.MASTODON_ACCESS_TOKEN
+    
+    def _headers(self, instance: str) -> Dict[str, str]:
+        """The access token is only valid on the home instance."""
+        if instance == self.home_instance and self.access_token:
+            return {"Authorization": f"Bearer {self.access_token}"}
+        return {}
+    
+    @staticmethod
+    def _status_id(date: datetime) -> str:
+        """Smallest status id at a given time; Mastodon ids are milliseconds shifted left 16 bits."""
+        return str(int(date.timestamp() * 1000) << 16)
+    
+    def _to_mention(self, instance: str, status: Dict) -> Mention:
+        return Mention(
+            platform="Mastodon",
+            title=f"Toot by @{status['account']['username']}",
+            url=status.get('url') or status['uri'],
+            description=status['content'][:500],
+            # Local naive time, like the other platforms, so cursors compare
+            date=datetime.fromisoformat(status['created_at']).astimezone().replace(tzinfo=None),
+            additional_fields={
+                'instance': instance,
+                'account': status['account']['acct'],
+                'replies': status.get('replies_count', 0),
+                'reblogs': status.get('reblogs_count', 0),
+                'favourites': status.get('favourites_count', 0)
+            }
         )
+    
+    async def _walk(self, http: HttpClient, instance: str, path: str, params: Dict,
+                    bound: str, since: Optional[datetime]) -> AsyncIterator[List[Mention]]:
+        """
+        Page one endpoint newest first with max_id. `bound` names the parameter that
+        keeps results newer than the cursor: min_id for search, since_id for timelines.
+        """
+        params = dict(params, limit=self.PAGE_SIZE)
+        if since:
+            params[bound] = self._status_id(since)
         
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
-        # Search public toots
-        results = self.mastodon.search(keyword, resolve=True)
-        statuses = results.get('statuses', [])
-        
-        mentions = []
-        for status in statuses[:10]:  # Get top 10 results
-            mention = Mention(
-                platform="Mastodon",
-                title=f"Toot by @{status['account']['username']}",
-                url=status['url'],
-                description=status['content'][:500],
-                date=datetime.strptime(status['created_at'], "%Y-%m-%dT%H:%M:%S.%fZ")
-            )
-            mentions.append(mention)
+        fetched = 0
+        while fetched < self.max_results:
+            data = await http.get_json(f"https://{instance}{path}", params=params,
+                                       headers=self._headers(instance), rate_key=f"{self.name}@{instance}")
+            statuses = data.get('statuses', []) if isinstance(data, dict) else data
+            if not statuses:
+                return
+            
+            yield [self._to_mention(instance, status) for status in statuses]
+            fetched += len(statuses)
+            if len(statuses) < self.PAGE_SIZE:
+                return
+            params['max_id'] = min((status['id'] for status in statuses), key=int)
+    
+    def _sources(self, http: HttpClient, keyword: str, since: Optional[datetime]) -> List[AsyncIterator[List[Mention]]]:
+        """One paged source per endpoint: hashtag timelines everywhere, search at home if signed in."""
+        sources = []
+        hashtag = re.sub(r'\W+', '', keyword)
+        if hashtag:
+            for instance in self.instances:
+                sources.append(self._walk(http, instance, f"/api/v1/timelines/tag/{hashtag}",
+                                          {}, 'since_id', since))
+        if self._headers(self.home_instance):
+            # resolve=false: only statuses the instance already knows, no federated lookups
+            sources.append(self._walk(http, self.home_instance, "/api/v2/search",
+                                      {'q': keyword, 'type': 'statuses', 'resolve': 'false'}, 'min_id', since))
+        return sources
+    
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
+        async with self._http_client() as http:
+            sources = self._sources(http, keyword, since)
+            queue: asyncio.Queue = asyncio.Queue()
+            errors: List[Exception] = []
+            
+            async def drain(source: AsyncIterator[List[Mention]]) -> None:
+                try:
+                    async for page in source:
+                        await queue.put(page)
+                except Exception as e:
+                    errors.append(e)
+                finally:
+                    await queue.put(None)  # This source is done
+            
+            tasks = [asyncio.create_task(drain(source)) for source in sources]
+            finished = 0
+            seen = set()
+            remaining = self.max_results
+            try:
+                while finished < len(tasks) and remaining > 0:
+                    page = await queue.get()
+                    if page is None:
+                        finished += 1
+                        continue
+                    
+                    mentions = []
+                    for mention in page:
+                        if mention.url not in seen:
+                            seen.add(mention.url)
+                            mentions.append(mention)
+                    mentions = mentions[:remaining]
+                    remaining -= len(mentions)
+                    if mentions:
+                        yield mentions
+            finally:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
             
-        return mentions
\ No newline at end of file
+            if errors and len(errors) == len(tasks):
+                raise errors[0]
+            if errors:
+                # The other sources' results are valid, but this one's are missing
+                raise IncompleteFetch(self.name, "; ".join(f"a source failed: {str(e)}" for e in errors))
+            if since is not None and remaining <= 0 and finished < len(tasks):
+                # Like _paginate: the cursor still moves, so the next poll makes progress
+                print(f"{self.name}: stopped at {self.max_results} results before reaching the cursor, "
+                      f"skipping older results")
+    
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        return await self._collect(keyword, since=since)
\ No newline at end of file
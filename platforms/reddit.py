@@ -1,32 +1,173 @@
+import asyncio
 import asyncpraw
 from datetime import datetime
-from .base import Platform
+from .base import IncompleteFetch, Platform
 from models import Mention
 from config import Config
-from typing import List
+from typing import List, Optional, AsyncIterator
+from utils.http import HttpClient
 
 
 class Reddit(Platform):
-    def __init__(self, config: Config):
+    """
+    Searches the subreddits in REDDIT_SUBREDDITS concurrently with one long-lived
+    asyncpraw client, created on first use and released by close().
+    
+    Searches run at most REDDIT_SEARCH_CONCURRENCY at a time and, when the run
+    has a rate limiter, each request also waits for the 'Reddit' token bucket.
+    With a cursor, results are sorted by new and stop at the first submission
+    whose created_utc is not newer, so repeat polls return only new posts. With
+    REDDIT_SEARCH_COMMENTS, the comments of the submissions found are scanned
+    for the keyword and streamed one submission at a time. When some searches
+    fail, the others' results are yielded and IncompleteFetch is raised.
+    """
+    
+    def __init__(self, config: Config, max_results: int = 100, http: Optional[HttpClient] = None):
         self.config = config
-        self.reddit = asyncpraw.Reddit(
-            client_id=config.REDDIT_CLIENT_ID,
-            client_secret=config.REDDIT_CLIENT_SECRET,
-            user_agent=config.REDDIT_USER_AGENT
+        self.http = http  # Only its rate limiter is used; asyncpraw has its own session
+        self.subreddits = config.REDDIT_SUBREDDITS
+        self.max_results = min(max_results, 100)  # One listing request per subreddit
+        self.reddit: Optional[asyncpraw.Reddit] = None
+        self._client_lock = asyncio.Lock()
+        self._limit = asyncio.Semaphore(config.REDDIT_SEARCH_CONCURRENCY)
+    
+    async def _client(self) -> asyncpraw.Reddit:
+        """Create the client inside the running loop, once."""
+        async with self._client_lock:
+            if self.reddit is None:
+                self.reddit = asyncpraw.Reddit(
+                    client_id=self.config.REDDIT_CLIENT_ID,
+                    client_secret=self.config.REDDIT_CLIENT_SECRET,
+                    user_agent=self.config.REDDIT_USER_AGENT
+                )
+            return self.reddit
+    
+    async def _throttle(self) -> None:
+        """Wait for the shared Reddit token bucket, if the run has one."""
+        if self.http is not None and self.http.limiter is not None:
+            await self.http.limiter.acquire(self.name)
+    
+    async def _search_subreddit(self, reddit: asyncpraw.Reddit, name: str, keyword: str,
+                                since: Optional[datetime]) -> List:
+        """Search one subreddit, newest first when a cursor is given."""
+        submissions = []
+        async with self._limit:
+            await self._throttle()
+            subreddit = await reddit.subreddit(name)
+            sort = "new" if since else "relevance"
+            async for submission in subreddit.search(keyword, sort=sort, limit=self.max_results):
+                if since and submission.created_utc <= since.timestamp():
+                    break
+                submissions.append(submission)
+            else:
+                if since and len(submissions) >= self.max_results:
+                    # Like _paginate: the cursor still moves, so the next poll makes progress
+                    print(f"{self.name}: stopped at {self.max_results} results in r/{name} before reaching "
+                          f"the cursor, skipping older results")
+        return submissions
+    
+    def _submission_mention(self, submission) -> Mention:
+        return Mention(
+            platform="Reddit",
+            title=submission.title,
+            url=f"https://reddit.com{submission.permalink}",
+            description=submission.selftext[:500] if submission.selftext else "No description available",
+            date=datetime.fromtimestamp(submission.created_utc),
+            additional_fields={
+                'subreddit': submission.subreddit.display_name,
+                'score': submission.score,
+                'comments': submission.num_comments
+            }
         )
-        
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
+    
+    async def _search_comments(self, submission, keyword: str, since: Optional[datetime]) -> List[Mention]:
+        """Load one submission's comments and keep those that mention the keyword."""
         mentions = []
+        async with self._limit:
+            await self._throttle()
+            await submission.load()
+            await submission.comments.replace_more(limit=0)  # Skip "load more comments" requests
         
-        # Search submissions
-        async for submission in self.reddit.subreddit("all").search(keyword, limit=10):
+        for comment in submission.comments.list():
+            if keyword.lower() not in comment.body.lower():
+                continue
+            if since and comment.created_utc <= since.timestamp():
+                continue
             mention = Mention(
                 platform="Reddit",
-                title=submission.title,
-                url=f"https://reddit.com{submission.permalink}",
-                description=submission.selftext[:500] if submission.selftext else "No description available",
-                date=datetime.fromtimestamp(submission.created_utc)
+                title=f"Comment on: {submission.title}",
+                url=f"https://reddit.com{comment.permalink}",
+                description=comment.body[:500],
+                date=datetime.fromtimestamp(comment.created_utc),
+                additional_fields={
+                    'subreddit': submission.subreddit.display_name,
+                    'score': comment.score
+                }
             )
             mentions.append(mention)
+        return mentions
+    
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
+        reddit = await self._client()
+        searches = [
+            asyncio.create_task(self._search_subreddit(reddit, name, keyword, since))
+            for name in self.subreddits
+        ]
+        comment_searches = []
+        seen = set()
+        found = []
+        errors = []
+        comment_errors = []
+        try:
+            # Yield each subreddit's results as soon as its search finishes
+            for search in asyncio.as_completed(searches):
+                try:
+                    submissions = await search
+                except Exception as e:
+                    errors.append(e)
+                    continue
+                
+                submissions = [s for s in submissions if s.id not in seen]
+                seen.update(s.id for s in submissions)
+                found.extend(submissions)
+                if submissions:
+                    yield [self._submission_mention(s) for s in submissions]
+            
+            if errors and len(errors) == len(searches):
+                raise errors[0]
             
-        return mentions
\ No newline at end of file
+            # Most discussed first, so the comment budget goes where the comments are
+            found.sort(key=lambda s: s.num_comments, reverse=True)
+            comment_searches = [
+                asyncio.create_task(self._search_comments(submission, keyword, since))
+                for submission in found[:self.config.REDDIT_COMMENT_SUBMISSIONS]
+                if submission.num_comments
+            ] if self.config.REDDIT_SEARCH_COMMENTS else []
+            for search in asyncio.as_completed(comment_searches):
+                try:
+                    mentions = await search
+                except Exception as e:
+                    comment_errors.append(e)
+                    continue
+                if mentions:
+                    yield mentions
+        finally:
+            for task in searches + comment_searches:
+                task.cancel()
+            await asyncio.gather(*searches, *comment_searches, return_exceptions=True)
+        
+        if errors or comment_errors:
+            # The other searches' results are valid, but these ones' are missing
+            raise IncompleteFetch(self.name, "; ".join(
+                [f"a subreddit search failed: {str(e)}" for e in errors]
+                + [f"loading comments failed: {str(e)}" for e in comment_errors]
+            ))
+    
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        return await self._collect(keyword, since=since)
+    
+    async def close(self) -> None:
+        """Close the asyncpraw client and its HTTP session."""
+        if self.reddit is not None:
+            await self.reddit.close()
+            self.reddit = None
\ No newline at end of file
@@ -1,39 +1,67 @@
 from datetime import datetime
-import aiohttp
 from .base import Platform
 from models import Mention
 from config import Config
-from typing import List
+from typing import List, Optional, Tuple, AsyncIterator
+from utils.http import HttpClient
+from utils.resilience import APIError
 
 
 class StackExchange(Platform):
-    def __init__(self, config: Config):
+    PAGE_SIZE = 100  # API maximum
+    
+    def __init__(self, config: Config, max_results: int = 100, http: Optional[HttpClient] = None):
         self.config = config
+        self.http = http
         self.base_url = "https://api.stackexchange.com/2.3"
+        self.max_results = max_results
         
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
-        async with aiohttp.ClientSession() as session:
-            params = {
-                'site': 'stackoverflow',
-                'key': self.config.STACKEXCHANGE_KEY,
-                'intitle': keyword,
-                'pagesize': 10,
-                'order': 'desc',
-                'sort': 'activity'
-            }
-            
-            async with session.get(f"{self.base_url}/search", params=params) as response:
-                data = await response.json()
-                
-                mentions = []
-                for item in data['items']:
-                    mention = Mention(
-                        platform="Stack Exchange",
-                        title=item['title'],
-                        url=item['link'],
-                        description=item.get('excerpt', ''),
-                        date=datetime.fromtimestamp(item['creation_date'])
-                    )
-                    mentions.append(mention)
-                    
-                return mentions
\ No newline at end of file
+    async def _fetch_page(self, http: HttpClient, keyword: str, page: int,
+                          since: Optional[datetime]) -> Tuple[List[Mention], Optional[int]]:
+        """Fetch one page of questions and the number of pages available, if known."""
+        params = {
+            'site': 'stackoverflow',
+            'key': self.config.STACKEXCHANGE_KEY,
+            'intitle': keyword,
+            'pagesize': min(self.max_results, self.PAGE_SIZE),
+            'page': page + 1,  # 1-based
+            'order': 'desc',
+            'sort': 'activity'
+        }
+        if since:
+            # Only questions created after the cursor, newest first
+            params['fromdate'] = int(since.timestamp()) + 1
+            params['sort'] = 'creation'
+        
+        data = await http.get_json(f"{self.base_url}/search", params=params, rate_key=self.name)
+        
+        if 'error_id' in data:
+            raise APIError(self.name, data.get('error_message', 'Unknown error'))
+        
+        mentions = []
+        for item in data.get('items', []):
+            mention = Mention(
+                platform="Stack Exchange",
+                title=item['title'],
+                url=item['link'],
+                description=item.get('excerpt', ''),
+                date=datetime.fromtimestamp(item['creation_date'])
+            )
+            mentions.append(mention)
+        
+        # The API only says whether another page exists
+        return mentions, None if data.get('has_more') else page + 1
+    
+    async def stream_mentions(self, keyword: str, since: Optional[datetime] = None) -> AsyncIterator[List[Mention]]:
+        async with self._http_client() as http:
+            async for mentions in self._paginate(
+                lambda page: self._fetch_page(http, keyword, page, since),
+                max_results=self.max_results,
+                page_size=min(self.max_results, self.PAGE_SIZE),
+                concurrency=self.config.PAGE_CONCURRENCY,
+                since=since
+            ):
+                yield mentions
+    
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        return await self._collect(keyword, since=since)
\ No newline at end of file
@@ -1,97 +1,166 @@
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Dict, Optional
 import asyncio
+import os
 from telethon import TelegramClient
+from telethon.errors import FloodWaitError
 from telethon.tl.functions.messages import SearchRequest
 from telethon.tl.types import InputMessagesFilterEmpty
-from .base import Platform
+from .base import IncompleteFetch, Platform
 from models import Mention
 from config import Config
 
 class Telegram(Platform):
-    def __init__(self, config: Config):
+    """
+    Searches public channels with one long-lived client.
+    
+    The login is stored in a session file (TELEGRAM_SESSION_PATH), so only the
+    first run signs in. Telethon's session also keeps every resolved channel's
+    id and access hash, and resolved peers are kept in memory for the life of
+    the client, so repeat searches cost only the search calls themselves.
+    When some channels cannot be searched, the others' results are returned
+    in an IncompleteFetch. Call close() when done.
+    """
+    
+    def __init__(self, config: Config, max_results: int = 10):
         self.config = config
         # You'll need to get these from https://my.telegram.org/apps
-        self.api_id = "your_api_id"  
-        self.api_hash = "your_api_hash"
+        self.api_id = config.TELEGRAM_API_ID
+        self.api_hash = config.TELEGRAM_API_HASH
         self.channels = config.TELEGRAM_SEARCH_CHANNELS
-        
-    async def _init_client(self):
-        """Initialize Telegram client"""
-        client = TelegramClient('keyword_analyzer_bot', self.api_id, self.api_hash)
-        await client.start(bot_token=self.config.TELEGRAM_BOT_TOKEN)
-        return client
+        self.max_results = max_results
+        self._client: Optional[TelegramClient] = None
+        self._client_lock = asyncio.Lock()
+        self._peers: Dict[str, object] = {}
+    
+    async def _init_client(self) -> TelegramClient:
+        """Connect the shared client, signing in only if the stored session is not authorized yet"""
+        async with self._client_lock:
+            if self._client is not None and self._client.is_connected():
+                return self._client
+            
+            session_dir = os.path.dirname(self.config.TELEGRAM_SESSION_PATH)
+            if session_dir:
+                os.makedirs(session_dir, exist_ok=True)
+            
+            client = TelegramClient(
+                self.config.TELEGRAM_SESSION_PATH, self.api_id, self.api_hash,
+                flood_sleep_threshold=0  # FloodWait is handled per channel in _search_channel
+            )
+            await client.connect()
+            if not await client.is_user_authorized():
+                await client.start(bot_token=self.config.TELEGRAM_BOT_TOKEN)
+            self._client = client
+            return client
     
-    async def _search_channel(self, client, channel: str, keyword: str) -> List[Mention]:
+    async def _get_peer(self, client: TelegramClient, channel: str):
+        """Resolve a channel once; the session file serves it from disk on later runs"""
+        if channel not in self._peers:
+            self._peers[channel] = await client.get_input_entity(channel)
+        return self._peers[channel]
+    
+    async def _search_channel(self, client: TelegramClient, channel: str, keyword: str,
+                              since: Optional[datetime], semaphore: asyncio.Semaphore) -> List[Mention]:
         """Search for messages in a specific channel"""
         mentions = []
-        try:
-            # Join the channel if not already joined
-            channel_entity = await client.get_entity(channel)
-            
-            # Search for messages containing the keyword
-            messages = await client(SearchRequest(
-                peer=channel_entity,
-                q=keyword,
-                filter=InputMessagesFilterEmpty(),
-                min_date=None,
-                max_date=None,
-                offset_id=0,
-                add_offset=0,
-                limit=10,
-                max_id=0,
-                min_id=0,
-                hash=0
-            ))
+        for attempt in range(2):
+            try:
+                async with semaphore:
+                    peer = await self._get_peer(client, channel)
+                    
+                    # Search for messages containing the keyword
+                    messages = await client(SearchRequest(
+                        peer=peer,
+                        q=keyword,
+                        filter=InputMessagesFilterEmpty(),
+                        min_date=since.astimezone(timezone.utc) if since else None,
+                        max_date=None,
+                        offset_id=0,
+                        add_offset=0,
+                        limit=self.max_results,
+                        max_id=0,
+                        min_id=0,
+                        hash=0
+                    ))
+                break
             
-            for msg in messages.messages:
-                # Skip empty messages
-                if not msg.message:
+            except FloodWaitError as e:
+                # Wait outside the semaphore so other channels keep going
+                if attempt == 0 and e.seconds <= self.config.TELEGRAM_MAX_FLOOD_WAIT:
+                    print(f"Telegram asked to wait {e.seconds}s before searching {channel}")
+                    await asyncio.sleep(e.seconds)
                     continue
-                    
-                # Create mention object
-                mention = Mention(
-                    platform="Telegram",
-                    title=f"Message in @{channel}",
-                    url=f"https://t.me/{channel}/{msg.id}",
-                    description=msg.message[:500],  # Truncate long messages
-                    date=msg.date,
-                    additional_fields={
-                        'channel': channel,
-                        'views': getattr(msg, 'views', 0),
-                        'forwards': getattr(msg, 'forwards', 0),
-                        'replies': getattr(msg, 'replies', 0) if hasattr(msg, 'replies') else 0
-                    }
-                )
-                mentions.append(mention)
-                
-        except Exception as e:
-            print(f"Error searching channel {channel}: {str(e)}")
+                raise
+        
+        if since and len(messages.messages) >= self.max_results:
+            # Like _paginate: the cursor still moves, so the next poll makes progress
+            print(f"{self.name}: stopped at {self.max_results} results in @{channel} before reaching "
+                  f"the cursor, skipping older results")
+        
+        for msg in messages.messages:
+            # Skip empty messages
+            if not msg.message:
+                continue
             
+            # Create mention object
+            mention = Mention(
+                platform="Telegram",
+                title=f"Message in @{channel}",
+                url=f"https://t.me/{channel}/{msg.id}",
+                description=msg.message[:500],  # Truncate long messages
+                # Local naive time, like the other platforms, so cursors compare
+                date=msg.date.astimezone().replace(tzinfo=None),
+                additional_fields={
+                    'channel': channel,
+                    'views': msg.views or 0,
+                    'forwards': msg.forwards or 0,
+                    'replies': msg.replies.replies if msg.replies else 0
+                }
+            )
+            mentions.append(mention)
+        
         return mentions
     
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
         """Fetch mentions from multiple Telegram channels"""
         client = await self._init_client()
-        try:
-            all_mentions = []
-            
-            # Search each channel in parallel
-            search_tasks = [
-                self._search_channel(client, channel, keyword)
-                for channel in self.channels
-            ]
-            
-            # Gather results
-            channel_results = await asyncio.gather(*search_tasks)
-            for mentions in channel_results:
+        semaphore = asyncio.Semaphore(self.config.TELEGRAM_SEARCH_CONCURRENCY)
+        all_mentions = []
+        
+        # Search channels in parallel, a few at a time to stay clear of FloodWait
+        channel_results = await asyncio.gather(*[
+            self._search_channel(client, channel, keyword, since, semaphore)
+            for channel in self.channels
+        ], return_exceptions=True)
+        errors = []
+        for channel, mentions in zip(self.channels, channel_results):
+            if isinstance(mentions, Exception):
+                errors.append(f"channel {channel} failed: {str(mentions)}")
+            elif isinstance(mentions, BaseException):
+                raise mentions
+            else:
                 all_mentions.extend(mentions)
-            
-            # Sort by date
-            all_mentions.sort(key=lambda x: x.date, reverse=True)
-            
-            # Return top 10 most recent mentions
-            return all_mentions[:10]
-            
-        finally:
-            await client.disconnect()
\ No newline at end of file
+        if errors and len(errors) == len(self.channels):
+            raise next(result for result in channel_results if isinstance(result, Exception))
+        
+        # Sort by date
+        all_mentions.sort(key=lambda x: x.date, reverse=True)
+        
+        # Return the most recent mentions
+        if since and len(all_mentions) > self.max_results:
+            print(f"{self.name}: stopped at {self.max_results} results before reaching the cursor, "
+                  f"skipping older results")
+        all_mentions = all_mentions[:self.max_results]
+        
+        if errors:
+            # The other channels' results are valid, but these ones' are missing
+            incomplete = IncompleteFetch(self.name, "; ".join(errors))
+            incomplete.mentions = all_mentions
+            raise incomplete
+        return all_mentions
+    
+    async def close(self) -> None:
+        """Disconnect the shared client; the session file keeps the login and resolved peers"""
+        if self._client is not None:
+            await self._client.disconnect()
+            self._client = None
\ No newline at end of file
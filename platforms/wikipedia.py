@@ -1,14 +1,20 @@
-import aiohttp
+import asyncio
 from datetime import datetime
 from typing import List, Dict, Optional
 from .base import Platform
 from models import Mention
 from config import Config
+from utils.http import HttpClient
 
 
 class Wikipedia(Platform):
-    def __init__(self, config: Config):
+    # TextExtracts returns at most 20 intro extracts per query (titles allow 50)
+    DETAILS_BATCH_SIZE = 20
+
+    def __init__(self, config: Config, max_results: int = 10, http: Optional[HttpClient] = None):
         self.config = config
+        self.http = http
+        self.max_results = max_results
         self.base_url = f"https://{config.WIKIPEDIA_LANGUAGE}.wikipedia.org/w/api.php"
         self.headers = {}
         if config.WIKIPEDIA_ACCESS_TOKEN and config.WIKIPEDIA_CLIENT_SECRET:
@@ -17,67 +23,108 @@ class Wikipedia(Platform):
                 "Client-Secret": config.WIKIPEDIA_CLIENT_SECRET
             }
 
-    async def _search_articles(self, session: aiohttp.ClientSession, keyword: str) -> List[Dict]:
+    async def _search_articles(self, http: HttpClient, keyword: str) -> List[Dict]:
         """Search for Wikipedia articles using opensearch"""
         params = {
             "action": "opensearch",
             "namespace": "0",
             "search": keyword,
-            "limit": "10",
+            "limit": str(self.max_results),
             "format": "json"
         }
         
-        async with session.get(self.base_url, params=params) as response:
-            data = await response.json()
-            # OpenSearch returns [query, titles, descriptions, urls]
-            results = []
-            for title, desc, url in zip(data[1], data[2], data[3]):
-                results.append({
-                    "title": title,
-                    "description": desc,
-                    "url": url
-                })
-            return results
+        data = await http.get_json(self.base_url, params=params, headers=self.headers, rate_key=self.name)
+        # OpenSearch returns [query, titles, descriptions, urls]
+        results = []
+        for title, desc, url in zip(data[1], data[2], data[3]):
+            results.append({
+                "title": title,
+                "description": desc,
+                "url": url
+            })
+        return results
 
-    async def _get_article_details(self, session: aiohttp.ClientSession, title: str) -> Optional[Dict]:
-        """Get detailed information about an article"""
+    async def _query_batch(self, http: HttpClient, titles: List[str]) -> Dict[str, Dict]:
+        """
+        Get details for several articles in one query, following continuations.
+        Returns {title as requested: details}; missing articles are left out.
+        """
         params = {
             "action": "query",
             "prop": "extracts|revisions|categories|pageviews",
-            "titles": title,
-            "exintro": True,  # Only get introduction
-            "explaintext": True,  # Get plain text
+            "titles": "|".join(titles),
+            "exintro": 1,  # Only get introduction
+            "explaintext": 1,  # Get plain text
+            "exlimit": "max",
+            "cllimit": "max",
             "rvprop": "timestamp",
             "format": "json",
-            "redirects": True
+            "redirects": 1
         }
         
-        async with session.get(self.base_url, params=params) as response:
-            data = await response.json()
-            pages = data["query"]["pages"]
-            page = next(iter(pages.values()))
+        pages: Dict[str, Dict] = {}
+        aliases: Dict[str, str] = {}
+        continuation: Dict = {}
+        while True:
+            data = await http.get_json(self.base_url, params={**params, **continuation},
+                                       headers=self.headers, rate_key=self.name)
+            query = data.get("query", {})
             
-            if "missing" in page:
-                return None
-                
-            return {
+            # Titles are normalized (e.g. first letter capitalized) and then redirects resolved
+            for mapping in query.get("normalized", []) + query.get("redirects", []):
+                aliases[mapping["from"]] = mapping["to"]
+            
+            # Continued responses repeat pages with the next part of their props
+            for page in query.get("pages", {}).values():
+                merged = pages.setdefault(page["title"], {})
+                for key, value in page.items():
+                    if key == "categories":
+                        merged.setdefault("categories", []).extend(value)
+                    else:
+                        merged.setdefault(key, value)
+            
+            if "continue" not in data:
+                break
+            continuation = data["continue"]
+        
+        details = {}
+        for title in titles:
+            resolved = title
+            for _ in range(3):  # A normalized title can itself be a redirect
+                resolved = aliases.get(resolved, resolved)
+            page = pages.get(resolved)
+            if page is None or "missing" in page or "invalid" in page:
+                continue
+            
+            details[title] = {
                 "extract": page.get("extract", ""),
-                "last_modified": page["revisions"][0]["timestamp"] if "revisions" in page else None,
+                "last_modified": page["revisions"][0]["timestamp"] if page.get("revisions") else None,
                 "categories": [cat["title"] for cat in page.get("categories", [])],
-                "pageviews": sum(page.get("pageviews", {}).values()) if "pageviews" in page else 0
+                # Days without data come back as null
+                "pageviews": sum(views or 0 for views in (page.get("pageviews") or {}).values())
             }
+        return details
+
+    async def _get_article_details(self, http: HttpClient, titles: List[str]) -> Dict[str, Dict]:
+        """Get detailed information about many articles in a few concurrent batched queries"""
+        batches = [titles[i:i + self.DETAILS_BATCH_SIZE] for i in range(0, len(titles), self.DETAILS_BATCH_SIZE)]
+        details = {}
+        for batch_details in await asyncio.gather(*[self._query_batch(http, batch) for batch in batches]):
+            details.update(batch_details)
+        return details
 
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
         """Fetch mentions from Wikipedia"""
-        async with aiohttp.ClientSession(headers=self.headers) as session:
+        async with self._http_client() as http:
             mentions = []
             
             # First get search results
-            search_results = await self._search_articles(session, keyword)
+            search_results = await self._search_articles(http, keyword)
             
-            # Then get detailed information for each article
+            # Then get detailed information for all articles at once
+            all_details = await self._get_article_details(http, [result["title"] for result in search_results])
             for result in search_results:
-                details = await self._get_article_details(session, result["title"])
+                details = all_details.get(result["title"])
                 if not details:
                     continue
                 
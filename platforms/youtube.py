@@ -1,25 +1,36 @@
-from googleapiclient.discovery import build
 from datetime import datetime
 from .base import Platform
 from models import Mention
 from config import Config
-from typing import List
+from typing import List, Optional
+from utils.http import HttpClient
+from utils.resilience import APIError
 
 
 class YouTube(Platform):
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, http: Optional[HttpClient] = None):
         self.config = config
+        self.http = http
+        self.base_url = "https://www.googleapis.com/youtube/v3"
         
-    async def fetch_mentions(self, keyword: str) -> List[Mention]:
-        youtube = build('youtube', 'v3', developerKey=self.config.YOUTUBE_API_KEY)
+    async def fetch_mentions(self, keyword: str, since: Optional[datetime] = None) -> List[Mention]:
+        params = {
+            'key': self.config.YOUTUBE_API_KEY,
+            'part': "snippet",
+            'q': keyword,
+            'type': "video",
+            'maxResults': 10
+        }
+        if since:
+            # Only videos published after the cursor, newest first
+            params['publishedAfter'] = since.strftime('%Y-%m-%dT%H:%M:%SZ')
+            params['order'] = 'date'
         
-        request = youtube.search().list(
-            part="snippet",
-            q=keyword,
-            type="video",
-            maxResults=10
-        )
-        response = request.execute()
+        async with self._http_client() as http:
+            response = await http.get_json(f"{self.base_url}/search", params=params, rate_key=self.name)
+        
+        if 'error' in response:
+            raise APIError(self.name, response['error'].get('message', 'Unknown error'))
         
         mentions = []
         for item in response['items']:
@@ -0,0 +1,227 @@
+# report/csv_store.py
+import csv
+import io
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Optional, Union
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: writes are not locked against other processes
+    fcntl = None
+
+
+def get_schema_filepath(filepath: str) -> str:
+    """Get the filepath of the schema sidecar for a CSV file."""
+    return os.path.splitext(filepath)[0] + '.schema.json'
+
+
+@contextmanager
+def _locked(filepath: str) -> Iterator[None]:
+    """
+    Hold an exclusive advisory lock for a CSV file, so processes sharing an
+    output directory (e.g. the daemon and a CLI run) write it one at a time.
+    The lock is taken on a separate, never-removed .lock file, since the CSV
+    file and its sidecar are replaced by atomic renames.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(os.path.splitext(filepath)[0] + '.lock', 'a') as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)  # Released when the file is closed
+        yield
+
+
+def _write_atomic(filepath: str, payload: bytes) -> None:
+    """Write a file via a temporary file and rename, so readers never see a partial file."""
+    directory = os.path.dirname(filepath) or '.'
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _read_header(filepath: str) -> List[str]:
+    """Read only the header line of a CSV file."""
+    with open(filepath, newline='', encoding='utf-8-sig') as f:
+        return next(csv.reader(f), [])
+
+
+def load_schema(filepath: str) -> Optional[Dict]:
+    """
+    Load the schema sidecar for a CSV file.
+    Files written before sidecars existed get one built from their header line.
+    Returns None if the CSV file does not exist.
+    """
+    schema_file = get_schema_filepath(filepath)
+    if os.path.exists(schema_file):
+        with open(schema_file, encoding='utf-8') as f:
+            return json.load(f)
+    
+    if not os.path.exists(filepath):
+        return None
+    
+    return {
+        'version': 1,
+        'columns': _read_header(filepath),
+        'size': os.path.getsize(filepath)
+    }
+
+
+def save_schema(filepath: str, schema: Dict) -> None:
+    """Atomically write the schema sidecar for a CSV file."""
+    _write_atomic(get_schema_filepath(filepath), json.dumps(schema, indent=2).encode('utf-8'))
+
+
+def _serialize_rows(data: Union[List[Dict], Dict[str, List]], columns: List[str], header: bool) -> bytes:
+    """
+    Serialize rows in column order into CSV bytes.
+    Data is either a list of row dicts or a dict of equally long column lists.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if header:
+        writer.writerow(columns)
+    if isinstance(data, dict):
+        size = len(next(iter(data.values()), []))
+        writer.writerows(zip(*[data[col] if col in data else [None] * size for col in columns]))
+    else:
+        for row in data:
+            writer.writerow([row.get(col) for col in columns])
+    return buffer.getvalue().encode('utf-8')
+
+
+def append_rows(filepath: str, data: Union[List[Dict], Dict[str, List]], columns: List[str]) -> None:
+    """
+    Append rows to a CSV file without reading or rewriting the existing rows.
+    
+    The column list lives in a JSON sidecar next to the file. New columns are
+    added to the sidecar (bumping its version) rather than rewriting the header,
+    so older rows are simply shorter. The sidecar also records the size of the
+    file after the last committed append: a write interrupted by a crash leaves
+    extra bytes past that size, which are truncated before the next append.
+    The append and the sidecar update happen under the file's lock.
+    """
+    with _locked(filepath):
+        _append_rows(filepath, data, columns)
+
+
+def _append_rows(filepath: str, data: Union[List[Dict], Dict[str, List]], columns: List[str]) -> None:
+    schema = load_schema(filepath)
+    
+    if schema is None:
+        # New file: header and rows are written in one atomic step
+        schema = {'version': 1, 'columns': list(columns), 'size': 0}
+        payload = '\ufeff'.encode('utf-8') + _serialize_rows(data, schema['columns'], header=True)
+        _write_atomic(filepath, payload)
+        schema['size'] = len(payload)
+        save_schema(filepath, schema)
+        return
+    
+    # Extend the schema with any columns it does not have yet
+    new_columns = [col for col in columns if col not in schema['columns']]
+    if new_columns:
+        schema['columns'].extend(new_columns)
+        schema['version'] += 1
+    
+    payload = _serialize_rows(data, schema['columns'], header=False)
+    
+    with open(filepath, 'r+b') as f:
+        # Discard a torn write past the last committed size
+        f.seek(0, os.SEEK_END)
+        if f.tell() > schema['size']:
+            f.truncate(schema['size'])
+        elif f.tell() < schema['size']:
+            schema['size'] = f.tell()
+        f.seek(schema['size'])
+        
+        # Files created by older versions may lack a trailing newline
+        if schema['size'] > 0:
+            f.seek(schema['size'] - 1)
+            if f.read(1) != b'\n':
+                payload = b'\n' + payload
+        
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+        schema['size'] = f.tell()
+    
+    save_schema(filepath, schema)
+
+
+def rewrite_rows(filepath: str, data: Union[List[Dict], Dict[str, List]], columns: List[str]) -> None:
+    """
+    Replace the whole contents of a CSV file, e.g. for a one-time format migration.
+    
+    The schema version is bumped so cached readers notice. The old sidecar is
+    removed first: if the process dies before the new one is written, the next
+    reader rebuilds it from the new file's header instead of trusting a stale size.
+    """
+    with _locked(filepath):
+        _rewrite_rows(filepath, data, columns)
+
+
+def _rewrite_rows(filepath: str, data: Union[List[Dict], Dict[str, List]], columns: List[str]) -> None:
+    schema = load_schema(filepath)
+    version = schema['version'] + 1 if schema else 1
+    
+    schema_file = get_schema_filepath(filepath)
+    if os.path.exists(schema_file):
+        os.remove(schema_file)
+    
+    payload = '\ufeff'.encode('utf-8') + _serialize_rows(data, columns, header=True)
+    _write_atomic(filepath, payload)
+    save_schema(filepath, {'version': version, 'columns': list(columns), 'size': len(payload)})
+
+
+def read_rows(filepath: str, schema: Dict, start: int = 0, **kwargs) -> pd.DataFrame:
+    """
+    Read the committed rows of a CSV file as described by a schema snapshot.
+    
+    Only bytes from `start` up to the committed size in `schema` are parsed, so a
+    caller that remembers the size it last read can parse just the rows appended
+    since. `start` must be 0 or a committed size of the same schema version.
+    Rows written before a column was added are shorter and read as missing values.
+    Extra keyword arguments are passed to pandas.read_csv.
+    """
+    end = schema['size']
+    source = filepath
+    if start > 0 or os.path.getsize(filepath) > end:
+        # Slice out the requested rows; this also skips an uncommitted tail
+        # left by an interrupted append
+        with open(filepath, 'rb') as f:
+            f.seek(start)
+            source = io.BytesIO(f.read(max(end - start, 0)))
+    
+    # The header line may predate columns added later, so the names always come
+    # from the schema and the header line is skipped rather than parsed
+    return pd.read_csv(
+        source,
+        names=schema['columns'],
+        header=None,
+        skiprows=1 if start == 0 else 0,
+        encoding='utf-8-sig',
+        **kwargs
+    )
+
+
+def read_csv(filepath: str, **kwargs) -> pd.DataFrame:
+    """
+    Read a CSV file written by append_rows, using the column list from its sidecar.
+    Extra keyword arguments are passed to pandas.read_csv.
+    """
+    schema = load_schema(filepath)
+    
+    if schema is None:
+        return pd.read_csv(filepath, encoding='utf-8-sig', **kwargs)
+    
+    return read_rows(filepath, schema, **kwargs)
\ No newline at end of file
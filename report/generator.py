@@ -1,14 +1,30 @@
 # report/generator.py
 import os
-import pandas as pd
+import re
 from datetime import datetime
-from typing import List, Dict
-from models import PlatformReport
+from collections import Counter
+from typing import List, Dict, Union
+from models import Mention, MentionBatch, PlatformReport
+from report.csv_store import append_rows, load_schema, read_csv, rewrite_rows
+from utils.tracing import NOOP_TRACER, Tracer, current_span, traced
+
+SENTIMENTS = ('Positive', 'Negative', 'Neutral')
+
+SUMMARY_COLUMNS = [
+    'Timestamp', 'Keyword', 'Platform', 'Summary', 'Number_of_Mentions',
+    'Positive_Count', 'Positive_Ratio',
+    'Negative_Count', 'Negative_Ratio',
+    'Neutral_Count', 'Neutral_Ratio'
+]
+
+# Sentiment cells written by older versions, e.g. "3 (30.0%)"
+LEGACY_SENTIMENT = re.compile(r'^\s*(\d+)\s*\(\s*([\d.]+)%\)')
 
 class ReportGenerator:
-    def __init__(self, output_dir: str):
-        """Initialize the report generator with output directory."""
+    def __init__(self, output_dir: str, tracer: Tracer = NOOP_TRACER):
+        """Initialize the report generator with output directory; 'report' spans go to the tracer."""
         self.output_dir = output_dir
+        self.tracer = tracer
         os.makedirs(output_dir, exist_ok=True)
     
     def _sanitize_filename(self, name: str) -> str:
@@ -24,58 +40,61 @@ class ReportGenerator:
         """Get the filepath for the summary CSV file."""
         return os.path.join(self.output_dir, "platform_summaries.csv")
     
-    def _append_to_csv(self, filepath: str, data: List[Dict], columns: List[str]) -> None:
+    def _append_to_csv(self, filepath: str, data: Union[List[Dict], Dict[str, List]], columns: List[str]) -> None:
         """Append data to an existing CSV file or create a new one if it doesn't exist."""
-        df_new = pd.DataFrame(data, columns=columns)
+        # Only the new rows are written; existing rows are never read back
+        append_rows(filepath, data, columns)
+    
+    def _migrate_summary_file(self, filepath: str) -> None:
+        """
+        One-time rewrite of a summary file that stores sentiment as "3 (30.0%)"
+        strings into separate integer count and float ratio columns.
+        """
+        schema = load_schema(filepath)
+        if schema is None or not any(sentiment in schema['columns'] for sentiment in SENTIMENTS):
+            return
         
-        if os.path.exists(filepath):
-            # Read existing data
-            df_existing = pd.read_csv(filepath)
-            
-            # Ensure all columns exist in the existing DataFrame
-            for col in columns:
-                if col not in df_existing.columns:
-                    df_existing[col] = 'N/A'
-            
-            # Append new data
-            df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-        else:
-            df_combined = df_new
+        rows = read_csv(filepath, dtype=str, keep_default_na=False).to_dict('records')
+        for row in rows:
+            for sentiment in SENTIMENTS:
+                match = LEGACY_SENTIMENT.match(row.pop(sentiment, '') or '')
+                if match and not row.get(f'{sentiment}_Count'):
+                    row[f'{sentiment}_Count'] = int(match.group(1))
+                    row[f'{sentiment}_Ratio'] = round(float(match.group(2)) / 100, 4)
         
-        # Write back to CSV
-        df_combined.to_csv(filepath, index=False, encoding='utf-8-sig')
+        extra_columns = [col for col in schema['columns'] if col not in SUMMARY_COLUMNS and col not in SENTIMENTS]
+        rewrite_rows(filepath, rows, SUMMARY_COLUMNS + extra_columns)
+        print(f"Migrated {len(rows)} rows of {filepath} to numeric sentiment columns")
     
-    def _process_platform_data(self, report: PlatformReport, keyword: str) -> tuple:
-        """Process platform data and return rows for both platform and summary CSVs."""
-        # Prepare platform CSV rows
-        platform_rows = []
-        sentiment_counts = {'POSITIVE': 0, 'NEGATIVE': 0, 'NEUTRAL': 0}
+    def _as_batch(self, mentions: Union[List[Mention], MentionBatch]) -> MentionBatch:
+        """Columns are taken straight from a MentionBatch; plain mention lists are converted first."""
+        return mentions if isinstance(mentions, MentionBatch) else MentionBatch.from_mentions(mentions)
+    
+    def _platform_columns(self, mentions: MentionBatch, keyword: str) -> Dict[str, List]:
+        """Platform CSV data for mentions, as one list per column."""
+        platform_columns = {
+            'Keyword': [keyword] * len(mentions),
+            'Title': mentions.title,
+            'Description': mentions.description,
+            'URL': mentions.url,
+            'Date': [date.strftime("%Y-%m-%d %H:%M:%S") if date else 'N/A' for date in mentions.date],
+            'Sentiment': [sentiment or 'N/A' for sentiment in mentions.sentiment]
+        }
         
-        for mention in report.mentions:
-            # Count sentiments
-            if mention.sentiment:
-                sentiment_counts[mention.sentiment] += 1
-            
-            # Create row for platform CSV
-            row = {
-                'Keyword': keyword,
-                'Title': mention.title,
-                'Description': mention.description,
-                'URL': mention.url,
-                'Date': mention.date.strftime("%Y-%m-%d %H:%M:%S") if mention.date else 'N/A',
-                'Sentiment': mention.sentiment or 'N/A'
-            }
-            
-            # Add additional fields if they exist
-            if hasattr(mention, 'additional_fields'):
-                row.update(mention.additional_fields)
-            
-            platform_rows.append(row)
+        # Platform-specific extras become extra columns
+        platform_columns.update(mentions.additional_fields)
+        return platform_columns
+    
+    def _summary_row(self, report: PlatformReport, mentions: MentionBatch, keyword: str) -> Dict:
+        """Summary CSV row for one platform report."""
+        # Count sentiments
+        counts = Counter(mentions.sentiment)
+        sentiment_counts = {label: counts.get(label, 0) for label in ('POSITIVE', 'NEGATIVE', 'NEUTRAL')}
         
-        # Calculate sentiment percentages
+        # Calculate sentiment ratios
         total_sentiments = sum(sentiment_counts.values())
-        sentiment_percentages = {
-            k: f"{(v/total_sentiments*100):.1f}%" if total_sentiments > 0 else "0.0%"
+        sentiment_ratios = {
+            k: round(v / total_sentiments, 4) if total_sentiments > 0 else 0.0
             for k, v in sentiment_counts.items()
         }
         
@@ -85,50 +104,96 @@ class ReportGenerator:
             'Keyword': keyword,
             'Platform': report.platform,
             'Summary': report.summary,
-            'Number_of_Mentions': len(report.mentions),
-            'Positive': f"{sentiment_counts['POSITIVE']} ({sentiment_percentages['POSITIVE']})",
-            'Negative': f"{sentiment_counts['NEGATIVE']} ({sentiment_percentages['NEGATIVE']})",
-            'Neutral': f"{sentiment_counts['NEUTRAL']} ({sentiment_percentages['NEUTRAL']})"
+            'Number_of_Mentions': len(mentions)
         }
-        
-        return platform_rows, summary_row
+        for sentiment in SENTIMENTS:
+            summary_row[f'{sentiment}_Count'] = sentiment_counts[sentiment.upper()]
+            summary_row[f'{sentiment}_Ratio'] = sentiment_ratios[sentiment.upper()]
+        return summary_row
+    
+    def _process_platform_data(self, report: PlatformReport, keyword: str) -> tuple:
+        """
+        Process platform data and return the platform CSV data (one list per column)
+        and the summary CSV row.
+        """
+        mentions = self._as_batch(report.mentions)
+        return self._platform_columns(mentions, keyword), self._summary_row(report, mentions, keyword)
+    
+    def _merge_columns(self, target: Dict[str, List], columns: Dict[str, List]) -> None:
+        """Append column data to target, padding columns missing on either side with None."""
+        target_size = len(next(iter(target.values()), []))
+        size = len(next(iter(columns.values()), []))
+        for col, values in columns.items():
+            target.setdefault(col, [None] * target_size).extend(values)
+        for col, values in target.items():
+            if col not in columns:
+                values.extend([None] * size)
     
     def generate_report(self, keyword: str, platform_reports: List[PlatformReport]) -> Dict[str, str]:
         """
         Generate or update reports for each platform and summary.
         Returns dictionary with paths to all updated files.
         """
+        return self.generate_reports({keyword: platform_reports})
+    
+    @traced('report', lambda reports_by_keyword, **_: {'call': 'generate_reports', 'keywords': len(reports_by_keyword)})
+    def generate_reports(self, reports_by_keyword: Dict[str, List[PlatformReport]]) -> Dict[str, str]:
+        """
+        Generate or update reports for many keywords in a single pass.
+        Rows are grouped per platform so each CSV file is written once per run.
+        Returns dictionary with paths to all updated files.
+        """
         updated_files = {
             'platform_files': {},
             'summary_file': self._get_summary_filepath()
         }
         
+        platform_data_by_file: Dict[str, Dict[str, List]] = {}
         summary_rows = []
         
-        # Process each platform's data
-        for report in platform_reports:
-            platform_rows, summary_row = self._process_platform_data(report, keyword)
-            
-            # Get file path for this platform
-            platform_file = self._get_platform_filepath(report.platform)
-            updated_files['platform_files'][report.platform] = platform_file
-            
-            # Determine columns for platform CSV
-            platform_columns = ['Keyword', 'Title', 'Description', 'URL', 'Date', 'Sentiment']
-            if platform_rows and hasattr(platform_rows[0], 'additional_fields'):
-                platform_columns.extend(platform_rows[0]['additional_fields'].keys())
-            
-            # Append platform data to CSV
-            self._append_to_csv(platform_file, platform_rows, platform_columns)
-            
-            # Collect summary row
-            summary_rows.append(summary_row)
+        # Process each keyword's platform data
+        for keyword, platform_reports in reports_by_keyword.items():
+            for report in platform_reports:
+                platform_columns, summary_row = self._process_platform_data(report, keyword)
+                
+                # Get file path for this platform
+                platform_file = self._get_platform_filepath(report.platform)
+                updated_files['platform_files'][report.platform] = platform_file
+                self._merge_columns(platform_data_by_file.setdefault(platform_file, {}), platform_columns)
+                
+                # Collect summary row
+                summary_rows.append(summary_row)
+        
+        for platform_file, platform_data in platform_data_by_file.items():
+            # Standard columns first, then every extra field seen on this platform
+            self._append_to_csv(platform_file, platform_data, list(platform_data))
         
         # Update summary CSV
-        summary_columns = [
-            'Timestamp', 'Keyword', 'Platform', 'Summary', 
-            'Number_of_Mentions', 'Positive', 'Negative', 'Neutral'
-        ]
-        self._append_to_csv(updated_files['summary_file'], summary_rows, summary_columns)
+        self._migrate_summary_file(updated_files['summary_file'])
+        self._append_to_csv(updated_files['summary_file'], summary_rows, SUMMARY_COLUMNS)
+        current_span().set(rows=len(summary_rows), files=len(platform_data_by_file) + 1)
         
-        return updated_files
\ No newline at end of file
+        return updated_files
+    
+    @traced('report', lambda platform, mentions, **_: {'call': 'append_mentions', 'platform': platform, 'rows': len(mentions)})
+    def append_mentions(self, keyword: str, platform: str, mentions: Union[List[Mention], MentionBatch]) -> str:
+        """
+        Append mentions to a platform's CSV file straight away, e.g. page by page
+        while a platform is still being fetched. Returns the platform file path.
+        """
+        platform_file = self._get_platform_filepath(platform)
+        platform_columns = self._platform_columns(self._as_batch(mentions), keyword)
+        self._append_to_csv(platform_file, platform_columns, list(platform_columns))
+        return platform_file
+    
+    @traced('report', lambda report, **_: {'call': 'append_summary', 'platform': report.platform})
+    def append_summary(self, keyword: str, report: PlatformReport) -> str:
+        """
+        Append the summary row for a finished platform report whose mentions were
+        already written with append_mentions. Returns the summary file path.
+        """
+        summary_file = self._get_summary_filepath()
+        self._migrate_summary_file(summary_file)
+        self._append_to_csv(summary_file, [self._summary_row(report, self._as_batch(report.mentions), keyword)],
+                            SUMMARY_COLUMNS)
+        return summary_file
\ No newline at end of file
@@ -0,0 +1,339 @@
+import asyncio
+import time
+from typing import List, Dict, Optional, Tuple, Callable, Awaitable
+from langchain_core.language_models import BaseChatModel
+from config import Config
+from models import Mention, MentionBatch, PlatformReport
+from platforms.base import IncompleteFetch, Platform
+from platforms.google_search import GoogleSearch
+from platforms.youtube import YouTube
+from platforms.stackexchange import StackExchange
+from platforms.github import GitHub
+from platforms.hackernews import HackerNews
+from platforms.current_news import CurrentNews
+# from platforms.reddit import Reddit
+# from platforms.mastodon import MastodonPlatform
+# from platforms.wikipedia import Wikipedia
+# from platforms.telegram import Telegram
+from analysis.sentiment import ContentAnalyzer
+from analysis.dedup import MentionDeduplicator
+from analysis.local_sentiment import LocalSentimentClassifier
+from utils.llm_cache import LLMCache
+from utils.http import HttpClient
+from utils.cursor_store import CursorStore
+from utils.rate_limiter import RateLimiter
+from utils.resilience import CircuitBreaker
+from utils.tracing import create_tracer, current_span, traced
+
+
+class Scheduler:
+    """
+    Runs (keyword, platform) pairs on one event loop.
+    
+    The scheduler owns everything that should be shared across keywords: the
+    pooled HTTP client, the LLM cache, the analyzer and the concurrency limits.
+    MAX_CONCURRENT_PLATFORMS caps the (keyword, platform) tasks running at once,
+    PLATFORM_CONCURRENCY caps the tasks hitting any single platform, and
+    MAX_CONCURRENT_LLM_REQUESTS caps in-flight LLM calls.
+    
+    With INCREMENTAL_FETCH enabled, each pair only fetches mentions newer than
+    its stored cursor. A fetch only stages the pair's new cursor; callers pass
+    the pairs whose reports have been written to save_cursors(), which commits
+    and persists them.
+    
+    Usage:
+        scheduler = Scheduler(config)
+        try:
+            reports = await scheduler.analyze_keywords(["CRO", "A/B testing"])
+        finally:
+            await scheduler.close()
+    """
+    
+    def __init__(self, config: Config, platforms: Optional[List[Platform]] = None,
+                 llm: Optional[BaseChatModel] = None):
+        self.config = config
+        # Stage timings and counters; a no-op unless TRACING_ENABLED
+        self.tracer = create_tracer(config.TRACING_ENABLED, config.TRACE_PATH, config.METRICS_PATH,
+                                    max_bytes=config.TRACE_MAX_BYTES, backup_count=config.TRACE_BACKUP_COUNT)
+        
+        # Pooled, rate-limited HTTP session shared by all platforms
+        self.limiter = RateLimiter(config.RATE_LIMITS, config.RATE_LIMIT_STATE_PATH)
+        self.http = HttpClient(
+            limit=config.HTTP_MAX_CONNECTIONS,
+            limit_per_host=config.HTTP_MAX_CONNECTIONS_PER_HOST,
+            dns_cache_ttl=config.HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=config.HTTP_KEEPALIVE_TIMEOUT,
+            timeout=config.HTTP_TIMEOUT,
+            limiter=self.limiter,
+            retries=config.HTTP_RETRIES,
+            retry_base_delay=config.HTTP_RETRY_BASE_DELAY,
+            retry_max_delay=config.HTTP_RETRY_MAX_DELAY,
+            tracer=self.tracer
+        )
+        
+        self.cache = LLMCache(
+            config.LLM_CACHE_PATH,
+            ttl=config.LLM_CACHE_TTL,
+            max_entries=config.LLM_CACHE_MAX_ENTRIES,
+            enabled=config.LLM_CACHE_ENABLED
+        )
+        self.analyzer = ContentAnalyzer(
+            config.OPENAI_API_KEY,
+            batch_token_budget=config.SENTIMENT_BATCH_TOKENS,
+            max_batch_size=config.SENTIMENT_BATCH_SIZE,
+            cache=self.cache,
+            max_concurrency=config.MAX_CONCURRENT_LLM_REQUESTS,
+            summary_token_budget=config.SUMMARY_TOKEN_BUDGET,
+            local_classifier=LocalSentimentClassifier(
+                threshold=config.LOCAL_SENTIMENT_THRESHOLD,
+                lexicon_path=config.LOCAL_SENTIMENT_LEXICON_PATH
+            ) if config.LOCAL_SENTIMENT_ENABLED else None,
+            llm=llm,
+            tracer=self.tracer
+        )
+        
+        self.platforms = platforms if platforms is not None else self._default_platforms()
+        self.cursors = CursorStore(config.CURSOR_STORE_PATH) if config.INCREMENTAL_FETCH else None
+        self.dedup = MentionDeduplicator(config.DEDUP_MAX_DISTANCE) if config.DEDUPLICATE_MENTIONS else None
+        
+        # A cap of 1 runs the tasks one after another
+        max_concurrent = config.MAX_CONCURRENT_PLATFORMS if config.CONCURRENT_PLATFORMS else 1
+        self._task_limit = asyncio.Semaphore(max_concurrent)
+        self._platform_limits: Dict[str, asyncio.Semaphore] = {}
+        
+        # One breaker per platform; failed requests are retried by HttpClient, not here
+        self._breakers: Dict[str, CircuitBreaker] = {}
+    
+    def _default_platforms(self) -> List[Platform]:
+        """Platforms enabled for a run."""
+        config, http = self.config, self.http
+        return [
+            GoogleSearch(config, max_results=10, http=http),
+            YouTube(config, http=http),
+            StackExchange(config, max_results=100, http=http),
+            # GitHub(config, max_results=100, http=http),
+            # HackerNews(config, max_results=100, http=http),
+            # CurrentNews(config, max_results=100, http=http),
+            # Reddit(config, max_results=100, http=http),
+            # MastodonPlatform(config, max_results=100, http=http),
+            # Wikipedia(config, max_results=10, http=http),
+            # Telegram(config, max_results=10),
+        ]
+    
+    def _platform_limit(self, name: str) -> asyncio.Semaphore:
+        """Semaphore limiting concurrent tasks for one platform across all keywords."""
+        if name not in self._platform_limits:
+            self._platform_limits[name] = asyncio.Semaphore(self.config.PLATFORM_CONCURRENCY)
+        return self._platform_limits[name]
+    
+    def _breaker(self, name: str) -> CircuitBreaker:
+        """Circuit breaker shared by every keyword fetched from one platform."""
+        if name not in self._breakers:
+            self._breakers[name] = CircuitBreaker(
+                name,
+                failure_threshold=self.config.CIRCUIT_FAILURE_THRESHOLD,
+                reset_timeout=self.config.CIRCUIT_RESET_TIMEOUT
+            )
+        return self._breakers[name]
+    
+    @traced('fetch', lambda platform, keyword, **_: {'platform': platform.name, 'keyword': keyword})
+    async def _fetch(self, platform: Platform, keyword: str, since) -> Tuple[MentionBatch, Optional[IncompleteFetch]]:
+        """
+        Fetch mentions through the platform's circuit breaker, adding each page
+        to a MentionBatch as it arrives so only one page of Mention objects is
+        held at a time. Mentions at or before `since` are dropped.
+        Also returns the IncompleteFetch if a page failed after earlier ones arrived.
+        """
+        async def fetch() -> Tuple[MentionBatch, Optional[IncompleteFetch]]:
+            batch = MentionBatch()
+            
+            def add(page: List[Mention]) -> None:
+                if since is not None:
+                    # Drop anything at or before the cursor the API filter let through
+                    page = [m for m in page if m.date is None or m.date > since]
+                batch.extend(page)
+            
+            pages = platform.stream_mentions(keyword, since=since)
+            try:
+                async for page in pages:
+                    add(page)
+            except IncompleteFetch as e:
+                # Platforms without stream_mentions attach what they fetched instead
+                add(e.mentions)
+                return batch, e
+            finally:
+                await pages.aclose()
+            return batch, None
+        
+        # Not retried as a whole: that would re-download pages that already arrived
+        mentions, incomplete = await self._breaker(platform.name).call(fetch)
+        current_span().set(mentions=len(mentions), incomplete=incomplete is not None)
+        self.tracer.count('mentions_total', value=len(mentions), platform=platform.name)
+        return mentions, incomplete
+    
+    async def _analyze_platform(self, platform: Platform, keyword: str, report: PlatformReport) -> None:
+        """Fetch and analyze one platform, filling in the report as each step completes."""
+        since = self.cursors.get(keyword, report.platform) if self.cursors else None
+        if self.cursors:
+            # Forget what an earlier, unwritten fetch of this pair staged
+            self.cursors.discard(keyword, report.platform)
+        mentions, incomplete = await self._fetch(platform, keyword, since)
+        
+        if incomplete is not None:
+            # Results between these mentions and the cursor were not fetched; keep the cursor
+            print(f"{str(incomplete)}; keeping the cursor for '{keyword}'")
+            report.error = str(incomplete)
+        elif self.cursors:
+            self.cursors.update(keyword, report.platform, mentions)
+        report.mentions = mentions
+        
+        # Analyze sentiment for all mentions in batched requests, once per duplicate group
+        if self.dedup:
+            await self.dedup.share_sentiment(report.mentions, self.analyzer.analyze_sentiment_batch)
+        else:
+            await self.analyzer.analyze_sentiment_batch(report.mentions)
+        
+        # Generate platform summary
+        report.summary = await self.analyzer.generate_summary(report.mentions)
+    
+    async def run_platform(self, platform: Platform, keyword: str) -> PlatformReport:
+        """
+        Run a single (keyword, platform) pair under the concurrency limits and its deadline.
+        A slow or failing platform returns whatever it produced so far instead of
+        breaking the whole run.
+        """
+        report = PlatformReport(platform=platform.__class__.__name__, mentions=[])
+        timeout = self.config.PLATFORM_TIMEOUT
+        
+        # Platform slot first, so tasks queued on a busy platform do not hold global slots
+        async with self._platform_limit(report.platform), self._task_limit:
+            try:
+                await asyncio.wait_for(self._analyze_platform(platform, keyword, report), timeout)
+            except asyncio.TimeoutError:
+                print(f"{report.platform} timed out after {timeout}s for '{keyword}', keeping partial results")
+                report.error = f"timed out after {timeout}s"
+                if report.summary is None:
+                    report.summary = f"Partial results: timed out after {timeout}s"
+            except Exception as e:
+                print(f"{report.platform} failed for '{keyword}': {str(e)}")
+                report.error = f"{type(e).__name__}: {str(e)}"
+                if report.summary is None:
+                    report.summary = f"Partial results: {type(e).__name__}: {str(e)}"
+        
+        return report
+    
+    async def stream_platform(self, platform: Platform, keyword: str,
+                              consume: Callable[[List[Mention]], Awaitable[None]]) -> Optional[str]:
+        """
+        Stream one (keyword, platform) pair page by page into consume, under the
+        same concurrency limits, deadline, cursor and circuit breaker as run_platform.
+        The deadline only counts time spent fetching pages, not time consume is
+        blocked, so a slow downstream stage cannot time out a working fetch.
+        Pages already consumed are kept when the platform fails, times out or
+        loses a page, but the pair's cursor is left where it was. Returns None on success, or a note describing why the results are partial.
+        """
+        since = self.cursors.get(keyword, platform.name) if self.cursors else None
+        if self.cursors:
+            self.cursors.discard(keyword, platform.name)
+        timeout = self.config.PLATFORM_TIMEOUT
+        
+        async def stream() -> Optional[IncompleteFetch]:
+            remaining = timeout
+            pages = platform.stream_mentions(keyword, since=since)
+            mentions = 0
+            try:
+                while True:
+                    # Only the wait for the next page counts towards the deadline
+                    started = time.monotonic()
+                    try:
+                        page = await asyncio.wait_for(anext(pages), max(remaining, 0))
+                    except StopAsyncIteration:
+                        break
+                    except IncompleteFetch as e:
+                        return e
+                    remaining -= time.monotonic() - started
+                    
+                    if since is not None:
+                        # Drop anything at or before the cursor the API filter let through
+                        page = [m for m in page if m.date is None or m.date > since]
+                    if not page:
+                        continue
+                    if self.cursors:
+                        self.cursors.update(keyword, platform.name, page)
+                    mentions += len(page)
+                    self.tracer.count('mentions_total', value=len(page), platform=platform.name)
+                    current_span().set(mentions=mentions)
+                    await consume(page)
+            finally:
+                await pages.aclose()
+            return None
+        
+        async with self._platform_limit(platform.name), self._task_limit:
+            try:
+                # Includes time spent waiting for the pipeline to take each page
+                with self.tracer.span('fetch', platform=platform.name, keyword=keyword, streamed=True):
+                    incomplete = await self._breaker(platform.name).call(stream)
+                if incomplete is None:
+                    return None
+                print(f"{str(incomplete)}; keeping partial results for '{keyword}'")
+                note = f"Partial results: {str(incomplete)}"
+            except asyncio.TimeoutError:
+                print(f"{platform.name} timed out after {timeout}s for '{keyword}', keeping partial results")
+                note = f"Partial results: timed out after {timeout}s"
+            except Exception as e:
+                print(f"{platform.name} failed for '{keyword}': {str(e)}")
+                note = f"Partial results: {type(e).__name__}: {str(e)}"
+        
+        if self.cursors:
+            # Pages are newest first, so anything between the last one and the cursor is missing
+            self.cursors.discard(keyword, platform.name)
+        return note
+    
+    async def analyze_keyword(self, keyword: str) -> List[PlatformReport]:
+        """Run every platform for one keyword."""
+        return await asyncio.gather(*[
+            self.run_platform(platform, keyword) for platform in self.platforms
+        ])
+    
+    async def analyze_keywords(self, keywords: List[str]) -> Dict[str, List[PlatformReport]]:
+        """Schedule every (keyword, platform) pair at once and group the reports by keyword."""
+        keywords = list(dict.fromkeys(keywords))  # Drop repeats, keep order
+        pairs = [(keyword, platform) for keyword in keywords for platform in self.platforms]
+        reports = await asyncio.gather(*[
+            self.run_platform(platform, keyword) for keyword, platform in pairs
+        ])
+        
+        reports_by_keyword: Dict[str, List[PlatformReport]] = {keyword: [] for keyword in keywords}
+        for (keyword, _), report in zip(pairs, reports):
+            reports_by_keyword[keyword].append(report)
+        return reports_by_keyword
+    
+    def save_cursors(self, pairs: Optional[List[Tuple[str, str]]] = None) -> None:
+        """
+        Commit and persist the cursors of (keyword, platform name) pairs whose
+        reports have been written; without pairs, every staged cursor is committed.
+        """
+        if not self.cursors:
+            return
+        if pairs is None:
+            self.cursors.commit_all()
+        else:
+            for keyword, platform in pairs:
+                self.cursors.commit(keyword, platform)
+        self.cursors.save()
+    
+    async def close(self) -> None:
+        """Release platform clients, the HTTP session and the LLM cache, and persist quota usage and metrics."""
+        for platform in self.platforms:
+            try:
+                await platform.close()
+            except Exception as e:
+                print(f"Error closing {platform.name}: {str(e)}")
+        await self.http.close()
+        self.limiter.save()
+        if self.analyzer.local_classifier is not None:
+            print(f"\nLocal sentiment: {self.analyzer.local_resolved} mentions classified without the LLM")
+        if self.cache.enabled:
+            print(f"\nLLM cache: {self.cache.hits} hits, {self.cache.misses} misses")
+        self.cache.close()
+        self.tracer.close()
@@ -0,0 +1,18 @@
+import os
+import pytest
+from config import Config
+
+
+@pytest.fixture
+def config(tmp_path):
+    """Default settings with every file kept in a temporary directory."""
+    config = Config()
+    config.OUTPUT_DIR = str(tmp_path / "csv")
+    config.LLM_CACHE_ENABLED = False
+    config.LLM_CACHE_PATH = str(tmp_path / "llm_cache.sqlite3")
+    config.CURSOR_STORE_PATH = str(tmp_path / "cursors.json")
+    config.RATE_LIMIT_STATE_PATH = None
+    config.DAEMON_STATE_PATH = str(tmp_path / "daemon.json")
+    config.HTTP_RETRY_BASE_DELAY = 0.01
+    os.makedirs(config.OUTPUT_DIR, exist_ok=True)
+    return config
\ No newline at end of file
@@ -0,0 +1,86 @@
+import json
+import threading
+from report.csv_store import _locked, append_rows, get_schema_filepath, load_schema, read_csv, read_rows
+
+
+def test_append_and_read_back(tmp_path):
+    path = str(tmp_path / "mentions.csv")
+    append_rows(path, [{'a': 1, 'b': 'x'}], ['a', 'b'])
+    append_rows(path, {'a': [2, 3], 'b': ['y', 'z']}, ['a', 'b'])
+    
+    df = read_csv(path)
+    assert list(df.columns) == ['a', 'b']
+    assert df['a'].tolist() == [1, 2, 3]
+    assert df['b'].tolist() == ['x', 'y', 'z']
+
+
+def test_schema_extension_keeps_file_readable(tmp_path):
+    path = str(tmp_path / "mentions.csv")
+    append_rows(path, [{'a': 1, 'b': 2}], ['a', 'b'])
+    append_rows(path, [{'a': 3, 'b': 4}], ['a', 'b'])
+    version = load_schema(path)['version']
+    with open(path, 'rb') as f:
+        before = f.read()
+    append_rows(path, [{'a': 5, 'b': 6, 'c': 7}], ['a', 'b', 'c'])
+    
+    schema = load_schema(path)
+    assert schema['columns'] == ['a', 'b', 'c']
+    assert schema['version'] == version + 1
+    
+    df = read_csv(path)
+    assert df['a'].tolist() == [1, 3, 5]
+    assert df['c'].isna().tolist() == [True, True, False]
+    
+    # Existing bytes, header line included, are never rewritten
+    with open(path, 'rb') as f:
+        assert f.read(len(before)) == before
+
+
+def test_read_rows_from_committed_size(tmp_path):
+    path = str(tmp_path / "mentions.csv")
+    append_rows(path, [{'a': 1, 'b': 2}], ['a', 'b'])
+    start = load_schema(path)['size']
+    append_rows(path, [{'a': 3, 'b': 4}, {'a': 5, 'b': 6}], ['a', 'b'])
+    
+    tail = read_rows(path, load_schema(path), start=start)
+    assert tail['a'].tolist() == [3, 5]
+
+
+def test_read_ignores_uncommitted_tail(tmp_path):
+    path = str(tmp_path / "mentions.csv")
+    append_rows(path, [{'a': 1, 'b': 2}], ['a', 'b'])
+    with open(path, 'ab') as f:
+        f.write(b"9,9,9,9\n")
+    
+    assert read_csv(path)['a'].tolist() == [1]
+    append_rows(path, [{'a': 3, 'b': 4}], ['a', 'b'])
+    assert read_csv(path)['a'].tolist() == [1, 3]
+
+
+def test_read_file_with_header_older_than_schema(tmp_path):
+    # Written by versions that only extended the sidecar, not the header line
+    path = tmp_path / "mentions.csv"
+    payload = "\ufeffa,b\n1,2\n3,4,5\n".encode('utf-8')
+    path.write_bytes(payload)
+    with open(get_schema_filepath(str(path)), 'w', encoding='utf-8') as f:
+        json.dump({'version': 2, 'columns': ['a', 'b', 'c'], 'size': len(payload)}, f)
+    
+    df = read_csv(str(path))
+    assert list(df.columns) == ['a', 'b', 'c']
+    assert df['a'].tolist() == [1, 3]
+    assert df['c'].isna().tolist() == [True, False]
+
+
+def test_append_waits_for_the_file_lock(tmp_path):
+    path = str(tmp_path / "mentions.csv")
+    append_rows(path, [{'a': 1}], ['a'])
+    
+    # Another process's append holds the lock
+    with _locked(path):
+        writer = threading.Thread(target=append_rows, args=(path, [{'a': 2}], ['a']))
+        writer.start()
+        writer.join(0.2)
+        assert writer.is_alive()
+    writer.join()
+    
+    assert read_csv(path)['a'].tolist() == [1, 2]
\ No newline at end of file
@@ -0,0 +1,43 @@
+import json
+from datetime import datetime
+from models import Mention
+from utils.cursor_store import CursorStore
+
+
+def _mention(date: datetime) -> Mention:
+    return Mention(platform="HackerNews", title="t", url="https://example.com", description="d", date=date)
+
+
+def test_only_committed_pairs_are_saved(tmp_path):
+    path = str(tmp_path / "cursors.json")
+    store = CursorStore(path)
+    store.update("CRO", "HackerNews", [_mention(datetime(2024, 1, 2))])
+    store.update("CRO", "GitHub", [_mention(datetime(2024, 1, 3))])
+    
+    # Staged cursors are not used for the next fetch until committed
+    assert store.get("CRO", "HackerNews") is None
+    
+    store.commit("CRO", "HackerNews")
+    store.save()
+    
+    with open(path, encoding='utf-8') as f:
+        saved = json.load(f)
+    assert list(saved) == ["HackerNews\tCRO"]
+    assert CursorStore(path).get("CRO", "GitHub") is None
+
+
+def test_commit_never_moves_a_cursor_back(tmp_path):
+    store = CursorStore(str(tmp_path / "cursors.json"))
+    store.update("CRO", "HackerNews", [_mention(datetime(2024, 1, 5))])
+    store.commit("CRO", "HackerNews")
+    store.update("CRO", "HackerNews", [_mention(datetime(2024, 1, 1))])
+    store.commit("CRO", "HackerNews")
+    assert store.get("CRO", "HackerNews") == datetime(2024, 1, 5)
+
+
+def test_discard_drops_an_unwritten_fetch(tmp_path):
+    store = CursorStore(str(tmp_path / "cursors.json"))
+    store.update("CRO", "HackerNews", [_mention(datetime(2024, 1, 5))])
+    store.discard("CRO", "HackerNews")
+    store.commit_all()
+    assert store.get("CRO", "HackerNews") is None
\ No newline at end of file
@@ -0,0 +1,50 @@
+import os
+from analysis.data_visualizer import DataVisualizer
+from report.csv_store import append_rows
+
+COLUMNS = {'Timestamp': 'date', 'Platform': 'category', 'Positive_Count': 'Int64'}
+
+
+def _rows(platform, count):
+    return [{'Timestamp': "2024-01-01 12:00:00", 'Platform': platform, 'Positive_Count': count, 'Summary': "text"}]
+
+
+def _visualizer(tmp_path):
+    return DataVisualizer(str(tmp_path / "csv"), str(tmp_path / "plot"), cache_dir=str(tmp_path / "frames"))
+
+
+def test_frame_cache_is_reused_and_extended(tmp_path):
+    visualizer = _visualizer(tmp_path)
+    path = str(tmp_path / "csv" / "platform_summaries.csv")
+    os.makedirs(os.path.dirname(path))
+    append_rows(path, _rows("GitHub", 1), list(_rows("GitHub", 1)[0]))
+    
+    first = visualizer._load_frame(path, COLUMNS)
+    assert visualizer._load_frame(path, COLUMNS).equals(first)
+    
+    append_rows(path, _rows("Reddit", None), list(_rows("Reddit", None)[0]))
+    df = visualizer._load_frame(path, COLUMNS)
+    assert df['Platform'].tolist() == ["GitHub", "Reddit"]
+    assert str(df['Platform'].dtype) == 'category'
+    assert str(df['Positive_Count'].dtype) == 'Int64' and df['Positive_Count'].isna().tolist() == [False, True]
+    assert str(df['Timestamp'].dtype).startswith('datetime64')
+    # Only the finished cache file is left behind
+    assert [name.endswith('.feather') for name in os.listdir(tmp_path / "frames")] == [True]
+
+
+def test_unreadable_cache_is_ignored(tmp_path, capsys):
+    visualizer = _visualizer(tmp_path)
+    path = str(tmp_path / "csv" / "platform_summaries.csv")
+    os.makedirs(os.path.dirname(path))
+    append_rows(path, _rows("GitHub", 1), list(_rows("GitHub", 1)[0]))
+    with open(visualizer._cache_filepath(path), 'wb') as f:
+        f.write(b"truncated")
+    
+    assert visualizer._load_frame(path, COLUMNS)['Platform'].tolist() == ["GitHub"]
+    assert "Ignoring unreadable frame cache" in capsys.readouterr().out
+
+
+def test_default_cache_dir_is_outside_the_data_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    visualizer = DataVisualizer("output/csv", "output/plot")
+    assert visualizer.cache_dir == os.path.join("output", "cache", "frames")
\ No newline at end of file
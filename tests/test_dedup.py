@@ -0,0 +1,16 @@
+from analysis.dedup import canonical_url
+
+
+def test_canonical_url_drops_scheme_tracking_and_fragment():
+    assert canonical_url("https://www.example.com/a/?utm_source=x&b=2&a=1#top") == "example.com/a?a=1&b=2"
+    assert canonical_url("http://m.example.com:80") == "example.com/"
+
+
+def test_canonical_url_without_scheme_keeps_every_character():
+    assert canonical_url("example.com/path") == "example.com/path"
+    assert canonical_url("//example.com/path/") == "example.com/path"
+    assert canonical_url("/relative/path") == "/relative/path"
+
+
+def test_canonical_url_short_youtube_links():
+    assert canonical_url("https://youtu.be/abc") == canonical_url("https://www.youtube.com/watch?v=abc")
\ No newline at end of file
@@ -0,0 +1,34 @@
+import asyncio
+import pytest
+from platforms.base import IncompleteFetch
+from platforms.google_search import GoogleSearch
+from utils.resilience import APIError
+
+
+class FakeHttp:
+    """Serves Google result pages; pages whose 0-based index is in `failing` return an error body."""
+    
+    def __init__(self, failing):
+        self.failing = failing
+    
+    async def get_json(self, url, params=None, headers=None, rate_key=None):
+        page = (params['start'] - 1) // 10
+        if page in self.failing:
+            return {'error': {'message': 'Backend Error'}}
+        return {'items': [{'title': f"Result {page}", 'link': f"https://example.com/{page}", 'snippet': ""}]}
+
+
+def _google(config, failing):
+    return GoogleSearch(config, max_results=30, http=FakeHttp(failing))
+
+
+def test_failed_page_keeps_the_pages_that_arrived(config):
+    with pytest.raises(IncompleteFetch) as info:
+        asyncio.run(_google(config, {1}).fetch_mentions("CRO"))
+    assert "page 2 failed" in str(info.value)
+    assert [m.url for m in info.value.mentions] == ["https://example.com/0", "https://example.com/2"]
+
+
+def test_every_page_failing_raises_the_api_error(config):
+    with pytest.raises(APIError):
+        asyncio.run(_google(config, {0, 1, 2}).fetch_mentions("CRO"))
\ No newline at end of file
@@ -0,0 +1,40 @@
+import pytest
+from analysis.local_sentiment import LocalSentimentClassifier
+
+# Clearly negative, but without words from the built-in lexicon
+NEGATIVE_WITHOUT_LEXICON_WORDS = [
+    "Company bankrupt",
+    "CEO arrested",
+    "Users furious after data stolen",
+    "Hackers exploited the checkout",
+    "Startup accused of misleading investors",
+]
+
+
+@pytest.mark.parametrize("text", NEGATIVE_WITHOUT_LEXICON_WORDS)
+def test_texts_without_sentiment_words_are_escalated(text):
+    classifier = LocalSentimentClassifier(threshold=0.8)
+    assert classifier.confident([text]) == [None]
+
+
+def test_clear_polar_texts_are_resolved_locally():
+    classifier = LocalSentimentClassifier(threshold=0.8)
+    assert classifier.confident(["This works great and we love the results"]) == ["POSITIVE"]
+    assert classifier.confident(["This is great"]) == ["POSITIVE"]
+
+
+# Short neutral mentions the local classifier exists to keep away from the LLM
+@pytest.mark.parametrize("text", [
+    "facebook/react",
+    "Release notes v2.3.1",
+    "Show HN: my new CLI",
+    "left-pad",
+])
+def test_identifiers_and_informational_titles_are_resolved_as_neutral(text):
+    classifier = LocalSentimentClassifier(threshold=0.8)
+    assert classifier.confident([text]) == ["NEUTRAL"]
+
+
+def test_informational_titles_with_sentiment_words_are_not_forced_neutral():
+    classifier = LocalSentimentClassifier(threshold=0.8)
+    assert classifier.confident(["Release notes v2.3.1: the worst update yet"]) == ["NEGATIVE"]
\ No newline at end of file
@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List, Optional
+import pytest
+from benchmarks.fake_llm import FakeChatOpenAI
+from models import Mention, MentionBatch
+from platforms.base import IncompleteFetch, Platform
+from scheduler import Scheduler
+
+NOW = datetime(2024, 6, 1, 12, 0)
+PAGE_SIZE = 10
+
+
+class PagedAPI(Platform):
+    """Newest-first results from `now`, PAGE_SIZE per page, one minute apart; `failing_page` raises."""
+    
+    def __init__(self, results: int, max_results: int, failing_page: Optional[int] = None, now: datetime = NOW):
+        self.results = results
+        self.max_results = max_results
+        self.failing_page = failing_page
+        self.now = now
+    
+    async def _fetch_page(self, page: int, since: Optional[datetime]):
+        if page == self.failing_page:
+            raise ConnectionError("connection reset")
+        mentions = [
+            Mention(platform=self.name, title=f"Result {index}", url=f"https://example.com/{index}",
+                    description="", date=self.now - timedelta(minutes=index))
+            for index in range(page * PAGE_SIZE, min((page + 1) * PAGE_SIZE, self.results))
+        ]
+        return mentions, -(-self.results // PAGE_SIZE)
+    
+    async def stream_mentions(self, keyword, since=None):
+        async for mentions in self._paginate(
+            lambda page: self._fetch_page(page, since),
+            max_results=self.max_results, page_size=PAGE_SIZE, concurrency=2, since=since
+        ):
+            yield mentions
+    
+    async def fetch_mentions(self, keyword, since=None) -> List[Mention]:
+        return await self._collect(keyword, since=since)
+
+
+def test_failing_later_page_raises_after_earlier_pages():
+    with pytest.raises(IncompleteFetch) as info:
+        asyncio.run(PagedAPI(results=50, max_results=50, failing_page=2).fetch_mentions("CRO"))
+    assert len(info.value.mentions) == 2 * PAGE_SIZE
+
+
+def test_failing_first_page_raises_its_error():
+    with pytest.raises(ConnectionError):
+        asyncio.run(PagedAPI(results=50, max_results=50, failing_page=0).fetch_mentions("CRO"))
+
+
+def test_max_results_before_the_cursor_skips_older_results(capsys):
+    since = NOW - timedelta(minutes=40)
+    assert len(asyncio.run(PagedAPI(results=50, max_results=20).fetch_mentions("CRO", since=since))) == 20
+    assert "skipping older results" in capsys.readouterr().out
+
+
+def test_reaching_the_cursor_or_the_last_page_is_complete():
+    since = NOW - timedelta(minutes=15)
+    assert len(asyncio.run(PagedAPI(results=50, max_results=50).fetch_mentions("CRO", since=since))) == 2 * PAGE_SIZE
+    assert len(asyncio.run(PagedAPI(results=30, max_results=50).fetch_mentions("CRO", since=NOW - timedelta(days=1)))) == 30
+    # Without a cursor, stopping at max_results is the expected first-run result
+    assert len(asyncio.run(PagedAPI(results=50, max_results=20).fetch_mentions("CRO"))) == 20
+
+
+def test_incomplete_fetch_keeps_the_cursor(config):
+    config.LOCAL_SENTIMENT_ENABLED = False
+    
+    async def run(platform: Platform):
+        scheduler = Scheduler(config, platforms=[platform], llm=FakeChatOpenAI(latency=0))
+        try:
+            report = await scheduler.run_platform(platform, "CRO")
+            scheduler.save_cursors()
+            return report, scheduler.cursors.get("CRO", platform.name)
+        finally:
+            await scheduler.close()
+    
+    report, cursor = asyncio.run(run(PagedAPI(results=50, max_results=50, failing_page=3)))
+    assert len(report.mentions) == 3 * PAGE_SIZE
+    assert cursor is None
+    
+    report, cursor = asyncio.run(run(PagedAPI(results=50, max_results=50)))
+    assert cursor == NOW
+
+
+def test_run_platform_batches_pages_as_they_arrive(config):
+    config.LOCAL_SENTIMENT_ENABLED = False
+    
+    class StreamOnly(PagedAPI):
+        async def fetch_mentions(self, keyword, since=None):
+            raise AssertionError("the full mention list should not be built")
+    
+    async def run():
+        platform = StreamOnly(results=50, max_results=50)
+        scheduler = Scheduler(config, platforms=[platform], llm=FakeChatOpenAI(latency=0))
+        try:
+            return await scheduler.run_platform(platform, "CRO")
+        finally:
+            await scheduler.close()
+    
+    report = asyncio.run(run())
+    assert report.error is None and isinstance(report.mentions, MentionBatch)
+    assert report.mentions.title == [f"Result {index}" for index in range(50)]
+
+
+def test_busy_keyword_moves_the_cursor_on_every_poll(config):
+    config.LOCAL_SENTIMENT_ENABLED = False
+    
+    async def run():
+        platform = PagedAPI(results=400, max_results=50)
+        scheduler = Scheduler(config, platforms=[platform], llm=FakeChatOpenAI(latency=0))
+        cursors = []
+        try:
+            for poll in range(3):
+                # 200 results newer than the cursor arrive between polls
+                platform.now = NOW + timedelta(minutes=200 * poll)
+                report = await scheduler.run_platform(platform, "CRO")
+                assert len(report.mentions) == 50 and report.error is None
+                scheduler.save_cursors()
+                cursors.append(scheduler.cursors.get("CRO", platform.name))
+        finally:
+            await scheduler.close()
+        return cursors
+    
+    assert asyncio.run(run()) == [NOW + timedelta(minutes=200 * poll) for poll in range(3)]
\ No newline at end of file
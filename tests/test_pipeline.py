@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import List
+from benchmarks.fake_llm import FakeChatOpenAI
+from models import Mention
+from pipeline import StreamingPipeline
+from platforms.base import Platform
+from report.csv_store import read_csv
+from report.generator import ReportGenerator
+from scheduler import Scheduler
+
+
+class PagedPlatform(Platform):
+    """Yields `pages` pages of distinct mentions, waiting `delay` seconds before each."""
+    
+    def __init__(self, pages: int, delay: float = 0.0):
+        self.pages = pages
+        self.delay = delay
+    
+    def _page(self, page: int) -> List[Mention]:
+        now = datetime.now()
+        return [
+            Mention(platform=self.name, title=f"Result {page}-{index}", url=f"https://example.com/{page}/{index}",
+                    description=f"Result {page}-{index} about pricing", date=now - timedelta(minutes=page))
+            for index in range(3)
+        ]
+    
+    async def stream_mentions(self, keyword, since=None):
+        for page in range(self.pages):
+            await asyncio.sleep(self.delay)
+            yield self._page(page)
+    
+    async def fetch_mentions(self, keyword, since=None):
+        return [m for page in range(self.pages) for m in self._page(page)]
+
+
+class SlowPlatform(PagedPlatform):
+    pass
+
+
+def _run(config, platforms, llm_latency):
+    config.LOCAL_SENTIMENT_ENABLED = False
+    config.DEDUPLICATE_MENTIONS = False
+    
+    async def run():
+        scheduler = Scheduler(config, platforms=platforms, llm=FakeChatOpenAI(latency=llm_latency))
+        pipeline = StreamingPipeline(scheduler, ReportGenerator(config.OUTPUT_DIR), queue_size=1, sentiment_workers=1)
+        try:
+            return await asyncio.wait_for(pipeline.run(["pricing"]), 20)
+        finally:
+            await scheduler.close()
+    
+    return asyncio.run(run())
+
+
+def test_slow_analysis_does_not_time_out_a_fast_fetch(config):
+    # Analysis takes far longer than the deadline, and the queues are full most of the time
+    config.PLATFORM_TIMEOUT = 0.3
+    updated_files = _run(config, [PagedPlatform(pages=8)], llm_latency=0.1)
+    
+    assert len(read_csv(updated_files['platform_files']['PagedPlatform'])) == 8 * 3
+    summary = read_csv(updated_files['summary_file'])
+    assert not summary['Summary'].str.startswith("Partial results").any()
+
+
+def test_fetch_timeout_with_full_queue_keeps_enqueued_pages(config):
+    config.PLATFORM_TIMEOUT = 0.5
+    updated_files = _run(config, [SlowPlatform(pages=10, delay=0.2), PagedPlatform(pages=4)], llm_latency=0.1)
+    
+    slow = read_csv(updated_files['platform_files']['SlowPlatform'])
+    assert 0 < len(slow) < 10 * 3
+    assert len(read_csv(updated_files['platform_files']['PagedPlatform'])) == 4 * 3
+    
+    summary = read_csv(updated_files['summary_file']).set_index('Platform')
+    assert summary.loc['SlowPlatform', 'Summary'].startswith("Partial results: timed out")
\ No newline at end of file
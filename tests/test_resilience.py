@@ -0,0 +1,8 @@
+import pytest
+from utils.resilience import RetryPolicy
+
+
+def test_retry_policy_needs_an_attempt():
+    # With no attempts, run() would return None without calling anything
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
\ No newline at end of file
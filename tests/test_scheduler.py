@@ -0,0 +1,44 @@
+import asyncio
+import time
+from benchmarks.fake_llm import FakeChatOpenAI
+from platforms.base import Platform
+from scheduler import Scheduler
+
+
+class Busy(Platform):
+    """Takes `delay` seconds per fetch and records when each fetch started."""
+    
+    def __init__(self, delay: float, starts: dict):
+        self.delay = delay
+        self.starts = starts
+    
+    async def fetch_mentions(self, keyword, since=None):
+        self.starts[(self.name, keyword)] = time.monotonic()
+        await asyncio.sleep(self.delay)
+        return []
+
+
+class Quick(Busy):
+    pass
+
+
+def test_tasks_waiting_on_a_busy_platform_do_not_block_others(config):
+    config.MAX_CONCURRENT_PLATFORMS = 2
+    config.PLATFORM_CONCURRENCY = 1
+    config.INCREMENTAL_FETCH = False
+    starts = {}
+    busy, quick = Busy(0.3, starts), Quick(0.0, starts)
+    
+    async def run():
+        scheduler = Scheduler(config, platforms=[busy, quick], llm=FakeChatOpenAI(latency=0))
+        try:
+            began = time.monotonic()
+            # Three keywords queue on Busy before Quick's only one
+            await asyncio.gather(*[scheduler.run_platform(busy, keyword) for keyword in ("a", "b", "c")],
+                                 scheduler.run_platform(quick, "a"))
+            return began
+        finally:
+            await scheduler.close()
+    
+    began = asyncio.run(run())
+    assert starts[("Quick", "a")] - began < 0.2
\ No newline at end of file
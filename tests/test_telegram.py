@@ -0,0 +1,36 @@
+import asyncio
+from datetime import datetime
+import pytest
+from models import Mention
+from platforms.base import IncompleteFetch
+from platforms.telegram import Telegram
+
+
+class FakeTelegram(Telegram):
+    """Channels named 'down' fail; the others return one message each."""
+    
+    async def _init_client(self):
+        return None
+    
+    async def _search_channel(self, client, channel, keyword, since, semaphore):
+        if channel.startswith("down"):
+            raise ConnectionError("connection reset")
+        return [Mention(platform="Telegram", title=f"Message in @{channel}", url=f"https://t.me/{channel}/1",
+                        description="", date=datetime(2024, 1, 1))]
+
+
+def _telegram(config, channels):
+    config.TELEGRAM_SEARCH_CHANNELS = channels
+    return FakeTelegram(config)
+
+
+def test_failed_channel_is_reported_with_the_others_results(config):
+    with pytest.raises(IncompleteFetch) as info:
+        asyncio.run(_telegram(config, ["a", "down", "b"]).fetch_mentions("CRO"))
+    assert "channel down failed" in str(info.value)
+    assert sorted(m.url for m in info.value.mentions) == ["https://t.me/a/1", "https://t.me/b/1"]
+
+
+def test_all_channels_failing_raises_the_error(config):
+    with pytest.raises(ConnectionError):
+        asyncio.run(_telegram(config, ["down", "down2"]).fetch_mentions("CRO"))
\ No newline at end of file
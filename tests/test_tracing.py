@@ -0,0 +1,81 @@
+import asyncio
+import json
+import os
+from utils.tracing import NOOP_TRACER, Tracer, current_span, traced
+
+
+class Stage:
+    def __init__(self, tracer):
+        self.tracer = tracer
+    
+    @traced('stage', lambda items, **_: {'items': len(items)})
+    async def run(self, items):
+        current_span().set(done=len(items))
+        await asyncio.gather(*[self.step() for _ in items])
+        current_span().set(after_gather=True)
+        return len(items)
+    
+    @traced('step')
+    async def step(self):
+        await asyncio.sleep(0)
+    
+    @traced('fail')
+    def fail(self):
+        raise ValueError("boom")
+
+
+def _spans(tracer):
+    tracer.flush()
+    with open(tracer.trace_path, encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def test_traced_records_one_span_per_call(tmp_path):
+    tracer = Tracer(str(tmp_path / "trace.jsonl"), str(tmp_path / "metrics.prom"))
+    assert asyncio.run(Stage(tracer).run([1, 2])) == 2
+    
+    spans = _spans(tracer)
+    assert [span['span'] for span in spans] == ['step', 'step', 'stage']
+    # Nested spans in other tasks do not take over the outer span's attributes
+    assert spans[2]['items'] == 2 and spans[2]['done'] == 2 and spans[2]['after_gather'] is True
+    assert 'done' not in spans[0]
+
+
+def test_traced_records_errors(tmp_path):
+    tracer = Tracer(str(tmp_path / "trace.jsonl"), str(tmp_path / "metrics.prom"))
+    try:
+        Stage(tracer).fail()
+    except ValueError:
+        pass
+    assert _spans(tracer)[0]['error'] == 'ValueError'
+
+
+def test_current_span_outside_a_span_is_a_noop():
+    current_span().set(ignored=True)
+    assert asyncio.run(Stage(NOOP_TRACER).run([1])) == 1
+
+def test_traced_attrs_take_arguments_by_name(tmp_path):
+    class Fetcher:
+        def __init__(self, tracer):
+            self.tracer = tracer
+        
+        @traced('fetch', lambda keyword, since, **_: {'keyword': keyword, 'since': since})
+        def fetch(self, keyword, limit=10, since=None):
+            return keyword
+    
+    tracer = Tracer(str(tmp_path / "trace.jsonl"), str(tmp_path / "metrics.prom"))
+    Fetcher(tracer).fetch("CRO")
+    Fetcher(tracer).fetch(since="yesterday", keyword="A/B")
+    spans = _spans(tracer)
+    assert [(span['keyword'], span['since']) for span in spans] == [("CRO", None), ("A/B", "yesterday")]
+
+
+def test_trace_file_is_rotated_by_size(tmp_path):
+    trace_path = str(tmp_path / "trace.jsonl")
+    tracer = Tracer(trace_path, str(tmp_path / "metrics.prom"), buffer_size=1, max_bytes=300, backup_count=2)
+    for _ in range(20):
+        asyncio.run(Stage(tracer).step())
+    tracer.flush()
+    assert os.path.getsize(trace_path) <= 300
+    assert os.path.exists(trace_path + ".1") and os.path.exists(trace_path + ".2")
+    assert not os.path.exists(trace_path + ".3")
\ No newline at end of file
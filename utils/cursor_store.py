@@ -0,0 +1,86 @@
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Dict, List, Optional, Union
+from models import Mention, MentionBatch
+
+
+class CursorStore:
+    """
+    Persisted high-water marks for incremental fetching.
+    
+    Records the newest mention date seen for each (keyword, platform) pair so
+    the next run can ask each API for newer items only. update() only stages a
+    pair's new cursor; commit() accepts it once that pair's results have been
+    written, and save() persists committed cursors only. A pair that fails or is
+    cancelled before its write therefore never skips mentions, even when other
+    pairs are committed and saved in the meantime.
+    """
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._cursors: Dict[str, Dict[str, str]] = {}
+        self._staged: Dict[str, str] = {}  # Uncommitted cursor dates per pair
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._cursors = json.load(f)
+    
+    @staticmethod
+    def _key(keyword: str, platform: str) -> str:
+        return f"{platform}\t{keyword}"
+    
+    def get(self, keyword: str, platform: str) -> Optional[datetime]:
+        """Return the newest committed mention date for this pair, or None."""
+        cursor = self._cursors.get(self._key(keyword, platform))
+        if not cursor:
+            return None
+        return datetime.fromisoformat(cursor['date'])
+    
+    def update(self, keyword: str, platform: str, mentions: Union[List[Mention], MentionBatch]) -> None:
+        """Stage the newest dated mention as the pair's next cursor, if it is newer."""
+        if isinstance(mentions, MentionBatch):
+            dates = [date for date in mentions.date if date is not None]
+        else:
+            dates = [m.date for m in mentions if m.date is not None]
+        if not dates:
+            return
+        
+        key = self._key(keyword, platform)
+        newest = max(dates)
+        current = self._staged.get(key)
+        if current is None or newest > datetime.fromisoformat(current):
+            self._staged[key] = newest.isoformat()
+    
+    def discard(self, keyword: str, platform: str) -> None:
+        """Drop the staged cursor of a pair, e.g. before fetching it again."""
+        self._staged.pop(self._key(keyword, platform), None)
+    
+    def commit(self, keyword: str, platform: str) -> None:
+        """Accept the staged cursor of a pair whose results have been written."""
+        key = self._key(keyword, platform)
+        staged = self._staged.pop(key, None)
+        if staged is None:
+            return
+        current = self.get(keyword, platform)
+        if current is None or datetime.fromisoformat(staged) > current:
+            self._cursors[key] = {'date': staged}
+    
+    def commit_all(self) -> None:
+        """Accept every staged cursor."""
+        for key in list(self._staged):
+            platform, keyword = key.split('\t', 1)
+            self.commit(keyword, platform)
+    
+    def save(self) -> None:
+        """Atomically write the committed cursors to disk."""
+        directory = os.path.dirname(self.path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._cursors, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,117 @@
+import asyncio
+import aiohttp
+from typing import Any, Dict, Optional
+from utils.rate_limiter import RateLimiter
+from utils.resilience import RetryPolicy, TransientHTTPError, parse_retry_after
+from utils.tracing import Tracer, NOOP_TRACER, current_span, traced
+
+
+class HttpClient:
+    """
+    Shared, pooled HTTP session for the aiohttp-based platforms.
+    
+    One client is owned by a run and handed to every platform, so TCP/TLS
+    connections and DNS lookups are reused across requests instead of being
+    thrown away with a new ClientSession on every fetch_mentions call.
+    
+    When a RateLimiter is given, requests made with a rate_key wait for that
+    key's token bucket and feed the response back to the limiter.
+    
+    With a Tracer, every attempt is recorded as an 'http' span and counted by status code.
+    
+    Each request has its own timeout. Timeouts, connection errors, 429 and 5xx
+    responses are retried with jittered exponential backoff, honouring
+    Retry-After, up to `retries` attempts.
+    
+    Usage:
+        async with HttpClient() as http:
+            data = await http.get_json(url, params={...})
+    """
+    
+    def __init__(self, limit: int = 100, limit_per_host: int = 10, dns_cache_ttl: int = 300,
+                 keepalive_timeout: float = 30.0, timeout: float = 30.0,
+                 limiter: Optional[RateLimiter] = None, retries: int = 3,
+                 retry_base_delay: float = 0.5, retry_max_delay: float = 30.0,
+                 tracer: Tracer = NOOP_TRACER):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = timeout
+        self.limiter = limiter
+        self.tracer = tracer
+        self.retry = RetryPolicy(
+            attempts=retries,
+            base_delay=retry_base_delay,
+            max_delay=retry_max_delay,
+            retry_on=(TransientHTTPError, asyncio.TimeoutError,
+                      aiohttp.ClientConnectionError, aiohttp.ClientPayloadError)
+        )
+        self._session: Optional[aiohttp.ClientSession] = None
+    
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """The underlying ClientSession, created on first use."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"Accept-Encoding": "gzip, deflate"},
+                auto_decompress=True
+            )
+        return self._session
+    
+    async def get_json(self, url: str, params: Optional[Dict[str, Any]] = None,
+                       headers: Optional[Dict[str, str]] = None, rate_key: Optional[str] = None) -> Any:
+        """GET a URL and decode the JSON body, rate limited under rate_key if given."""
+        return await self.retry.run(lambda: self._get_json_once(url, params, headers, rate_key))
+    
+    async def _get_json_once(self, url: str, params: Optional[Dict[str, Any]],
+                             headers: Optional[Dict[str, str]], rate_key: Optional[str]) -> Any:
+        """Make a single GET attempt."""
+        limited = self.limiter is not None and rate_key is not None
+        if limited:
+            await self.limiter.acquire(rate_key)
+        
+        try:
+            return await self._request(url, params, headers, rate_key, limited)
+        except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+            self.tracer.count('http_errors_total', key=rate_key, error=type(e).__name__)
+            raise
+    
+    # Called after the rate limiter, so the span measures network time only
+    @traced('http', lambda rate_key, **_: {'platform': rate_key})
+    async def _request(self, url: str, params: Optional[Dict[str, Any]], headers: Optional[Dict[str, str]],
+                       rate_key: Optional[str], limited: bool) -> Any:
+        """Send the request and decode the response, feeding it back to the limiter if limited."""
+        async with self.session.get(url, params=params, headers=headers,
+                                    timeout=aiohttp.ClientTimeout(total=self.timeout)) as response:
+            current_span().set(status=response.status)
+            self.tracer.count('http_responses_total', key=rate_key, status=response.status)
+            if response.status == 429 or response.status >= 500:
+                if limited:
+                    self.limiter.update_from_response(rate_key, response.status, response.headers, None)
+                raise TransientHTTPError(response.status, url, parse_retry_after(response.headers.get('Retry-After')))
+            
+            data = await response.json(content_type=None)
+            if limited:
+                self.limiter.update_from_response(rate_key, response.status, response.headers, data)
+            return data
+    
+    async def close(self) -> None:
+        """Close the session and release pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    async def __aenter__(self) -> "HttpClient":
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
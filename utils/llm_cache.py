@@ -0,0 +1,126 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import unicodedata
+from typing import Optional, Dict
+
+
+class LLMCache:
+    """
+    Persistent, content-addressed cache for LLM responses backed by SQLite.
+    
+    Entries are keyed by a hash of the normalized input text, model name,
+    temperature and prompt text, so the same content analyzed with the same
+    settings is only paid for once. Entries expire after `ttl` seconds and the
+    least recently used ones are evicted once the cache holds more than
+    `max_entries` rows.
+    """
+    
+    EVICT_EVERY = 100  # Check the size limit once per this many writes
+    
+    def __init__(self, path: str, ttl: float = 30 * 24 * 3600, max_entries: int = 100000, enabled: bool = True):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._conn = None
+        
+        if enabled:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            self._conn = sqlite3.connect(path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY,"
+                " value TEXT NOT NULL,"
+                " created_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache (accessed_at)")
+            self._conn.commit()
+    
+    @staticmethod
+    def _normalize(text: str) -> str:
+        """Normalize unicode and collapse whitespace so trivially different copies share a key."""
+        return " ".join(unicodedata.normalize("NFC", text or "").split())
+    
+    @classmethod
+    def make_key(cls, text: str, model: str, temperature: float, prompt: str) -> str:
+        """Build the cache key for an LLM call."""
+        payload = json.dumps(
+            [cls._normalize(text), model, float(temperature), prompt],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached value for key, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        
+        row = self._conn.execute(
+            "SELECT value, created_at FROM llm_cache WHERE key = ?", (key,)
+        ).fetchone()
+        now = time.time()
+        
+        if row is None or (self.ttl and now - row[1] > self.ttl):
+            if row is not None:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+        
+        self._conn.execute("UPDATE llm_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        self._conn.commit()
+        self.hits += 1
+        return row[0]
+    
+    def set(self, key: str, value: str) -> None:
+        """Store a value, evicting old entries every so often."""
+        if not self.enabled:
+            return
+        
+        now = time.time()
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, value, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+            (key, value, now, now)
+        )
+        self._conn.commit()
+        
+        self._writes += 1
+        if self._writes % self.EVICT_EVERY == 0:
+            self.evict()
+    
+    def evict(self) -> None:
+        """Drop expired entries, then the least recently used ones above max_entries."""
+        if not self.enabled:
+            return
+        
+        if self.ttl:
+            self._conn.execute("DELETE FROM llm_cache WHERE created_at < ?", (time.time() - self.ttl,))
+        
+        count = self._conn.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+        if count > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM llm_cache WHERE key IN ("
+                " SELECT key FROM llm_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (count - self.max_entries,)
+            )
+        self._conn.commit()
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters for this session."""
+        return {'hits': self.hits, 'misses': self.misses}
+    
+    def close(self) -> None:
+        """Apply eviction and close the database."""
+        if self._conn is not None:
+            self.evict()
+            self._conn.close()
+            self._conn = None
+            self.enabled = False
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+
+class QuotaExceededError(Exception):
+    """Raised when a platform's daily request quota is used up."""
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` requests per second with bursts of up to `capacity`.
+    The bucket can also be paused until a wall-clock time, e.g. when an API asks
+    clients to back off.
+    """
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.paused_until = 0.0  # Unix time
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent. Waiters are served in arrival order."""
+        async with self._lock:
+            while True:
+                pause = self.paused_until - time.time()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+                    continue
+                
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+    
+    def pause_until(self, until: float) -> None:
+        """Stop handing out tokens until the given Unix time."""
+        self.paused_until = max(self.paused_until, until)
+
+
+class RateLimiter:
+    """
+    Central per-platform rate limiter with daily quota accounting.
+    
+    Each platform key gets a token bucket and, optionally, a daily request quota.
+    Limits come from a dict such as:
+    
+        {'GoogleSearch': {'rate': 1.0, 'burst': 10, 'daily_quota': 100}}
+    
+    Platforms report each response through update_from_response, so server hints
+    (Retry-After, X-RateLimit-* headers, StackExchange 'backoff' and
+    'quota_remaining') pause the bucket or correct the quota count. Quota usage and
+    pauses are saved to `state_path` so they carry over between runs. Days are
+    counted in UTC.
+    """
+    
+    def __init__(self, limits: Dict[str, Dict[str, float]], state_path: Optional[str] = None):
+        self.limits = limits
+        self.state_path = state_path
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        
+        if state_path and os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as f:
+                self._state = json.load(f)
+    
+    @staticmethod
+    def _today() -> str:
+        return datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    
+    def _bucket(self, key: str) -> TokenBucket:
+        if key not in self._buckets:
+            limit = self.limits.get(key, {})
+            bucket = TokenBucket(limit.get('rate', 10.0), limit.get('burst', 10))
+            bucket.pause_until(self._state.get(key, {}).get('paused_until', 0.0))
+            self._buckets[key] = bucket
+        return self._buckets[key]
+    
+    def _quota_state(self, key: str) -> Dict[str, Any]:
+        """Today's quota record for a key, reset when the day changes."""
+        state = self._state.setdefault(key, {})
+        if state.get('date') != self._today():
+            state['date'] = self._today()
+            state['used'] = 0
+        return state
+    
+    def remaining(self, key: str) -> Optional[int]:
+        """Requests left in today's quota, or None if the key has no daily quota."""
+        quota = self.limits.get(key, {}).get('daily_quota')
+        if quota is None:
+            return None
+        return max(int(quota) - self._quota_state(key)['used'], 0)
+    
+    async def acquire(self, key: str) -> None:
+        """Wait for permission to send one request for key."""
+        if self.remaining(key) == 0:
+            raise QuotaExceededError(f"Daily quota for {key} is used up")
+        
+        # Reserve the quota before waiting so concurrent callers cannot overshoot it
+        self._quota_state(key)['used'] += 1
+        await self._bucket(key).acquire()
+    
+    def pause(self, key: str, seconds: float) -> None:
+        """Hold back requests for key for the given number of seconds."""
+        until = time.time() + seconds
+        self._bucket(key).pause_until(until)
+        self._state.setdefault(key, {})['paused_until'] = self._bucket(key).paused_until
+    
+    def update_from_response(self, key: str, status: int, headers: Mapping[str, str], body: Any) -> None:
+        """Apply rate-limit hints from a response's status, headers and JSON body."""
+        # Retry-After: seconds or an HTTP date
+        retry_after = headers.get('Retry-After')
+        if retry_after and status in (429, 503):
+            try:
+                self.pause(key, float(retry_after))
+            except ValueError:
+                try:
+                    self.pause(key, parsedate_to_datetime(retry_after).timestamp() - time.time())
+                except (TypeError, ValueError):
+                    pass
+        
+        # GitHub style: X-RateLimit-Remaining / X-RateLimit-Reset (Unix time)
+        remaining = headers.get('X-RateLimit-Remaining')
+        reset = headers.get('X-RateLimit-Reset')
+        if remaining is not None and reset is not None:
+            try:
+                if int(remaining) == 0:
+                    self.pause(key, float(reset) - time.time())
+            except ValueError:
+                pass
+        
+        if isinstance(body, dict):
+            # StackExchange asks clients to wait `backoff` seconds before the next call
+            if 'backoff' in body:
+                self.pause(key, float(body['backoff']))
+            
+            # StackExchange reports the quota left for the day
+            quota = self.limits.get(key, {}).get('daily_quota')
+            if quota is not None and 'quota_remaining' in body:
+                self._quota_state(key)['used'] = max(int(quota) - int(body['quota_remaining']), 0)
+    
+    def save(self) -> None:
+        """Atomically persist quota usage and pauses."""
+        if not self.state_path:
+            return
+        
+        directory = os.path.dirname(self.state_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(self._state, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, self.state_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
@@ -0,0 +1,133 @@
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+T = TypeVar('T')
+
+
+class TransientHTTPError(Exception):
+    """An HTTP response worth retrying (429 or 5xx)."""
+    
+    def __init__(self, status: int, url: str, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status} from {url}")
+        self.status = status
+        self.url = url
+        self.retry_after = retry_after
+
+
+class APIError(Exception):
+    """An error reported in an API response body, e.g. an invalid key or an exhausted quota."""
+    
+    def __init__(self, platform: str, message: str):
+        super().__init__(f"{platform} API error: {message}")
+        self.platform = platform
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a platform whose circuit breaker is open."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds; HTTP dates are left to the rate limiter."""
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None
+
+
+class RetryPolicy:
+    """
+    Bounded retries with exponential backoff and full jitter.
+    
+    A failed attempt waits a random time between 0 and
+    min(max_delay, base_delay * 2 ** attempt). When the error carries a
+    Retry-After value, the wait is at least that long.
+    """
+    
+    def __init__(self, attempts: int = 3, base_delay: float = 0.5, max_delay: float = 30.0,
+                 retry_on: Tuple[Type[BaseException], ...] = (TransientHTTPError, asyncio.TimeoutError, ConnectionError)):
+        if attempts < 1:
+            raise ValueError(f"RetryPolicy needs at least one attempt, got {attempts}")
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on = retry_on
+    
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait after the given (0-based) failed attempt."""
+        backoff = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_delay))
+        return backoff
+    
+    async def run(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Call func, retrying retryable errors until the attempts run out."""
+        for attempt in range(self.attempts):
+            try:
+                return await func()
+            except self.retry_on as e:
+                if attempt == self.attempts - 1:
+                    raise
+                await asyncio.sleep(self.delay(attempt, getattr(e, 'retry_after', None)))
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency.
+    
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast with CircuitOpenError. Once `reset_timeout` seconds have passed a
+    single trial call is let through (half-open): success closes the circuit,
+    failure opens it again.
+    """
+    
+    def __init__(self, name: str, failure_threshold: int = 3, reset_timeout: float = 300.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_running = False
+    
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return 'closed'
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+    
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+    
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            self.opened_at = time.monotonic()
+    
+    async def call(self, func: Callable[[], Awaitable[T]]) -> T:
+        """Call func through the breaker."""
+        state = self.state
+        if state == 'open' or (state == 'half-open' and self._trial_running):
+            raise CircuitOpenError(f"{self.name} is unavailable after {self.failures} consecutive failures")
+        
+        is_trial = state == 'half-open'
+        if is_trial:
+            self._trial_running = True
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.record_failure()
+            raise
+        finally:
+            if is_trial:
+                self._trial_running = False
+        
+        self.record_success()
+        return result
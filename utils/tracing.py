@@ -0,0 +1,286 @@
+import asyncio
+import functools
+import inspect
+import json
+import os
+import tempfile
+import time
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+METRIC_PREFIX = "keyword_analyzer"
+
+# Span attributes that become metric labels; the rest (keyword, file, ...) only go to the trace
+SPAN_LABELS = ('platform', 'call')
+
+COUNTER_HELP = {
+    'http_responses_total': "HTTP responses by rate key and status code.",
+    'http_errors_total': "HTTP requests that failed without a response, by rate key and error type.",
+    'llm_requests_total': "LLM requests by analyzer call.",
+    'llm_tokens_total': "LLM tokens used, by type (prompt or completion).",
+    'mentions_total': "Mentions fetched per platform.",
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Innermost span being recorded in the current task
+_current_span: ContextVar[Optional['Span']] = ContextVar('current_span', default=None)
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: LabelKey) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+class Span:
+    """One timed stage. Attributes known only at the end can be added with set()."""
+    
+    __slots__ = ('tracer', 'name', 'attrs', 'start', '_started', '_token')
+    
+    def __init__(self, tracer: 'Tracer', name: str, attrs: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attrs = attrs
+    
+    def set(self, **attrs: Any) -> None:
+        self.attrs.update(attrs)
+    
+    def __enter__(self) -> 'Span':
+        self.start = time.time()
+        self._started = time.perf_counter()
+        self._token = _current_span.set(self)
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        _current_span.reset(self._token)
+        self.tracer._finish(self, time.perf_counter() - self._started, exc_type)
+        return False
+
+
+class Tracer:
+    """
+    Records timing spans and counters for the fetch, analysis and report stages.
+    
+    Every finished span is appended to a JSON-lines trace file (`trace_path`)
+    with its start time, duration, attributes and error type, if any. Once it
+    would grow past `max_bytes` it is rotated to trace.jsonl.1, .2, ...,
+    keeping `backup_count` old files. Span totals per name, platform and call,
+    and counters such as HTTP statuses, LLM tokens and mentions per platform,
+    are rewritten to a Prometheus text-format file (`metrics_path`) by flush()
+    and close(); point node_exporter's textfile collector at it to scrape them.
+    
+    Spans are plain context managers, so they work the same in coroutines:
+    
+        with tracer.span('fetch', platform='GitHub', keyword='CRO') as span:
+            mentions = await platform.fetch_mentions('CRO')
+            span.set(mentions=len(mentions))
+    
+    To time a whole method, decorate it with traced() instead.
+    
+    Use create_tracer() to get a NoopTracer when tracing is disabled.
+    """
+    
+    enabled = True
+    
+    def __init__(self, trace_path: str, metrics_path: str, buffer_size: int = 200,
+                 max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5):
+        self.trace_path = trace_path
+        self.metrics_path = metrics_path
+        self.max_bytes = max_bytes  # 0 never rotates the trace file
+        self.backup_count = backup_count
+        self.buffer_size = buffer_size  # Spans held in memory before they are appended to the trace file
+        self._buffer: List[str] = []
+        self._spans: Dict[LabelKey, List[float]] = {}  # [count, seconds, errors] per span name and labels
+        self._counters: Dict[Tuple[str, LabelKey], float] = {}
+    
+    def span(self, name: str, **attrs: Any) -> Span:
+        """Time a stage; use as a context manager."""
+        return Span(self, name, attrs)
+    
+    def count(self, metric: str, value: float = 1, **labels: Any) -> None:
+        """Add to a counter, e.g. count('http_responses_total', key='GitHub', status=200)."""
+        key = (metric, tuple(sorted((name, str(label)) for name, label in labels.items())))
+        self._counters[key] = self._counters.get(key, 0) + value
+    
+    def _finish(self, span: Span, duration: float, exc_type) -> None:
+        record = {'span': span.name, 'start': round(span.start, 6), 'duration': round(duration, 6), **span.attrs}
+        if exc_type is not None:
+            record['error'] = exc_type.__name__
+        self._buffer.append(json.dumps(record, default=str))
+        
+        labels = tuple((name, str(span.attrs[name])) for name in SPAN_LABELS if span.attrs.get(name) is not None)
+        stats = self._spans.setdefault((('span', span.name),) + labels, [0, 0.0, 0])
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] += exc_type is not None
+        
+        if len(self._buffer) >= self.buffer_size:
+            self._write_trace()
+    
+    def _rotate_trace(self) -> None:
+        """Shift trace.jsonl to trace.jsonl.1, .1 to .2 and so on, dropping the oldest."""
+        for index in range(self.backup_count - 1, 0, -1):
+            older = f"{self.trace_path}.{index}"
+            if os.path.exists(older):
+                os.replace(older, f"{self.trace_path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.trace_path, f"{self.trace_path}.1")
+        else:
+            os.unlink(self.trace_path)
+    
+    def _write_trace(self) -> None:
+        if not self._buffer:
+            return
+        os.makedirs(os.path.dirname(self.trace_path) or '.', exist_ok=True)
+        text = "\n".join(self._buffer) + "\n"
+        if (self.max_bytes and os.path.exists(self.trace_path)
+                and os.path.getsize(self.trace_path) + len(text.encode('utf-8')) > self.max_bytes):
+            self._rotate_trace()
+        with open(self.trace_path, 'a', encoding='utf-8') as f:
+            f.write(text)
+        self._buffer = []
+    
+    def metrics_text(self) -> str:
+        """All span totals and counters in Prometheus text exposition format."""
+        lines = []
+        span_metrics = (
+            ('span_seconds', 'summary', "Time spent in each traced stage.", None),
+            ('span_errors_total', 'counter', "Traced stages that raised an error.", 2),
+        )
+        for suffix, kind, help_text, index in span_metrics:
+            name = f"{METRIC_PREFIX}_{suffix}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+            for labels, stats in sorted(self._spans.items()):
+                if index is None:
+                    lines.append(f"{name}_sum{_format_labels(labels)} {stats[1]:.6f}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {stats[0]}")
+                else:
+                    lines.append(f"{name}{_format_labels(labels)} {stats[index]}")
+        
+        for metric in sorted({metric for metric, _ in self._counters}):
+            name = f"{METRIC_PREFIX}_{metric}"
+            if metric in COUNTER_HELP:
+                lines.append(f"# HELP {name} {COUNTER_HELP[metric]}")
+            lines.append(f"# TYPE {name} counter")
+            for (counter, labels), value in sorted(self._counters.items()):
+                if counter == metric:
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+        return "\n".join(lines) + "\n"
+    
+    def _write_metrics(self) -> None:
+        """Atomically replace the metrics file, so a scraper never reads half of it."""
+        directory = os.path.dirname(self.metrics_path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.metrics_text())
+            os.replace(tmp_path, self.metrics_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    
+    def flush(self) -> None:
+        """Append buffered spans to the trace file and rewrite the metrics file."""
+        self._write_trace()
+        self._write_metrics()
+    
+    def close(self) -> None:
+        self.flush()
+
+
+class _NoopSpan:
+    __slots__ = ()
+    
+    def set(self, **attrs: Any) -> None:
+        pass
+    
+    def __enter__(self) -> '_NoopSpan':
+        return self
+    
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer(Tracer):
+    """Tracer used when tracing is disabled: records nothing and writes no files."""
+    
+    enabled = False
+    
+    def __init__(self):
+        pass
+    
+    def span(self, name: str, **attrs: Any) -> _NoopSpan:
+        return _NOOP_SPAN
+    
+    def count(self, metric: str, value: float = 1, **labels: Any) -> None:
+        pass
+    
+    def flush(self) -> None:
+        pass
+    
+    def close(self) -> None:
+        pass
+
+
+NOOP_TRACER = NoopTracer()
+
+
+def current_span() -> Union[Span, _NoopSpan]:
+    """The innermost span being recorded in this task, or a no-op span outside of one."""
+    span = _current_span.get()
+    return _NOOP_SPAN if span is None else span
+
+
+def traced(name: str, attrs: Optional[Callable[..., Dict[str, Any]]] = None) -> Callable:
+    """
+    Record every call of a method as a span of its object's tracer:
+    
+        @traced('summary', lambda mentions, **_: {'mentions': len(mentions)})
+        async def generate_summary(self, mentions): ...
+    
+    attrs is called with the method's arguments by name, defaults filled in and
+    without self, and returns the span's attributes. Take the arguments it needs
+    and `**_` for the rest, so new or reordered parameters do not break it. The
+    method adds attributes known later with current_span().set().
+    """
+    def decorate(method: Callable) -> Callable:
+        signature = inspect.signature(method)
+        
+        def span(self, args, kwargs):
+            if not attrs:
+                return self.tracer.span(name)
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(list(bound.arguments.items())[1:])  # Without self
+            return self.tracer.span(name, **attrs(**arguments))
+        
+        if asyncio.iscoroutinefunction(method):
+            @functools.wraps(method)
+            async def wrapper(self, *args, **kwargs):
+                with span(self, args, kwargs):
+                    return await method(self, *args, **kwargs)
+        else:
+            @functools.wraps(method)
+            def wrapper(self, *args, **kwargs):
+                with span(self, args, kwargs):
+                    return method(self, *args, **kwargs)
+        return wrapper
+    
+    return decorate
+
+
+def create_tracer(enabled: bool, trace_path: str, metrics_path: str,
+                  max_bytes: int = 50 * 1024 * 1024, backup_count: int = 5) -> Tracer:
+    """A recording Tracer, or the shared NoopTracer when tracing is disabled."""
+    if not enabled:
+        return NOOP_TRACER
+    return Tracer(trace_path, metrics_path, max_bytes=max_bytes, backup_count=backup_count)
\ No newline at end of file